@@ -0,0 +1,182 @@
+"""
+Bounded executor for model calls.
+
+A fixed number of worker threads run model requests; everything else waits
+in a queue instead of piling up threads that block on the network. Each
+request is a stream of text chunks with a deadline:
+
+    req = pool.submit(key, produce)      # produce(req) calls req.push(text)
+    for text in req.stream():            # raises TimeoutError / Cancelled
+        ...
+
+Requests with the same key that are still in flight are coalesced: later
+callers attach to the running request and replay its chunks from the
+start, so only one network call is made. cancel_pending() (called when
+the user issues a newer command) cancels queued requests and tells running
+ones to stop at the next chunk. Requests carry the session that asked
+(see command_server.py), and a newer command only cancels its own
+session's requests.
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Cancelled(Exception):
+    pass
+
+
+class AIRequest:
+    def __init__(self, key, deadline):
+        self.key = key
+        self.deadline = deadline
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.cancelled = False
+        self.waiters = 1
+        self.owners = set()   # sessions waiting on this request
+        self.started = None
+        self.cond = threading.Condition()
+
+    # ---- producer side (worker thread) ----
+    def push(self, text):
+        """Adds a chunk. Returns False once the request was cancelled or timed out."""
+        with self.cond:
+            if self.cancelled or self.done:
+                return False
+            if time.monotonic() > self.deadline:
+                self.error = TimeoutError("model request timed out")
+                self.done = True
+                self.cond.notify_all()
+                return False
+            self.chunks.append(text)
+            self.cond.notify_all()
+            return True
+
+    def finish(self, error=None):
+        with self.cond:
+            if not self.done:
+                self.error = error
+                self.done = True
+            self.cond.notify_all()
+
+    def cancel(self):
+        with self.cond:
+            if not self.done:
+                self.cancelled = True
+                self.error = Cancelled()
+                self.done = True
+            self.cond.notify_all()
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    # ---- consumer side ----
+    def stream(self):
+        """Yields chunks as they arrive; raises the request's error (timeout, cancel, model error)."""
+        i = 0
+        while True:
+            with self.cond:
+                while i >= len(self.chunks) and not self.done:
+                    left = self.deadline - time.monotonic()
+                    if left <= 0:
+                        raise TimeoutError("model request timed out")
+                    self.cond.wait(left)
+                if i < len(self.chunks):
+                    text = self.chunks[i]
+                    i += 1
+                elif self.error is not None:
+                    raise self.error
+                else:
+                    return
+            yield text
+
+    def result(self):
+        return "".join(self.stream())
+
+
+class AIPool:
+    """
+    workers: concurrent model calls; timeout: seconds from submit() until a
+    request must have finished (queue wait included).
+    """
+    def __init__(self, workers=2, timeout=20.0):
+        self.workers = workers
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ai")
+        self.lock = threading.Lock()
+        self.inflight = {}   # key -> AIRequest
+        self.counters = {"submitted": 0, "coalesced": 0, "cancelled": 0, "timeouts": 0, "errors": 0}
+
+    def submit(self, key, produce, timeout=None, owner=None):
+        """
+        Runs produce(req) on a worker unless an identical request (same key)
+        is already in flight, in which case that request is returned.
+        owner identifies the session asking (None for the desktop).
+        """
+        with self.lock:
+            req = self.inflight.get(key)
+            if req is not None and not req.done:
+                req.waiters += 1
+                req.owners.add(owner)
+                self.counters["coalesced"] += 1
+                return req
+            req = AIRequest(key, time.monotonic() + (timeout or self.timeout))
+            req.owners.add(owner)
+            self.inflight[key] = req
+            self.counters["submitted"] += 1
+        self.executor.submit(self._run, req, produce)
+        return req
+
+    def _run(self, req, produce):
+        try:
+            if req.done:
+                return
+            if req.remaining() <= 0:
+                req.finish(TimeoutError("model request timed out in queue"))
+                return
+            req.started = time.monotonic()
+            produce(req)
+            req.finish()
+        except Exception as e:
+            req.finish(e)
+        finally:
+            with self.lock:
+                if self.inflight.get(req.key) is req:
+                    del self.inflight[req.key]
+                if isinstance(req.error, TimeoutError):
+                    self.counters["timeouts"] += 1
+                elif isinstance(req.error, Cancelled):
+                    self.counters["cancelled"] += 1
+                elif req.error is not None:
+                    self.counters["errors"] += 1
+
+    def cancel_pending(self, keep=None, owner=None):
+        """
+        Cancels every in-flight request of `owner` except the one for `keep`.
+        Requests another session is also waiting on are left alone.
+        Returns how many were cancelled.
+        """
+        with self.lock:
+            doomed = [req for key, req in self.inflight.items()
+                      if key != keep and not req.done and req.owners <= {owner}]
+            for req in doomed:
+                del self.inflight[req.key]
+        for req in doomed:
+            req.cancel()
+        return len(doomed)
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats["inflight"] = len(self.inflight)
+            return stats
+
+    def shutdown(self):
+        with self.lock:
+            doomed = list(self.inflight.values())
+            self.inflight.clear()
+        for req in doomed:
+            req.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,242 @@
+"""
+Continuous audio capture with voice-activity detection and a local wake word.
+
+The microphone stream is opened once and read frame by frame. An energy
+VAD cuts it into utterances; its noise floor is tracked continuously from
+the non-speech frames, so no dead air is spent on calibration between
+phrases. While Orion is idle, utterances are checked by a local wake-word
+detector and never leave the machine. Any frame source works: WavSource
+replays recordings, which is how the benchmarks drive the pipeline.
+
+To save power (see power.py) a source can read `batch` frames per wakeup,
+and AudioCapture can run the VAD on every `vad_stride`-th frame only
+while no phrase is in progress. Both can be changed while capturing.
+"""
+import time
+import threading
+import wave
+import audioop
+from collections import deque
+
+
+class Utterance:
+    __slots__ = ("pcm", "sample_rate", "sample_width", "started", "ended")
+
+    def __init__(self, pcm, sample_rate, sample_width, started, ended):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.started = started
+        self.ended = ended
+
+    @property
+    def duration(self):
+        return len(self.pcm) / (self.sample_rate * self.sample_width)
+
+
+class MicrophoneSource:
+    """
+    Frames from a speech_recognition.Microphone, kept open for the whole
+    session. Reads `batch` frames per call (one wakeup) and yields them one
+    by one.
+    """
+    def __init__(self, mic, batch=1):
+        self.mic = mic
+        self.batch = batch
+        self.reads = 0
+        self.sample_rate = None
+        self.sample_width = None
+        self.frame_bytes = None
+
+    def frames(self):
+        with self.mic as source:
+            self.sample_rate = source.SAMPLE_RATE
+            self.sample_width = source.SAMPLE_WIDTH
+            self.frame_bytes = source.CHUNK * source.SAMPLE_WIDTH
+            while True:
+                data = source.stream.read(source.CHUNK * max(1, self.batch))
+                self.reads += 1
+                for i in range(0, len(data), self.frame_bytes):
+                    yield data[i:i + self.frame_bytes]
+
+
+class WavSource:
+    """
+    Frames from a mono WAV file. With realtime=True the file is paced like a
+    live microphone (`batch` frames per wakeup); otherwise it is read as
+    fast as possible.
+    """
+    def __init__(self, path, chunk=1024, realtime=False, batch=1):
+        self.path = path
+        self.chunk = chunk
+        self.realtime = realtime
+        self.batch = batch
+        self.reads = 0
+        with wave.open(path, "rb") as w:
+            self.sample_rate = w.getframerate()
+            self.sample_width = w.getsampwidth()
+            self.channels = w.getnchannels()
+        self.frame_bytes = chunk * self.sample_width
+
+    def frames(self):
+        frame_sec = self.chunk / self.sample_rate
+        with wave.open(self.path, "rb") as w:
+            next_at = time.perf_counter()
+            while True:
+                batch = max(1, self.batch)
+                data = w.readframes(self.chunk * batch)
+                if not data:
+                    return
+                if self.channels > 1:
+                    data = audioop.tomono(data, self.sample_width, 0.5, 0.5)
+                if self.realtime:
+                    next_at += frame_sec * batch
+                    delay = next_at - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                self.reads += 1
+                for i in range(0, len(data), self.frame_bytes):
+                    yield data[i:i + self.frame_bytes]
+
+
+class EnergyVAD:
+    """
+    RMS-energy voice detector with a continuously adapted noise floor.
+    A frame is speech when its energy exceeds max(min_energy, floor * ratio).
+    """
+    def __init__(self, ratio=2.5, min_energy=150, adapt=0.05):
+        self.ratio = ratio
+        self.min_energy = min_energy
+        self.adapt = adapt
+        self.floor = None
+
+    def threshold(self):
+        return max(self.min_energy, (self.floor or 0) * self.ratio)
+
+    def is_speech(self, frame, sample_width):
+        energy = audioop.rms(frame, sample_width)
+        if self.floor is None:
+            self.floor = energy
+        speech = energy > self.threshold()
+        if not speech:
+            self.floor += (energy - self.floor) * self.adapt
+        return speech
+
+
+class AudioCapture:
+    """
+    Turns a frame source into Utterances. `mute()` returning True (e.g. while
+    Orion itself is speaking) drops frames and resets any phrase in progress.
+    Between phrases only every `vad_stride`-th frame is checked for speech.
+    """
+    def __init__(self, source, vad=None, pre_roll=0.3, end_silence=0.8,
+                 min_phrase=0.25, max_phrase=10.0, mute=None, vad_stride=1):
+        self.source = source
+        self.vad = vad or EnergyVAD()
+        self.pre_roll = pre_roll
+        self.end_silence = end_silence
+        self.min_phrase = min_phrase
+        self.max_phrase = max_phrase
+        self.mute = mute
+        self.vad_stride = vad_stride
+        self.stopped = False
+        self.frames_seen = 0
+        self.frames_checked = 0
+        self.frames_voiced = 0
+
+    def stop(self):
+        self.stopped = True
+
+    def utterances(self):
+        frames = self.source.frames()
+        first = next(frames, None)
+        if first is None:
+            return
+        rate, width = self.source.sample_rate, self.source.sample_width
+        frame_sec = len(first) / (rate * width)
+        pre = deque(maxlen=max(1, int(self.pre_roll / frame_sec)))
+        silence_limit = max(1, int(self.end_silence / frame_sec))
+        max_frames = int(self.max_phrase / frame_sec)
+        phrase, silent, voiced, started = None, 0, 0, 0.0
+
+        def pending(frame):
+            yield frame
+            yield from frames
+
+        for frame in pending(first):
+            if self.stopped:
+                return
+            self.frames_seen += 1
+            if self.mute is not None and self.mute():
+                pre.clear()
+                phrase = None
+                continue
+            if phrase is None:
+                pre.append(frame)
+                if self.vad_stride > 1 and self.frames_seen % self.vad_stride:
+                    continue
+            self.frames_checked += 1
+            speech = self.vad.is_speech(frame, width)
+            if phrase is None:
+                if speech:
+                    phrase, silent, voiced, started = list(pre), 0, 1, time.time()
+                    self.frames_voiced += 1
+                    pre.clear()
+                continue
+            phrase.append(frame)
+            if speech:
+                silent = 0
+                voiced += 1
+                self.frames_voiced += 1
+            else:
+                silent += 1
+            if silent >= silence_limit or len(phrase) >= max_frames:
+                if voiced * frame_sec >= self.min_phrase:
+                    yield Utterance(b"".join(phrase), rate, width, started, time.time())
+                phrase = None
+        if phrase is not None and voiced * frame_sec >= self.min_phrase:
+            yield Utterance(b"".join(phrase), rate, width, started, time.time())
+
+
+def pcm16_mono(utterance, rate):
+    """The utterance as 16-bit PCM at `rate` Hz, the input format pocketsphinx expects."""
+    pcm = utterance.pcm
+    if utterance.sample_width != 2:
+        pcm = audioop.lin2lin(pcm, utterance.sample_width, 2)
+    if utterance.sample_rate != rate:
+        pcm, _ = audioop.ratecv(pcm, 2, 1, utterance.sample_rate, rate, None)
+    return pcm
+
+
+class PocketSphinxWakeWord:
+    """
+    Local keyword spotter built on pocketsphinx. `available` is False when
+    pocketsphinx is not installed, in which case callers should fall back to
+    sending every utterance to the recognizer. The decoder holds one
+    utterance at a time, so detect() calls from several threads take turns.
+    """
+    SAMPLE_RATE = 16000
+
+    def __init__(self, keyphrase="orion", threshold=1e-20):
+        self.keyphrase = keyphrase
+        self.decoder = None
+        self.lock = threading.Lock()
+        try:
+            from pocketsphinx import Decoder
+            self.decoder = Decoder(keyphrase=keyphrase, kws_threshold=threshold,
+                                   samprate=self.SAMPLE_RATE, loglevel="FATAL")
+        except Exception as e:
+            print("Wake word detector unavailable:", e)
+
+    @property
+    def available(self):
+        return self.decoder is not None
+
+    def detect(self, utterance):
+        pcm = pcm16_mono(utterance, self.SAMPLE_RATE)
+        with self.lock:
+            self.decoder.start_utt()
+            self.decoder.process_raw(pcm, full_utt=True)
+            self.decoder.end_utt()
+            hyp = self.decoder.hyp()
+        return hyp is not None and self.keyphrase in hyp.hypstr.lower()
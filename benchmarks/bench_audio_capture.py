@@ -0,0 +1,92 @@
+"""
+Benchmark: continuous capture + VAD (+ local wake word) replayed from WAV files.
+
+    python benchmarks/bench_audio_capture.py recordings/*.wav
+    python benchmarks/bench_audio_capture.py            # synthetic speech-like bursts
+
+For each file it reports how many utterances the VAD cut, how fast the
+pipeline runs relative to real time, and (if pocketsphinx is installed)
+wake-word hits and the cost of a wake check per utterance. The old loop
+spent 0.8 s of ambient-noise calibration before every phrase; the
+"dead air saved" line is that cost times the number of utterances.
+"""
+import os
+import sys
+import math
+import time
+import wave
+import random
+import struct
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_capture import AudioCapture, WavSource, PocketSphinxWakeWord  # noqa: E402
+
+OLD_CALIBRATION_SEC = 0.8
+
+
+def synth_wav(path, bursts=20, rate=16000, seed=5):
+    """Background noise with `bursts` voiced segments (0.5-1.5 s) separated by 1-2 s pauses."""
+    rnd = random.Random(seed)
+    samples = []
+
+    def noise(sec):
+        samples.extend(int(rnd.gauss(0, 60)) for _ in range(int(sec * rate)))
+
+    noise(1.0)
+    for _ in range(bursts):
+        dur = rnd.uniform(0.5, 1.5)
+        f0 = rnd.uniform(110, 220)
+        for i in range(int(dur * rate)):
+            t = i / rate
+            env = math.sin(math.pi * t / dur)
+            v = 3000 * env * (math.sin(2 * math.pi * f0 * t) + 0.5 * math.sin(4 * math.pi * f0 * t))
+            samples.append(int(v + rnd.gauss(0, 60)))
+        noise(rnd.uniform(1.0, 2.0))
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(struct.pack(f"<{len(samples)}h", *[max(-32768, min(32767, s)) for s in samples]))
+    return bursts
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("wavs", nargs="*")
+    ap.add_argument("--wake-word", default="orion")
+    args = ap.parse_args()
+
+    expected = {}
+    wavs = list(args.wavs)
+    if not wavs:
+        path = os.path.join(tempfile.gettempdir(), "orion_synthetic_speech.wav")
+        expected[path] = synth_wav(path)
+        wavs = [path]
+
+    wake = PocketSphinxWakeWord(args.wake_word)
+    for path in wavs:
+        source = WavSource(path)
+        with wave.open(path, "rb") as w:
+            audio_sec = w.getnframes() / w.getframerate()
+        capture = AudioCapture(source)
+        t0 = time.perf_counter()
+        utterances = list(capture.utterances())
+        vad_sec = time.perf_counter() - t0
+
+        print(f"{os.path.basename(path)}: {audio_sec:.1f}s audio")
+        want = f" (expected {expected[path]})" if path in expected else ""
+        print(f"  utterances:       {len(utterances)}{want}")
+        print(f"  capture+VAD:      {vad_sec * 1000:.1f} ms ({audio_sec / max(vad_sec, 1e-9):.0f}x real time)")
+        print(f"  dead air saved:   {OLD_CALIBRATION_SEC * len(utterances):.1f}s vs. per-phrase calibration")
+        if wake.available and utterances:
+            t0 = time.perf_counter()
+            hits = sum(wake.detect(u) for u in utterances)
+            per = (time.perf_counter() - t0) / len(utterances)
+            print(f"  wake word hits:   {hits}/{len(utterances)} ({per * 1000:.1f} ms per check)")
+            print("  sent to cloud:    only utterances after a wake hit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: clipboard history under a heavy copy workload.
+
+    python benchmarks/bench_clipboard.py --copies 5000
+
+Feeds a fake clipboard with a mix of short snippets, URLs, repeated
+copies and large log dumps, polling after every copy. Reports memory
+(traced, against the total copied), entries kept, dedup and eviction
+counts, the cost of a poll when nothing changed (with and without a
+clipboard sequence number), and search / item lookup latency compared
+with a linear scan over the stored entries.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from clipboard_history import ClipboardHistory  # noqa: E402
+
+WORDS = ("invoice acme meeting budget report deploy server error token python lunch "
+         "flight hotel address phone password draft review merge branch release").split()
+
+
+class FakeClipboard:
+    """Returns a fresh str on every read, like pyperclip does."""
+    def __init__(self):
+        self.text = ""
+        self.seq = 0
+
+    def copy(self, text):
+        self.text = text
+        self.seq += 1
+
+    def read(self):
+        return (self.text + " ")[:-1]
+
+    def sequence(self):
+        return self.seq
+
+
+def make_copy(rnd, n, recent):
+    r = rnd.random()
+    if r < 0.2 and recent:
+        return rnd.choice(recent)
+    if r < 0.3:
+        return f"https://example.com/{rnd.choice(WORDS)}/{n}?ref={rnd.randrange(10 ** 6)}"
+    if r < 0.35:
+        lines = [f"2024-05-{rnd.randrange(1, 29):02d} INFO {rnd.choice(WORDS)} request {i} took "
+                 f"{rnd.randrange(1000)} ms" for i in range(rnd.randrange(1000, 8000))]
+        return "\n".join(lines)
+    return " ".join(rnd.choice(WORDS) for _ in range(rnd.randrange(2, 30))) + f" #{n}"
+
+
+def per_call_us(fn, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--copies", type=int, default=5000)
+    ap.add_argument("--max-mb", type=float, default=8)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    clip = FakeClipboard()
+    history = ClipboardHistory(max_bytes=int(args.max_mb * 1024 * 1024),
+                               read=clip.read, write=clip.copy, sequence=clip.sequence)
+    copied = 0
+    recent = []
+    elapsed = 0.0
+    tracemalloc.start()
+    for n in range(args.copies):
+        text = make_copy(rnd, n, recent)
+        recent = (recent + [text])[-20:]
+        copied += len(text.encode("utf-8"))
+        clip.copy(text)
+        t0 = time.perf_counter()
+        history.poll()
+        elapsed += time.perf_counter() - t0
+    del recent, text
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    s = history.stats()
+    print(f"Copied:             {args.copies} items, {copied / 1e6:.1f} MB")
+    print(f"Kept:               {s['entries']} entries, {s['chars'] / 1e6:.1f} M chars, "
+          f"accounted {s['bytes'] / 1e6:.1f} MB (cap {args.max_mb:.0f} MB)")
+    print(f"Traced memory:      {current / 1e6:.1f} MB now, {peak / 1e6:.1f} MB peak")
+    print(f"Deduped / evicted:  {s['deduped']} / {s['evicted']}")
+    print(f"Ingest:             {elapsed / args.copies * 1e6:.0f} us per copy")
+
+    big = "\n".join(f"line {i} " + "x" * 60 for i in range(2000))
+    clip.copy(big)
+    history.poll()
+    print(f"Unchanged poll:     {per_call_us(history.poll, 20000):.2f} us with sequence number")
+    history.sequence = None
+    print(f"Unchanged poll:     {per_call_us(history.poll, 2000):.2f} us reading + hashing "
+          f"{len(big) / 1e3:.0f} KB")
+
+    queries = [rnd.choice(WORDS) + " " + rnd.choice(WORDS) for _ in range(50)] + ["#4", "example.com/deploy"]
+    entries = list(history.entries.values())
+
+    def linear(q):
+        return [e for e in reversed(entries) if q in e.value().lower()][:5]
+
+    idx_us = per_call_us(lambda: [history.search(q) for q in queries], 5) / len(queries)
+    lin_us = per_call_us(lambda: [linear(q) for q in queries], 2) / len(queries)
+    print(f"search():           {idx_us:.0f} us per query (linear scan {lin_us:.0f} us)")
+    print(f"item(n):            {per_call_us(lambda: history.item(rnd.randrange(1, len(history) + 1)), 20000):.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: conversation memory over a long session.
+
+    python benchmarks/bench_conversation.py --turns 10000
+
+Prints prompt-context size and per-turn cost as the session grows, next to
+what sending the full history would cost. The memory's context stays within
+its token budget; add() and context() stay flat.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from conversation import ConversationMemory, estimate_tokens  # noqa: E402
+
+WORDS = "the a weather city river music remind tomorrow train ticket price history planet code python".split()
+
+
+def sentence(rnd, n):
+    return " ".join(rnd.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turns", type=int, default=10_000)
+    args = ap.parse_args()
+    rnd = random.Random(2)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="orion_conv_"), "bench.jsonl")
+    memory = ConversationMemory(path)   # extractive summaries, no model calls
+    full_tokens = 0
+    checkpoints = {10, 100, 1000, args.turns}
+    add_total = ctx_total = 0.0
+    print(f"{'turns':>7} {'context tokens':>15} {'full history':>13} {'add us':>8} {'context us':>11}")
+    for i in range(1, args.turns + 1):
+        user = sentence(rnd, rnd.randint(4, 12))
+        answer = " ".join(sentence(rnd, rnd.randint(6, 16)) for _ in range(rnd.randint(1, 4)))
+        full_tokens += estimate_tokens(user) + estimate_tokens(answer)
+        t0 = time.perf_counter()
+        memory.add(user, answer)
+        t1 = time.perf_counter()
+        context = memory.context()
+        t2 = time.perf_counter()
+        add_total += t1 - t0
+        ctx_total += t2 - t1
+        if i in checkpoints:
+            time.sleep(0.05)   # let the background summary catch up
+            print(f"{i:>7} {estimate_tokens(context):>15} {full_tokens:>13} "
+                  f"{add_total / i * 1e6:>8.1f} {ctx_total / i * 1e6:>11.1f}")
+    memory.close()
+    journal_kb = os.path.getsize(path) / 1024
+
+    t0 = time.perf_counter()
+    reloaded = ConversationMemory(path)
+    reloaded.load()
+    print(f"reload: {(time.perf_counter() - t0) * 1000:.1f} ms for a {journal_kb:.0f} KB journal "
+          f"(compacted to {os.path.getsize(path) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Benchmark: thread per task vs. the core asyncio loop (core_loop.py).
+
+    python benchmarks/bench_core_loop.py --commands 2000 --timers 2000
+
+Two workloads, each run both ways:
+
+* commands: a burst of typed commands whose handler blocks for --work
+  seconds, started as one thread per command (what the GUI used to do)
+  or submitted to CoreLoop and run on its bounded executor.
+* timers:   reminders due within the next couple of seconds, as one
+  threading.Timer each or as call_later() handles on the loop.
+
+Reports extra threads at the peak (the loop's own thread included),
+context switches (voluntary + involuntary) and CPU time of the process
+(from psutil, so it runs on Windows too), wall time, start-order
+inversions for commands and firing lag for timers. Finally it measures how
+long a background refresh (asyncio.to_thread) waits while every command
+worker is blocked.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_loop import CoreLoop  # noqa: E402
+
+PROCESS = psutil.Process()
+
+
+def context_switches():
+    ctx = PROCESS.num_ctx_switches()
+    return ctx.voluntary + ctx.involuntary
+
+
+def cpu_seconds():
+    t = PROCESS.cpu_times()
+    return t.user + t.system
+
+
+class Probe:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.peak_threads = threading.active_count()
+        self.started = []
+        self.lags = []
+
+    def sample(self):
+        n = threading.active_count()
+        with self.lock:
+            if n > self.peak_threads:
+                self.peak_threads = n
+
+
+def inversions(order):
+    """Pairs started out of submission order (0 = strictly FIFO)."""
+    return sum(1 for a, b in zip(order, order[1:]) if b < a)
+
+
+def run_commands(mode, n, work):
+    probe = Probe()
+    done = threading.Semaphore(0)
+
+    def handler(i):
+        with probe.lock:
+            probe.started.append(i)
+        probe.sample()
+        time.sleep(work)
+        done.release()
+
+    threads_before = threading.active_count()
+    core = None
+    if mode == "loop":
+        core = CoreLoop(workers=3)
+        core.start()
+
+        async def task(i):
+            await core.run_blocking(handler, i)
+
+    cs0, cpu0, t0 = context_switches(), cpu_seconds(), time.perf_counter()
+    for i in range(n):
+        if mode == "thread":
+            threading.Thread(target=handler, args=(i,), daemon=True).start()
+        else:
+            core.submit(task(i))
+        probe.sample()
+    for _ in range(n):
+        done.acquire()
+    wall = time.perf_counter() - t0
+    switches, cpu = context_switches() - cs0, cpu_seconds() - cpu0
+    if core is not None:
+        core.stop()
+    return {"threads": probe.peak_threads - threads_before, "switches": switches, "cpu": cpu,
+            "wall": wall, "inversions": inversions(probe.started)}
+
+
+def run_timers(mode, n, spread):
+    probe = Probe()
+    done = threading.Semaphore(0)
+
+    def fire(due):
+        probe.sample()
+        with probe.lock:
+            probe.lags.append(time.monotonic() - due)
+        done.release()
+
+    threads_before = threading.active_count()
+    core = CoreLoop(workers=1) if mode == "loop" else None
+    loop = core.start() if core is not None else None
+    cs0, cpu0, t0 = context_switches(), cpu_seconds(), time.perf_counter()
+    start = time.monotonic()
+    for i in range(n):
+        delay = 0.5 + spread * i / n
+        if mode == "thread":
+            timer = threading.Timer(delay, fire, args=(start + delay,))
+            timer.daemon = True
+            timer.start()
+        else:
+            loop.call_soon_threadsafe(loop.call_later, delay - (time.monotonic() - start), fire, start + delay)
+        probe.sample()
+    for _ in range(n):
+        done.acquire()
+    wall = time.perf_counter() - t0
+    switches, cpu = context_switches() - cs0, cpu_seconds() - cpu0
+    if core is not None:
+        core.stop()
+    lags = sorted(probe.lags)
+    return {"threads": probe.peak_threads - threads_before, "switches": switches, "cpu": cpu, "wall": wall,
+            "lag_p50": lags[len(lags) // 2], "lag_max": lags[-1]}
+
+
+def refresh_wait(block):
+    """Seconds a to_thread() refresh waits to start while all command workers block for `block` s."""
+    core = CoreLoop(workers=3)
+    core.start()
+    release = threading.Event()
+
+    async def scenario():
+        for _ in range(core.workers + 2):
+            asyncio.ensure_future(core.run_blocking(release.wait, block))
+        await asyncio.sleep(0.05)   # let the commands occupy every worker
+        t0 = time.perf_counter()
+        started = await asyncio.to_thread(time.perf_counter)
+        return started - t0
+
+    try:
+        return core.submit(scenario()).result(block + 10)
+    finally:
+        release.set()
+        core.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--commands", type=int, default=2000)
+    ap.add_argument("--work", type=float, default=0.002, help="seconds each command blocks")
+    ap.add_argument("--timers", type=int, default=2000)
+    ap.add_argument("--spread", type=float, default=1.0, help="timers fall due over this many seconds")
+    ap.add_argument("--block", type=float, default=2.0, help="seconds the commands block in the refresh test")
+    args = ap.parse_args()
+
+    print(f"{args.commands} commands, {args.work * 1000:.0f} ms of blocking work each")
+    print(f"{'mode':<20}{'extra threads':>14}{'ctx switches':>14}{'CPU s':>8}{'wall s':>9}{'out of order':>14}")
+    for mode, label in (("thread", "thread per command"), ("loop", "core loop")):
+        r = run_commands(mode, args.commands, args.work)
+        print(f"{label:<20}{r['threads']:>14}{r['switches']:>14}{r['cpu']:>8.2f}{r['wall']:>9.2f}"
+              f"{r['inversions']:>14}")
+
+    print()
+    print(f"{args.timers} reminders due over {args.spread:.1f} s")
+    print(f"{'mode':<20}{'extra threads':>14}{'ctx switches':>14}{'CPU s':>8}{'lag p50 ms':>12}{'lag max ms':>12}")
+    for mode, label in (("thread", "thread per timer"), ("loop", "core loop")):
+        r = run_timers(mode, args.timers, args.spread)
+        print(f"{label:<20}{r['threads']:>14}{r['switches']:>14}{r['cpu']:>8.2f}"
+              f"{r['lag_p50'] * 1000:>12.2f}{r['lag_max'] * 1000:>12.2f}")
+
+    print()
+    wait = refresh_wait(args.block)
+    print(f"Refresh while every command worker blocks for {args.block:.0f} s: started after {wait * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+End-to-end latency benchmark with local fakes (see fakes.py).
+
+    python benchmarks/bench_e2e.py                       # all scenarios
+    python benchmarks/bench_e2e.py --scale 0             # Orion's own overhead only
+    python benchmarks/bench_e2e.py --save-baseline       # record benchmarks/e2e_baseline.json
+
+Scenarios:
+
+* text:       a weighted command mix through processCommand, one at a
+              time, waiting for Orion to finish talking in between.
+* concurrent: the same mix from several threads at once, each thread its
+              own session (like command server clients), so commands do
+              not cancel each other's model calls: throughput and
+              handling latency.
+* voice:      the mix spoken into a fake microphone and run through
+              listen_command (VAD, recognition pool, execution stage).
+              Latency is measured from the end of the user's speech.
+
+For each command type it reports p50/p95/p99 of "handled" (processCommand
+returned) and "first audio" (Orion started speaking). Commands that came
+back empty because a newer one superseded them are counted separately and
+left out of the percentiles and throughput. p95s and throughput
+are compared with the saved baseline; a regression beyond --tolerance
+exits with status 1.
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import tempfile
+import threading
+from types import SimpleNamespace
+from collections import defaultdict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+import fakes  # noqa: E402
+from fakes import Latency  # noqa: E402
+
+BASELINE = os.path.join(HERE, "e2e_baseline.json")
+MIN_REGRESSION_MS = 5.0   # ignore p95 changes smaller than this
+
+# (weight, command); "{n}" makes a question unique, i.e. a cache miss.
+COMMAND_MIX = [
+    (3, "open youtube"),
+    (2, "play tum hi ho"),
+    (2, "remind me to stretch in 10 minutes"),
+    (2, "list reminders"),
+    (1, "cache stats"),
+    (2, "find file report"),
+    (3, "what is the capital of france"),
+    (2, "explain how black holes form number {n}"),
+]
+
+
+class Tagged(str):
+    """A command string that carries its sample record through processCommand."""
+    record = None
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(values):
+    return {f"p{p}": round(percentile(values, p) * 1000, 2) for p in (50, 95, 99)} if values else None
+
+
+class Harness:
+    """Imports main against the fakes and times every processCommand call."""
+    def __init__(self, args):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.counter = 0
+        self.records = []
+        self.lock = threading.Lock()
+
+        data = tempfile.mkdtemp(prefix="orion_e2e_")
+        roots = os.path.join(data, "files")
+        os.makedirs(roots)
+        for name in ("report.txt", "quarterly report.pdf", "notes.md", "budget.xlsx"):
+            open(os.path.join(roots, name), "w").close()
+        os.environ["ORION_DATA_DIR"] = data
+        os.environ["ORION_SEARCH_ROOTS"] = roots
+
+        fakes.SCALE = args.scale
+        self.browser = fakes.install(
+            recognizer_latency=Latency(args.recognizer, seed=1),
+            tts_render=Latency(args.tts_render, seed=2),
+            tts_per_word=Latency(args.tts_per_word, seed=3),
+            browser_latency=Latency(args.browser, seed=4),
+        )
+        import main
+        self.main = main
+        main._clients["gemini"] = fakes.FakeGemini(Latency(args.gemini_first, seed=5),
+                                                   Latency(args.gemini_chunk, seed=6))
+        main._clients["wake_word"] = SimpleNamespace(available=False)
+        main.reminder_scheduler.start()
+
+        original = main.processCommand
+
+        def timed(command, log_callback, started=None):
+            tagged = command if isinstance(command, Tagged) else Tagged(command)
+            if tagged.record is None:
+                tagged.record = self.new_record(command)
+            tagged.record["start"] = time.perf_counter()
+            response = None
+            try:
+                response = original(tagged, log_callback, started)
+                return response
+            finally:
+                tagged.record["handled"] = time.perf_counter()
+                tagged.record["superseded"] = not response
+
+        def first_audio(command, seconds):
+            record = getattr(command, "record", None)
+            if record is not None and "audio" not in record:
+                record["audio"] = time.perf_counter()
+
+        main.processCommand = timed
+        main.report_first_audio = first_audio
+
+    def new_record(self, command):
+        intent, _ = self.main.command_router.match(command)
+        record = {"command": str(command), "kind": intent.name if intent is not None else "ai"}
+        with self.lock:
+            self.records.append(record)
+        return record
+
+    def pick(self):
+        weights = [w for w, _ in COMMAND_MIX]
+        command = self.random.choices([c for _, c in COMMAND_MIX], weights)[0]
+        self.counter += 1
+        return command.format(n=self.counter)
+
+    def tagged(self, command, scenario):
+        tagged = Tagged(command)
+        tagged.record = self.new_record(command)
+        tagged.record["scenario"] = scenario
+        return tagged
+
+    # ---- scenarios ----
+    def run_text(self, n):
+        for _ in range(n):
+            command = self.tagged(self.pick(), "text")
+            command.record["origin"] = time.perf_counter()
+            self.main.processCommand(command, lambda msg: None)
+            self.main.speech_worker.wait_idle(30)
+
+    def run_concurrent(self, n, threads):
+        commands = [self.tagged(self.pick(), f"concurrent x{threads}") for _ in range(n)]
+        it = iter(commands)
+        lock = threading.Lock()
+
+        def worker(i):
+            self.main._session.id = f"bench-{threads}-{i}"
+            try:
+                while True:
+                    with lock:
+                        command = next(it, None)
+                    if command is None:
+                        return
+                    command.record["origin"] = time.perf_counter()
+                    self.main.processCommand(command, lambda msg: None)
+            finally:
+                self.main._session.id = None
+
+        t0 = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        answered = sum(not c.record.get("superseded") for c in commands)
+        return answered / (time.perf_counter() - t0), n - answered
+
+    def run_voice(self, n):
+        main = self.main
+        script = [(self.pick(), self.random.uniform(0.8, 1.8)) for _ in range(n)]
+        fakes.FakeRecognizer.transcripts.extend(text for text, _ in script)
+        mic = fakes.FakeMicrophone(script, gap=self.args.voice_gap, ready=main.speech_worker.idle.is_set)
+        main._clients["microphone"] = mic
+        main.LISTENING_ACTIVE = True
+        first = len(self.records)
+        indicator = SimpleNamespace(start_animation=lambda: None, stop_animation=lambda: None)
+        try:
+            main.listen_command(lambda msg: None, indicator)
+        except EOFError:
+            pass
+        main.speech_worker.wait_idle(30)
+        voice_records = self.records[first:]
+        for record, ended in zip(voice_records, mic.burst_ends):
+            record["scenario"] = "voice"
+            record["origin"] = ended
+        return len(voice_records), len(script)
+
+
+def collect(records):
+    """{"scenario/kind/metric": {"p50", "p95", "p99"}} plus sample counts."""
+    grouped = defaultdict(lambda: {"handled": [], "audio": []})
+    for rec in records:
+        if "origin" not in rec or "handled" not in rec or rec.get("superseded"):
+            continue
+        for key in (f"{rec['scenario']}/{rec['kind']}", f"{rec['scenario']}/all"):
+            grouped[key]["handled"].append(rec["handled"] - rec["origin"])
+            if "audio" in rec:
+                grouped[key]["audio"].append(rec["audio"] - rec["origin"])
+    results = {}
+    for key, samples in grouped.items():
+        results[f"{key}/handled"] = summarize(samples["handled"])
+        results[f"{key}/first_audio"] = summarize(samples["audio"])
+        results[f"{key}/n"] = len(samples["handled"])
+    return results
+
+
+def print_table(results):
+    keys = sorted(k[:-2] for k in results if k.endswith("/n"))
+    print(f"{'scenario/command':<34}{'n':>5}  {'handled p50/p95/p99 ms':>26}  {'first audio p50/p95/p99 ms':>28}")
+    for key in keys:
+        cells = []
+        for metric in ("handled", "first_audio"):
+            s = results.get(f"{key}/{metric}")
+            cells.append(f"{s['p50']:.1f}/{s['p95']:.1f}/{s['p99']:.1f}" if s else "-")
+        print(f"{key:<34}{results[key + '/n']:>5}  {cells[0]:>26}  {cells[1]:>28}")
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for key, base in baseline.items():
+        now = results.get(key)
+        if now is None or base is None:
+            continue
+        if key.endswith("/throughput"):
+            if now < base * (1 - tolerance):
+                regressions.append(f"{key}: {now:.1f}/s vs. {base:.1f}/s")
+        elif isinstance(base, dict):
+            if now["p95"] > base["p95"] * (1 + tolerance) and now["p95"] - base["p95"] > MIN_REGRESSION_MS:
+                regressions.append(f"{key}: p95 {now['p95']:.1f} ms vs. {base['p95']:.1f} ms")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scenarios", default="text,concurrent,voice")
+    ap.add_argument("--commands", type=int, default=60, help="commands in the text scenario")
+    ap.add_argument("--concurrent-commands", type=int, default=200)
+    ap.add_argument("--threads", default="4,8")
+    ap.add_argument("--voice-commands", type=int, default=12)
+    ap.add_argument("--voice-gap", type=float, default=1.2,
+                    help="user pause before speaking (s); must exceed the VAD end_silence")
+    ap.add_argument("--scale", type=float, default=1.0, help="multiplies every fake delay")
+    ap.add_argument("--recognizer", default="lognormal:0.6:0.3")
+    ap.add_argument("--gemini-first", default="lognormal:0.5:0.4")
+    ap.add_argument("--gemini-chunk", default="uniform:0.02:0.08")
+    ap.add_argument("--tts-render", default="lognormal:0.15:0.3")
+    ap.add_argument("--tts-per-word", default="fixed:0.05")
+    ap.add_argument("--browser", default="fixed:0.01")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--json", help="also write the results to this file")
+    args = ap.parse_args()
+
+    harness = Harness(args)
+    scenarios = args.scenarios.split(",")
+    results = {}
+    if "text" in scenarios:
+        harness.run_text(args.commands)
+    if "concurrent" in scenarios:
+        for threads in (int(t) for t in args.threads.split(",")):
+            rate, superseded = harness.run_concurrent(args.concurrent_commands, threads)
+            results[f"concurrent x{threads}/throughput"] = round(rate, 2)
+            results[f"concurrent x{threads}/superseded"] = superseded
+            harness.main.speech_worker.wait_idle(120)
+    if "voice" in scenarios:
+        handled, spoken = harness.run_voice(args.voice_commands)
+        results["voice/lost"] = spoken - handled
+
+    results.update(collect(harness.records))
+    print_table(results)
+    for key, value in sorted(results.items()):
+        if key.endswith("/throughput"):
+            print(f"{key}: {value:.1f} commands/s")
+    for key, value in sorted(results.items()):
+        if key.endswith("/superseded"):
+            print(f"{key}: {value} commands superseded by a newer one (not counted)")
+    if "voice/lost" in results:
+        print(f"voice: {results['voice/lost']} of {args.voice_commands} utterances lost")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"baseline saved to {BASELINE}")
+        return 0
+    if not os.path.exists(BASELINE):
+        print("no baseline yet; run with --save-baseline")
+        return 0
+    with open(BASELINE, "r", encoding="utf-8") as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for line in regressions:
+        print("REGRESSION", line)
+    if not regressions:
+        print(f"no regressions beyond {args.tolerance:.0%} of baseline p95 / throughput")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Benchmark: FileIndex vs. the old os.walk search on a synthetic tree.
+
+    python benchmarks/bench_file_index.py --files 500000
+
+The tree is created once under --root (default: a temp folder) and reused
+on later runs. Reported numbers: cold build, search latency while a cold
+build is running on another thread, load from disk, no-op refresh, refresh
+after a few directories change, and per-query latency of the walk vs. the
+index.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from file_index import FileIndex  # noqa: E402
+
+WORDS = ["report", "invoice", "notes", "budget", "photo", "draft", "summary", "plan",
+         "resume", "letter", "slides", "data", "backup", "final", "todo", "meeting"]
+EXTS = [".txt", ".pdf", ".docx", ".xlsx", ".png", ".jpg", ".csv", ".pptx"]
+
+
+def build_tree(root, n_files, files_per_dir=100, fanout=10):
+    marker = os.path.join(root, f".tree_{n_files}")
+    if os.path.exists(marker):
+        return
+    rnd = random.Random(42)
+    n_dirs = max(1, n_files // files_per_dir)
+    made = 0
+    for i in range(n_dirs):
+        parts = []
+        j = i
+        while True:
+            parts.append(f"d{j % fanout}")
+            j //= fanout
+            if not j:
+                break
+        d = os.path.join(root, *parts, f"leaf{i}")
+        os.makedirs(d, exist_ok=True)
+        for k in range(files_per_dir):
+            if made >= n_files:
+                break
+            name = f"{rnd.choice(WORDS)}_{rnd.choice(WORDS)}_{i}_{k}{rnd.choice(EXTS)}"
+            open(os.path.join(d, name), "w").close()
+            made += 1
+    open(marker, "w").close()
+
+
+def walk_search(file_name, search_path):
+    """The search loop main.search_file used before the index existed."""
+    for root, dirs, files in os.walk(search_path):
+        for f in files:
+            if file_name.lower() in f.lower():
+                return os.path.join(root, f)
+    return None
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=500_000)
+    ap.add_argument("--root", default=os.path.join(tempfile.gettempdir(), "orion_bench_tree"))
+    ap.add_argument("--queries", type=int, default=20)
+    args = ap.parse_args()
+
+    os.makedirs(args.root, exist_ok=True)
+    print(f"Building synthetic tree of {args.files} files in {args.root} ...")
+    t, _ = timed(build_tree, args.root, args.files)
+    print(f"  tree ready in {t:.1f}s")
+
+    index_path = args.root.rstrip(os.sep) + "_file_index.pkl"
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    idx = FileIndex([args.root], index_path)
+    t, _ = timed(idx.refresh)
+    print(f"Index cold build:        {t:8.3f}s  ({len(idx)} files)")
+
+    os.remove(index_path)
+    idx = FileIndex([args.root], index_path)
+    builder = threading.Thread(target=idx.refresh)
+    builder.start()
+    during = []
+    while builder.is_alive():
+        t, _ = timed(idx.search, "report", 10)
+        during.append(t)
+        time.sleep(0.01)
+    builder.join()
+    during.sort()
+    print(f"Search during cold build: median {during[len(during) // 2] * 1000:.3f} ms, "
+          f"max {during[-1] * 1000:.3f} ms ({len(during)} searches)")
+
+    idx = FileIndex([args.root], index_path)
+    t, _ = timed(idx.load)
+    print(f"Index load from disk:    {t:8.3f}s")
+    t, n = timed(idx.refresh)
+    print(f"No-op refresh:           {t:8.3f}s  ({n} dirs rescanned)")
+
+    leaves = [e[0] for e in idx.dirs.items() if not e[1][2]][:5]
+    for d in leaves:
+        open(os.path.join(d, "new_quarterly_report.txt"), "w").close()
+    t, n = timed(idx.refresh)
+    print(f"Refresh after 5 changes: {t:8.3f}s  ({n} dirs rescanned)")
+    for d in leaves:
+        os.remove(os.path.join(d, "new_quarterly_report.txt"))
+    idx.refresh()
+
+    rnd = random.Random(7)
+    names = [name for _, name in idx.files.values()]
+    queries = [os.path.splitext(rnd.choice(names))[0] for _ in range(args.queries)]
+    queries += ["zzz_missing"]
+
+    walk_times, index_times = [], []
+    for q in queries:
+        t, _ = timed(walk_search, q, args.root)
+        walk_times.append(t)
+        t, _ = timed(idx.search, q, 10)
+        index_times.append(t)
+
+    def summary(ts):
+        ts = sorted(ts)
+        return f"median {ts[len(ts) // 2] * 1000:9.3f} ms  max {ts[-1] * 1000:9.3f} ms"
+
+    print(f"os.walk search:  {summary(walk_times)}")
+    print(f"FileIndex search: {summary(index_times)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: GUI log pane and transcript under a long, chatty session.
+
+    python benchmarks/bench_gui_log.py --messages 50000
+
+GUI part (needs customtkinter and a display; skipped otherwise):
+--messages log lines are written from a background thread into a plain
+Tk Text widget, once the old way (one bridge callback, insert() and see() per line, unbounded) and
+once through gui.LogPane (queued, one insert per drain, trimmed to
+--max-lines). Reports time spent on the Tk thread, the widget's final
+line count and the cost of inserting one more line at the end.
+
+Transcript part (always runs): the same lines go to transcript.py.
+Reports the cost of write() for the caller, how long the writer needs to
+catch up, the on-disk size against the raw text, and search latency
+across the live file and the compressed archives.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transcript import Transcript  # noqa: E402
+
+
+def messages(n):
+    for i in range(n):
+        if i % 3 == 0:
+            yield f"You: open site number {i}"
+        elif i % 3 == 1:
+            yield f"Orion: Opening site {i}. The weather in London is mild with light rain expected later."
+        else:
+            yield f"Match {i % 5 + 1}: C:\\Users\\me\\Documents\\notes\\file{i}.txt - quarterly report line {i}"
+
+
+def bench_gui(args):
+    try:
+        import tkinter as tk
+        from gui import LogPane
+        root = tk.Tk()
+    except Exception as e:
+        print(f"GUI part skipped: {e}")
+        return
+    from core_loop import TkBridge
+    root.withdraw()
+    results = {}
+    for mode in ("per line", "LogPane"):
+        text = tk.Text(root)
+        busy = [0.0]
+        done = threading.Event()
+        if mode == "per line":
+            bridge = TkBridge(root)
+
+            def insert(message):
+                t0 = time.perf_counter()
+                text.insert("end", message + "\n")
+                text.see("end")
+                busy[0] += time.perf_counter() - t0
+
+            bridge.start()
+            write = lambda message: bridge.call(insert, message)  # noqa: E731
+            finish = lambda: bridge.call(done.set)  # noqa: E731
+        else:
+            pane = LogPane(root, text, max_lines=args.max_lines)
+            drain = pane._drain
+
+            def timed_drain():
+                t0 = time.perf_counter()
+                drain()
+                busy[0] += time.perf_counter() - t0
+
+            pane._drain = timed_drain
+            pane.start()
+            write = pane.write
+            finish = lambda: root.after(200, done.set)  # noqa: E731
+
+        def producer():
+            for message in messages(args.messages):
+                write(message)
+            finish()
+
+        t0 = time.perf_counter()
+        threading.Thread(target=producer, daemon=True).start()
+        while not done.is_set():
+            root.update()
+        wall = time.perf_counter() - t0
+        lines = int(text.index("end-1c").split(".")[0]) - 1
+        t1 = time.perf_counter()
+        for _ in range(100):
+            text.insert("end", "one more line\n")
+            text.see("end")
+        one_more = (time.perf_counter() - t1) / 100
+        results[mode] = (busy[0], wall, lines, one_more)
+        text.destroy()
+    root.destroy()
+    print(f"{args.messages} log lines")
+    print(f"{'mode':<12}{'Tk busy s':>11}{'wall s':>9}{'lines kept':>12}{'next insert us':>16}")
+    for mode, (busy, wall, lines, one_more) in results.items():
+        print(f"{mode:<12}{busy:>11.2f}{wall:>9.2f}{lines:>12}{one_more * 1e6:>16.0f}")
+
+
+def bench_transcript(args):
+    folder = tempfile.mkdtemp(prefix="orion_transcript_")
+    try:
+        transcript = Transcript(os.path.join(folder, "transcript.log"),
+                                max_bytes=args.transcript_kb * 1024, backups=args.backups)
+        transcript.start()
+        raw = 0
+        t0 = time.perf_counter()
+        for message in messages(args.messages):
+            transcript.write(message)
+            raw += len(message) + 22
+        write_us = (time.perf_counter() - t0) / args.messages * 1e6
+        t1 = time.perf_counter()
+        transcript.flush(timeout=60)
+        catch_up = time.perf_counter() - t1
+        s = transcript.stats()
+        live = os.path.getsize(transcript.path) if os.path.exists(transcript.path) else 0
+        archives = s["files"] - (1 if os.path.exists(transcript.path) else 0)
+        t2 = time.perf_counter()
+        found = transcript.search(f"site number {(args.messages - 1) // 3 * 3}", limit=5)
+        first = time.perf_counter() - t2
+        t3 = time.perf_counter()
+        rare = transcript.search("no such line anywhere", limit=5)
+        full = time.perf_counter() - t3
+        transcript.close()
+        print(f"\nTranscript: {args.messages} lines, {raw / 1e6:.1f} MB of text")
+        print(f"write():        {write_us:.2f} us per line on the caller, writer caught up {catch_up * 1000:.0f} ms later")
+        print(f"On disk:        {s['bytes'] / 1e6:.2f} MB in {s['files']} files "
+              f"(live file {live / 1024:.0f} KB, {archives} gzip archives; "
+              f"limits {args.transcript_kb} KB and {args.backups} archives)")
+        print(f"search():       {first * 1000:.1f} ms for a recent hit ({len(found)} line), "
+              f"{full * 1000:.1f} ms scanning everything ({len(rare)} lines)")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=50000)
+    ap.add_argument("--max-lines", type=int, default=1000)
+    ap.add_argument("--transcript-kb", type=int, default=2048)
+    ap.add_argument("--backups", type=int, default=10)
+    args = ap.parse_args()
+    bench_gui(args)
+    bench_transcript(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark: model calls saved by the local intent classifier.
+
+    python benchmarks/bench_intent_classifier.py
+    python benchmarks/bench_intent_classifier.py --threshold 0.5 --show
+
+Runs a corpus of everyday commands (none of them used as training
+examples) through main.command_router twice: keyword routing only, and
+with intent_classifier.py behind it. Reports how many commands would have
+gone to the model, how many of those the classifier kept local, how many
+it got wrong, and its per-command latency. A classifier match only runs a
+skill with side effects when its slot names something real (a known site
+or domain, a song in the library, a reminder time); the corpus includes
+sentences where it does not, which must go to the model.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+import fakes  # noqa: E402
+
+# (command, expected intent or None for the model)
+CORPUS = [
+    # keyword phrasings the router already handles
+    ("open youtube", "open_site"), ("open github.com", "open_site"), ("play tum hi ho", "play"),
+    ("remind me to stretch in 10 minutes", "remind_me"), ("list reminders", "reminders"),
+    ("cancel reminder 2", "reminders"), ("find file report", "find_file"), ("lock the computer", "system"),
+    ("show clipboard", "clipboard"), ("cache stats", "cache_stats"), ("new conversation", "conversation"),
+    # paraphrases without trigger keywords
+    ("launch youtube", "open_site"), ("go to wikipedia", "open_site"), ("take me to reddit.com", "open_site"),
+    ("please visit stackoverflow", "open_site"), ("bring up gmail", "open_site"), ("navigate to amazon", "open_site"),
+    ("pull up netflix please", "open_site"), ("could you launch spotify", "open_site"),
+    ("can you play chaleya", "play"), ("put on lag ja gale", "play"), ("i want to hear kesariya", "play"),
+    ("listen to tum hi ho", "play"), ("please play tere bina", "play"), ("start playing raabta", "play"),
+    ("don't let me forget to call mom in 20 minutes", "remind_me"), ("ping me to check the oven in 5 minutes", "remind_me"),
+    ("nudge me to drink water at 4 pm", "remind_me"), ("alert me to join the meeting at 17:30", "remind_me"),
+    ("where is my file budget", "find_file"), ("locate the file invoice", "find_file"),
+    ("search for the file resume", "find_file"), ("look for the document taxes", "find_file"),
+    ("find my notes file", "find_file"), ("find the contract document", "find_file"),
+    ("how is the cache doing", "cache_stats"), ("show me the cache hit rate", "cache_stats"),
+    ("voice pipeline status", "pipeline_stats"), ("start over", "conversation"),
+    ("let's start fresh", "conversation"), ("forget what we talked about", "conversation"),
+    ("what do you remember about our chat", "conversation"), ("what did i copy", "clipboard"),
+    ("show what i copied", "clipboard"), ("what do i need to remember today", "reminders"),
+    # questions and requests for the model
+    ("what is the capital of germany", None), ("who painted the mona lisa", None),
+    ("how do airplanes fly", None), ("why do cats purr", None), ("explain the theory of relativity", None),
+    ("tell me a fun fact", None), ("what does ephemeral mean", None), ("how far is mars", None),
+    ("when was the eiffel tower built", None), ("write a haiku about rain", None),
+    ("summarize the plot of hamlet", None), ("what should i name my dog", None),
+    ("how do i make pancakes", None), ("translate thank you into french", None),
+    ("give me a workout plan", None), ("is it healthy to skip breakfast", None),
+    ("how many continents are there", None), ("what is machine learning", None),
+    ("who won the world cup in 2018", None), ("suggest a movie for tonight", None),
+    ("how does the stock market work", None), ("what are the benefits of meditation", None),
+    ("help me write an email to my boss", None), ("what is the weather usually like in london", None),
+    ("how do vaccines work", None), ("can you explain recursion", None),
+    ("what is the square root of 144", None), ("describe the water cycle", None),
+    ("what games are fun to play with friends", None), ("how do i play chess", None),
+    ("where do penguins live", None), ("what happened in 1969", None),
+    # everyday sentences that start like a skill's wording
+    ("go to sleep", None), ("take me to your leader", None), ("take me to the moon", None),
+    ("visit my grandmother tomorrow", None), ("listen to me carefully", None),
+    ("start playing chess with me", None), ("go to bed early", None), ("take me to school", None),
+    ("go to hell", None), ("go to the gym", None), ("go to settings", None), ("load the dishwasher", None),
+    ("i want to hear your opinion", None), ("listen to the radio", None), ("put on weight", None),
+    ("start playing football", None), ("ping me back later", None),
+    # paraphrases naming a song that is not in the library
+    ("put on some lofi beats", None), ("listen to shape of you", None), ("start playing despacito", None),
+    ("can you play believer", None), ("please play perfect", None),
+]
+
+
+def load_router():
+    data = tempfile.mkdtemp(prefix="orion_intent_")
+    os.environ["ORION_DATA_DIR"] = data
+    os.environ["ORION_SEARCH_ROOTS"] = data
+    fakes.install()
+    import main
+    return main.command_router
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threshold", type=float, help="override ORION_INTENT_THRESHOLD")
+    ap.add_argument("--rounds", type=int, default=200, help="timing rounds over the corpus")
+    ap.add_argument("--show", action="store_true", help="print every classifier decision")
+    args = ap.parse_args()
+
+    router = load_router()
+    clf = router.classifier
+    if args.threshold is not None:
+        clf.threshold = args.threshold
+    clf.fit()
+
+    keyword_calls = classifier_calls = saved = wrong = missed = 0
+    fallthrough = []
+    for command, expected in CORPUS:
+        router.classifier = None
+        keyword_intent, _ = router.match(command)
+        router.classifier = clf
+        if keyword_intent is None:
+            fallthrough.append(command)
+        intent, _, resolved = router.resolve(command)
+        name = intent.name if intent is not None else None
+        keyword_calls += keyword_intent is None
+        classifier_calls += intent is None
+        if keyword_intent is None and intent is not None:
+            saved += name == expected
+            wrong += name != expected
+        if intent is None and expected is not None:
+            missed += 1
+        if args.show and keyword_intent is None:
+            pred = clf.scores(command)
+            mark = "ok " if name == expected else "BAD"
+            print(f"{mark} {command!r:<50} -> {name or 'model':<14} {resolved!r:<36} best {pred.max():.2f}")
+
+    # Timing: classifier alone, and full resolve(), for commands the keywords miss.
+    t0 = time.perf_counter()
+    for _ in range(args.rounds):
+        for command in fallthrough:
+            clf.classify(command)
+    classify_us = (time.perf_counter() - t0) / (args.rounds * len(fallthrough)) * 1e6
+    t0 = time.perf_counter()
+    for _ in range(args.rounds):
+        for command in fallthrough:
+            router.resolve(command)
+    resolve_us = (time.perf_counter() - t0) / (args.rounds * len(fallthrough)) * 1e6
+
+    s = clf.stats()
+    print(f"Corpus:                  {len(CORPUS)} commands "
+          f"({sum(e is None for _, e in CORPUS)} meant for the model)")
+    print(f"Classifier:              {s['examples']} examples, {s['labels']} skills, "
+          f"{s['bytes'] / 1024:.0f} KB, threshold {clf.threshold:.2f}")
+    print(f"Model calls, keywords:   {keyword_calls}")
+    print(f"Model calls, classifier: {classifier_calls} "
+          f"({keyword_calls - classifier_calls} removed, {saved} to the right skill)")
+    print(f"Wrong local matches:     {wrong}")
+    print(f"Still sent to model:     {missed} local commands")
+    print(f"classify():              {classify_us:.1f} us per command")
+    print(f"resolve():               {resolve_us:.1f} us per command")
+
+
+if __name__ == "__main__":
+    main()
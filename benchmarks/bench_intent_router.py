@@ -0,0 +1,125 @@
+"""
+Micro-benchmark: IntentRouter dispatch cost as the number of skills grows,
+compared with an if/elif chain of substring checks of the same size.
+
+    python benchmarks/bench_intent_router.py
+
+It first checks main.command_router's keyword routing (classifier off)
+against ROUTING_CASES: imperatives must reach their skill, and questions
+that merely contain a trigger word ("how do I restart my router") must
+go to the model. Any mismatch is listed and the script exits with status 1.
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+from intent_router import IntentRouter  # noqa: E402
+
+COMMANDS = [
+    "open youtube", "remind me to call mom in 10 minutes", "play tum hi ho",
+    "find file quarterly report", "what is the weather like on mars today",
+    "lock the computer", "show clipboard", "tell me a joke about programmers",
+]
+
+# (command, expected intent or None for the model)
+ROUTING_CASES = [
+    ("open youtube", "open_site"), ("please open github.com", "open_site"),
+    ("can you open youtube", "open_site"), ("could you open github.com please", "open_site"),
+    ("open youtube and play music", "open_site"),
+    ("set a reminder to call mom in 10 minutes", "remind_me"), ("remind me to stretch at 17:30", "remind_me"),
+    ("list reminders", "reminders"), ("show my reminders", "reminders"), ("cancel reminder 2", "reminders"),
+    ("snooze reminder 2 for 5 minutes", "reminders"), ("delete reminder 3", "reminders"),
+    ("lock the computer", "system"), ("lock", "system"), ("restart my pc", "system"),
+    ("shut down the computer", "system"), ("please log off", "system"),
+    ("can you lock my computer", "system"), ("could you please restart the pc?", "system"),
+    # questions that mention a trigger word
+    ("how do i restart my router", None), ("what is a lock screen", None),
+    ("tell me about the lock ness monster", None), ("why does windows restart on its own", None),
+    ("should i shutdown my laptop every night", None), ("can you lock my computer and delete my files", None),
+    ("can you restart my router remotely", None),
+    ("how do i open a pdf file", None), ("what is the open source license", None),
+    ("can you tell me when the shops open", None), ("can you open a pdf file for me", None),
+]
+
+
+def check_routing():
+    """Mismatches of main.command_router (keywords only) against ROUTING_CASES."""
+    import fakes
+    data = tempfile.mkdtemp(prefix="orion_router_")
+    os.environ["ORION_DATA_DIR"] = data
+    os.environ["ORION_SEARCH_ROOTS"] = data
+    fakes.install()
+    import main
+    router = main.command_router
+    classifier, router.classifier = router.classifier, None
+    try:
+        wrong = []
+        for command, expected in ROUTING_CASES:
+            intent, _ = router.match(command)
+            name = intent.name if intent is not None else None
+            if name != expected:
+                wrong.append((command, expected, name))
+        return wrong
+    finally:
+        router.classifier = classifier
+
+
+def make_skills(n):
+    rnd = random.Random(n)
+    skills = [("open", r"^\s*(?:(?:can|could|would)\s+you\s+)?(?:please\s+)?open\s+(?!(?:a|an|the)\b)"
+                       r"(?P<site>[^\s?!]+?)(?:\s+please|\s+and\b.*)?\s*[?.!]?$"),
+               ("remind me", None), ("play", r"^play\s*(?P<song>.*)$"),
+              ("find file", r"find file\s*(?P<name>.*)$"), ("lock", None), ("clipboard", None)]
+    while len(skills) < n:
+        word = "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(7))
+        skills.append((f"{word} {len(skills)}", None))
+    return skills
+
+
+def build_router(skills):
+    router = IntentRouter()
+    for i, (kw, pattern) in enumerate(skills):
+        router.register(f"skill{i}", None, keywords=[kw], patterns=[pattern] if pattern else [], priority=i)
+    return router
+
+
+def chain_match(skills, text):
+    text = text.lower()
+    for i, (kw, _) in enumerate(skills):
+        if kw in text:
+            return i
+    return None
+
+
+def per_call_us(fn, arg_list, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for a in arg_list:
+            fn(a)
+    return (time.perf_counter() - t0) / (rounds * len(arg_list)) * 1e6
+
+
+def main():
+    wrong = check_routing()
+    print(f"Routing cases:  {len(ROUTING_CASES)}, wrong: {len(wrong)}")
+    for command, expected, got in wrong:
+        print(f"  {command!r}: expected {expected or 'model'}, got {got or 'model'}")
+    print(f"{'skills':>7} {'router us':>10} {'if/elif us':>11}")
+    for n in (10, 50, 100, 500, 1000, 5000):
+        skills = make_skills(n)
+        router = build_router(skills)
+        rounds = 2000 if n <= 1000 else 200
+        r = per_call_us(router.match, COMMANDS, rounds)
+        c = per_call_us(lambda t: chain_match(skills, t), COMMANDS, rounds)
+        print(f"{n:>7} {r:>10.2f} {c:>11.2f}")
+    if wrong:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Check: LocationProvider (location.py) against a stand-in geolocation service.
+
+    python benchmarks/bench_location.py                 # 3 s client timeout, 4 s slow replies
+    python benchmarks/bench_location.py --slow 6 --repeat 5000
+
+An http.server on 127.0.0.1 stands in for ipinfo.io; it answers with a fixed
+location, counts requests, and can be switched to replying late (--slow
+seconds, past the provider's timeout) or failing with HTTP 500. The script
+points LocationProvider(url=...) at it and checks, with timings:
+
+* cold:     the first refresh() fetches the location and writes the cache file.
+* ttl:      --repeat get() calls and refresher passes within the TTL make no
+            request.
+* timeout:  with a stale cache and a slow service, refresh() gives up after
+            the timeout and get() still returns the cached location.
+* error:    an HTTP 500 keeps the cached location too.
+* restart:  a new provider on the same cache file serves the location
+            before any request and does not need a refresh.
+
+Exits with status 1 if any check fails.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+from location import LocationProvider, network_fingerprint  # noqa: E402
+
+ANSWER = {"ip": "203.0.113.7", "city": "Pune", "region": "Maharashtra", "country": "IN"}
+EXPECTED = "Pune, Maharashtra, IN"
+
+
+class StandIn:
+    """The geolocation service: mode is "ok", "slow" or "error"; hits counts requests."""
+    def __init__(self, slow):
+        self.mode = "ok"
+        self.slow = slow
+        self.hits = 0
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                service.hits += 1
+                if service.mode == "slow":
+                    time.sleep(service.slow)
+                if service.mode == "error":
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                body = json.dumps(ANSWER).encode("utf-8")
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except ConnectionError:
+                    pass   # the client timed out and hung up
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/json"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--timeout", type=float, default=3.0, help="LocationProvider timeout")
+    ap.add_argument("--slow", type=float, default=4.0, help="how late the slow service replies")
+    ap.add_argument("--repeat", type=int, default=1000, help="get() calls in the TTL check")
+    args = ap.parse_args()
+
+    service = StandIn(args.slow)
+    cache = os.path.join(tempfile.mkdtemp(prefix="orion_location_"), "location.json")
+    results = []
+
+    def check(name, ok, detail):
+        results.append(ok)
+        print(f"{name:<10}{'ok' if ok else 'FAIL':<6}{detail}")
+
+    print(f"Stand-in service at {service.url}; timeout {args.timeout:.1f} s, slow replies after {args.slow:.1f} s")
+    provider = LocationProvider(cache, url=service.url, timeout=args.timeout)
+
+    t0 = time.perf_counter()
+    fetched = provider.refresh()
+    ms = (time.perf_counter() - t0) * 1000
+    check("cold", fetched and provider.get() == EXPECTED and os.path.exists(cache),
+          f"{provider.get()!r} in {ms:.1f} ms, cache file written: {os.path.exists(cache)}")
+
+    hits = service.hits
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        provider.get()
+    get_us = (time.perf_counter() - t0) / args.repeat * 1e6
+    for _ in range(5):
+        provider._step(0)
+    check("ttl", service.hits == hits,
+          f"{args.repeat} get() at {get_us:.2f} us each + 5 refresher passes: {service.hits - hits} requests")
+
+    provider.fetched = 0.0   # past the TTL
+    service.mode = "slow"
+    t0 = time.perf_counter()
+    fetched = provider.refresh()
+    waited = time.perf_counter() - t0
+    check("timeout", not fetched and waited < args.timeout + 0.5 and provider.get() == EXPECTED,
+          f"gave up after {waited:.2f} s, get() = {provider.get()!r}")
+
+    service.mode = "error"
+    fetched = provider.refresh()
+    check("error", not fetched and provider.get() == EXPECTED, f"HTTP 500, get() = {provider.get()!r}")
+
+    service.mode = "ok"
+    provider.refresh()
+    hits = service.hits
+    t0 = time.perf_counter()
+    restarted = LocationProvider(cache, url=service.url, timeout=args.timeout)
+    ms = (time.perf_counter() - t0) * 1000
+    check("restart", restarted.get() == EXPECTED and not restarted.needs_refresh(network_fingerprint())
+          and service.hits == hits,
+          f"{restarted.get()!r} {ms:.1f} ms after construction, {service.hits - hits} requests")
+
+    service.stop()
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
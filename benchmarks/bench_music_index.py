@@ -0,0 +1,66 @@
+"""
+Benchmark: MusicIndex build and lookup on a large synthetic catalog.
+
+    python benchmarks/bench_music_index.py --tracks 100000
+
+Reports the share of lookups that resolve to the intended title for exact,
+typo and partial queries, and how often a single common word plays any
+track at all (it should not: many titles contain it).
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from music_index import MusicIndex  # noqa: E402
+
+WORDS = ["dil", "tere", "tum", "hi", "ho", "pyaar", "raat", "ishq", "jaan", "saath", "sapne",
+         "baarish", "yaadein", "mera", "teri", "zindagi", "chand", "sitare", "dhadkan", "safar",
+         "love", "night", "fire", "city", "dream", "heart", "light", "river", "summer", "gold"]
+
+
+def typo(text, rnd):
+    i = rnd.randrange(len(text))
+    return text[:i] + text[i + 1:]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tracks", type=int, default=100_000)
+    ap.add_argument("--queries", type=int, default=500)
+    args = ap.parse_args()
+    rnd = random.Random(3)
+
+    idx = MusicIndex()
+    titles = []
+    t0 = time.perf_counter()
+    while len(idx) < args.tracks:
+        title = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(2, 5))) + f" {rnd.randint(1, 999)}"
+        if idx.add(title, f"https://example.com/{len(idx)}") is not None:
+            titles.append(title)
+    print(f"Build: {time.perf_counter() - t0:.2f}s for {len(idx)} tracks "
+          f"({len(idx.duplicates)} duplicate titles skipped)")
+
+    sample = rnd.sample(titles, args.queries)
+    cases = {
+        "exact": [t.upper() for t in sample],
+        "typo": [typo(t, rnd) for t in sample],
+        "partial": [" ".join(t.split()[:-1]) for t in sample],
+    }
+    for name, queries in cases.items():
+        hits = 0
+        t0 = time.perf_counter()
+        for q, want in zip(queries, sample):
+            best = idx.best(q)
+            hits += bool(best and best[0] == want)
+        dt = (time.perf_counter() - t0) / len(queries)
+        print(f"{name:>8}: {dt * 1000:7.3f} ms/lookup, top-1 = intended title for {hits / len(queries):.0%}")
+    words = [rnd.choice(WORDS) for _ in range(args.queries)]
+    played = sum(idx.best(w) is not None for w in words)
+    print(f"one word: a track played for {played / len(words):.0%} of single common words")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark: CPU time and wakeups of Orion's always-on work in each power tier.
+
+    python benchmarks/bench_power.py                 # 5 s of animation per tier
+    python benchmarks/bench_power.py --seconds 20 --draw-us 800
+
+For every tier in power.TIERS:
+
+* animations: frames.FrameScheduler runs the orbital and listening
+  animations for --seconds on a small after() loop standing in for Tk (no
+  display needed). Each frame does the orbital's coordinate math plus
+  --draw-us of busy work standing in for Tk's redraw, which cannot be
+  measured headless. Reports frames per second, wakeups per second and
+  CPU milliseconds per second.
+* telemetry: the cost of one TelemetrySampler.sample() (skipped when
+  psutil is missing) times samples per second at the tier's interval.
+* microphone: a synthetic recording (speech-like bursts in noise) through
+  WavSource + AudioCapture with the tier's read batch and VAD stride. Reports
+  mic wakeups per second of audio, CPU per second of audio, utterances
+  found (none may be lost) and the worst-case delay the batching adds.
+
+The totals show what each tier saves against "performance".
+"""
+import os
+import sys
+import math
+import time
+import heapq
+import wave
+import argparse
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+from frames import FrameScheduler  # noqa: E402
+from audio_capture import AudioCapture, WavSource  # noqa: E402
+from power import TIERS  # noqa: E402
+from bench_audio_capture import synth_wav  # noqa: E402
+
+
+class AfterLoop:
+    """The part of Tk FrameScheduler uses: after()/after_cancel() on one thread. Counts wakeups."""
+    def __init__(self):
+        self.timers = []
+        self.cancelled = set()
+        self.seq = 0
+        self.wakeups = 0
+
+    def after(self, ms, fn):
+        self.seq += 1
+        heapq.heappush(self.timers, (time.perf_counter() + ms / 1000, self.seq, fn))
+        return self.seq
+
+    def after_cancel(self, after_id):
+        self.cancelled.add(after_id)
+
+    def state(self):
+        return "normal"
+
+    def winfo_viewable(self):
+        return True
+
+    def run(self, seconds):
+        end = time.perf_counter() + seconds
+        while self.timers:
+            due, seq, fn = heapq.heappop(self.timers)
+            if due > end:
+                return
+            if seq in self.cancelled:
+                continue
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.wakeups += 1
+            fn()
+
+
+def busy(us):
+    end = time.perf_counter() + us / 1e6
+    while time.perf_counter() < end:
+        pass
+
+
+def bench_frames(tier, args):
+    root = AfterLoop()
+    frames = FrameScheduler(root, fps=tier.fps)
+    angles = [i * 30.0 for i in range(5)]
+
+    def orbital(dt):
+        for i, r in enumerate((40, 70, 100, 130, 160)):
+            angles[i] = (angles[i] + 75 * (i % 2 * 0.6 + 0.6) * dt) % 360
+            a = math.radians(angles[i])
+            _ = (210 + r * math.cos(a), 210 + r * math.sin(a))
+        busy(args.draw_us)
+
+    frames.register("orbital", orbital)
+    frames.register("indicator", lambda dt: busy(args.draw_us / 5))
+    frames.register("clock", lambda dt: None, interval=0.5)
+    frames.start()
+    cpu0 = time.process_time()
+    root.run(args.seconds)
+    cpu = time.process_time() - cpu0
+    frames.stop()
+    return frames.frames / args.seconds, root.wakeups / args.seconds, cpu / args.seconds * 1000
+
+
+def telemetry_sample_cost(repeat=20):
+    """CPU seconds per TelemetrySampler.sample(), or None without psutil."""
+    try:
+        from telemetry import TelemetrySampler
+    except ImportError:
+        return None
+    sampler = TelemetrySampler()
+    sampler.sample()
+    cpu0 = time.process_time()
+    for _ in range(repeat):
+        sampler.sample()
+    return (time.process_time() - cpu0) / repeat
+
+
+def bench_mic(tier, path, audio_sec, repeat):
+    cpu0 = time.process_time()
+    for _ in range(repeat):
+        source = WavSource(path, batch=tier.listen_batch)
+        capture = AudioCapture(source, vad_stride=tier.vad_stride)
+        utterances = list(capture.utterances())
+    cpu = (time.process_time() - cpu0) / repeat
+    frame_sec = source.chunk / source.sample_rate
+    return (source.reads / audio_sec, cpu / audio_sec * 1000, len(utterances),
+            (tier.listen_batch - 1) * frame_sec * 1000, capture.frames_checked / capture.frames_seen)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=5.0, help="animation run per tier")
+    ap.add_argument("--draw-us", type=float, default=400.0, help="modeled Tk redraw per orbital frame")
+    ap.add_argument("--bursts", type=int, default=20, help="speech bursts in the synthetic recording")
+    ap.add_argument("--repeat", type=int, default=5, help="passes over the recording per tier")
+    args = ap.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), "orion_power_speech.wav")
+    synth_wav(path, bursts=args.bursts)
+    with wave.open(path, "rb") as w:
+        audio_sec = w.getnframes() / w.getframerate()
+    sample_cost = telemetry_sample_cost()
+
+    print(f"Animations {args.seconds:.0f} s per tier ({args.draw_us:.0f} us modeled redraw per frame); "
+          f"microphone: {audio_sec:.0f} s synthetic recording, 1024-sample frames at 16 kHz")
+    if sample_cost is None:
+        print("Telemetry CPU skipped: psutil not installed (wakeups still counted)")
+    print(f"{'tier':<12}{'fps':>6}{'anim ms/s':>11}{'tel/s':>7}{'tel ms/s':>10}{'mic/s':>7}{'mic ms/s':>10}"
+          f"{'VAD share':>11}{'utts':>6}{'+delay ms':>11}{'wakeups/s':>11}{'CPU ms/s':>10}")
+    totals = []
+    for tier in TIERS:
+        fps, anim_wakeups, anim_cpu = bench_frames(tier, args)
+        tel_rate = 1 / tier.telemetry_interval
+        tel_cpu = sample_cost * tel_rate * 1000 if sample_cost is not None else 0.0
+        mic_rate, mic_cpu, utts, delay, checked = bench_mic(tier, path, audio_sec, args.repeat)
+        wakeups = anim_wakeups + tel_rate + mic_rate
+        cpu = anim_cpu + tel_cpu + mic_cpu
+        totals.append((tier.name, wakeups, cpu))
+        tel_text = f"{tel_cpu:>10.2f}" if sample_cost is not None else f"{'-':>10}"
+        print(f"{tier.name:<12}{fps:>6.1f}{anim_cpu:>11.1f}{tel_rate:>7.2f}{tel_text}{mic_rate:>7.1f}{mic_cpu:>10.2f}"
+              f"{checked * 100:>10.0f}%{utts:>6}{delay:>11.0f}{wakeups:>11.1f}{cpu:>10.1f}")
+    _, base_wakeups, base_cpu = totals[0]
+    print()
+    for name, wakeups, cpu in totals[1:]:
+        print(f"{name:<12} {(1 - wakeups / base_wakeups) * 100:.0f}% fewer wakeups, "
+              f"{(1 - cpu / base_cpu) * 100:.0f}% less CPU than {totals[0][0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Benchmark: speech recognizer backends and automatic backend selection.
+
+    python benchmarks/bench_recognizers.py recordings/*.wav
+    python benchmarks/bench_recognizers.py            # synthetic fixtures
+
+Part 1 runs every installed backend (recognizers.py) over the WAV
+fixtures, one file per utterance, and reports per-utterance latency and
+real-time factor. A transcript next to a fixture (same name, .txt) adds
+word accuracy. Backends whose packages are missing are listed as skipped.
+
+Part 2 replays a session of utterances against simulated backends on a
+virtual clock, so it needs no network or models: Google with a lognormal
+network latency, a local engine costing a fixed fraction of the audio
+length. The session contains a network outage, where calls fail only
+after the request timeout, and a slow-network stretch. Four policies are
+compared: Google only, local only, "Google then local" on every
+utterance, and RecognizerSelector. For each it reports lost utterances,
+latency percentiles and the share of utterances Google handled.
+"""
+import os
+import sys
+import glob
+import math
+import wave
+import random
+import struct
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_capture import Utterance  # noqa: E402
+from recognizers import (GoogleBackend, PocketSphinxBackend, RecognizerSelector,  # noqa: E402
+                         NoSpeech, RecognitionUnavailable)
+
+
+def synth_fixtures(folder, count=10, rate=16000, seed=3):
+    """Speech-like tone bursts of 1-3 s, one WAV each."""
+    rnd = random.Random(seed)
+    paths = []
+    for n in range(count):
+        dur = rnd.uniform(1.0, 3.0)
+        f0 = rnd.uniform(110, 220)
+        samples = []
+        for i in range(int(dur * rate)):
+            t = i / rate
+            env = math.sin(math.pi * t / dur)
+            v = 3000 * env * (math.sin(2 * math.pi * f0 * t) + 0.5 * math.sin(4 * math.pi * f0 * t))
+            samples.append(max(-32768, min(32767, int(v + rnd.gauss(0, 60)))))
+        path = os.path.join(folder, f"utterance{n}.wav")
+        with wave.open(path, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(rate)
+            w.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+        paths.append(path)
+    return paths
+
+
+def load_utterance(path):
+    with wave.open(path, "rb") as w:
+        pcm = w.readframes(w.getnframes())
+        return Utterance(pcm, w.getframerate(), w.getsampwidth(), 0.0, 0.0)
+
+
+def word_accuracy(reference, hypothesis):
+    """1 - word error rate (edit distance over words)."""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return max(0.0, 1 - row[-1] / max(1, len(ref)))
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))] if values else float("nan")
+
+
+def bench_real(paths):
+    from time import perf_counter
+    utterances = [(path, load_utterance(path)) for path in paths]
+    audio = sum(u.duration for _, u in utterances)
+    print(f"{len(utterances)} fixtures, {audio:.1f} s of audio")
+    print(f"{'backend':<10}{'p50 ms':>9}{'p95 ms':>9}{'RTF':>7}{'no speech':>11}{'accuracy':>10}")
+    backends = [GoogleBackend(lambda: _google_recognizer()), PocketSphinxBackend()]
+    for backend in backends:
+        if not backend.available:
+            print(f"{backend.name:<10}  skipped (not installed)")
+            continue
+        latencies, empty, accuracy = [], 0, []
+        for path, u in utterances:
+            t0 = perf_counter()
+            try:
+                text = backend.recognize(u)
+            except NoSpeech:
+                text, empty = "", empty + 1
+            except Exception as e:
+                print(f"{backend.name:<10}  failed on {os.path.basename(path)}: {e}")
+                break
+            latencies.append(perf_counter() - t0)
+            transcript = os.path.splitext(path)[0] + ".txt"
+            if os.path.exists(transcript):
+                with open(transcript, "r", encoding="utf-8") as f:
+                    accuracy.append(word_accuracy(f.read(), text))
+        if not latencies:
+            continue
+        acc = f"{sum(accuracy) / len(accuracy) * 100:.0f}%" if accuracy else "-"
+        print(f"{backend.name:<10}{percentile(latencies, 0.5) * 1000:>9.0f}{percentile(latencies, 0.95) * 1000:>9.0f}"
+              f"{sum(latencies) / audio:>7.2f}{empty:>11}{acc:>10}")
+
+
+_recognizer = []
+
+
+def _google_recognizer():
+    if not _recognizer:
+        import speech_recognition as sr
+        _recognizer.append(sr.Recognizer())
+    return _recognizer[0]
+
+
+# ---- simulated session ----
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SimGoogle:
+    name = "google"
+    local = False
+    available = True
+
+    def __init__(self, clock, rnd, timeout):
+        self.clock = clock
+        self.rnd = rnd
+        self.timeout = timeout
+        self.outage = (0, 0)
+        self.slow = (0, 0)
+
+    def recognize(self, utterance):
+        t = self.clock.now
+        if self.outage[0] <= t < self.outage[1]:
+            self.clock.now += self.timeout
+            raise ConnectionError("request timed out")
+        latency = self.rnd.lognormvariate(math.log(0.6), 0.3)
+        if self.slow[0] <= t < self.slow[1]:
+            latency += 3.5
+        self.clock.now += latency
+        return "ok"
+
+
+class SimLocal:
+    name = "sphinx"
+    local = True
+    available = True
+
+    def __init__(self, clock, rtf):
+        self.clock = clock
+        self.rtf = rtf
+
+    def recognize(self, utterance):
+        self.clock.now += self.rtf * utterance.duration
+        return "ok"
+
+
+class FixedOrder:
+    """Tries the backends in order on every utterance, without health tracking."""
+    def __init__(self, backends):
+        self.backends = backends
+
+    def recognize(self, utterance):
+        for backend in self.backends:
+            try:
+                return backend.recognize(utterance), backend.name
+            except Exception:
+                continue
+        raise RecognitionUnavailable("all failed")
+
+
+def simulate(policy, args):
+    clock = VirtualClock()
+    rnd = random.Random(args.seed)
+    google = SimGoogle(clock, rnd, args.timeout)
+    local = SimLocal(clock, args.local_rtf)
+    span = args.utterances * args.gap
+    google.outage = (0.3 * span, 0.3 * span + args.outage)
+    google.slow = (0.7 * span, 0.7 * span + args.slow)
+    if policy == "google only":
+        chooser = FixedOrder([google])
+    elif policy == "local only":
+        chooser = FixedOrder([local])
+    elif policy == "google, then local":
+        chooser = FixedOrder([google, local])
+    else:
+        chooser = RecognizerSelector([google, local], max_latency=args.max_latency, clock=clock)
+    urnd = random.Random(args.seed + 1)
+    latencies, lost, by_google = [], 0, 0
+    for i in range(args.utterances):
+        clock.now = max(clock.now, i * args.gap)
+        duration = urnd.uniform(1.0, 3.0)
+        u = Utterance(b"\0\0" * int(16000 * duration), 16000, 2, 0.0, 0.0)
+        t0 = clock.now
+        try:
+            _, name = chooser.recognize(u)
+        except RecognitionUnavailable:
+            lost += 1
+            continue
+        latencies.append(clock.now - t0)
+        by_google += name == "google"
+    return lost, latencies, by_google
+
+
+def bench_selection(args):
+    print(f"\nSimulated session: {args.utterances} utterances every {args.gap:.0f} s, "
+          f"{args.outage:.0f} s outage (timeout {args.timeout:.0f} s), {args.slow:.0f} s slow network")
+    print(f"{'policy':<22}{'lost':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'mean ms':>9}{'google':>8}")
+    for policy in ("google only", "local only", "google, then local", "selector"):
+        lost, lat, by_google = simulate(policy, args)
+        handled = max(1, len(lat))
+        print(f"{policy:<22}{lost:>6}{percentile(lat, 0.5) * 1000:>9.0f}{percentile(lat, 0.95) * 1000:>9.0f}"
+              f"{percentile(lat, 0.99) * 1000:>9.0f}{sum(lat) / handled * 1000:>9.0f}{by_google / handled * 100:>7.0f}%")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("wavs", nargs="*", help="WAV fixtures, one utterance each (globs allowed)")
+    ap.add_argument("--utterances", type=int, default=600)
+    ap.add_argument("--gap", type=float, default=3.0, help="seconds between utterances")
+    ap.add_argument("--outage", type=float, default=180.0, help="seconds of network outage")
+    ap.add_argument("--slow", type=float, default=120.0, help="seconds of slow network (+3.5 s per call)")
+    ap.add_argument("--timeout", type=float, default=5.0, help="Google request timeout")
+    ap.add_argument("--local-rtf", type=float, default=0.3, help="local engine cost per second of audio")
+    ap.add_argument("--max-latency", type=float, default=2.5)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    paths = [p for pattern in args.wavs for p in sorted(glob.glob(pattern))]
+    if paths:
+        bench_real(paths)
+    else:
+        with tempfile.TemporaryDirectory() as folder:
+            bench_real(synth_fixtures(folder))
+    bench_selection(args)
+
+
+if __name__ == "__main__":
+    main()
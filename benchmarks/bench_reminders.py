@@ -0,0 +1,79 @@
+"""
+Benchmark: ReminderScheduler holding many pending reminders.
+
+    python benchmarks/bench_reminders.py --count 100000
+
+Reports thread count, traced memory per reminder, add/cancel/snooze
+throughput, journal replay time after a simulated restart, and the firing
+lag of a burst of short reminders.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from reminders import ReminderScheduler  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--count", type=int, default=100_000)
+    args = ap.parse_args()
+    n = args.count
+
+    journal = os.path.join(tempfile.mkdtemp(prefix="orion_rem_"), "reminders.journal")
+    threads_before = threading.active_count()
+
+    tracemalloc.start()
+    sched = ReminderScheduler(journal)
+    sched.start()
+    rnd = random.Random(1)
+    t0 = time.perf_counter()
+    ids = [sched.add_in(f"task number {i}", 3600 + rnd.random() * 86400).id for i in range(n)]
+    t_add = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Pending reminders:  {len(sched)}")
+    print(f"Threads:            {threads_before} -> {threading.active_count()}")
+    print(f"Memory:             {current / 1e6:.1f} MB ({current / n:.0f} B per reminder)")
+    print(f"add():              {n / t_add:,.0f} ops/s")
+
+    sample = rnd.sample(ids, min(n, 10_000))
+    t0 = time.perf_counter()
+    for rid in sample[: len(sample) // 2]:
+        sched.cancel(rid)
+    for rid in sample[len(sample) // 2:]:
+        sched.snooze(rid, 7200)
+    t_mix = time.perf_counter() - t0
+    print(f"cancel()/snooze():  {len(sample) / t_mix:,.0f} ops/s")
+
+    t0 = time.perf_counter()
+    sched.list(limit=10)
+    print(f"list(limit=10):     {(time.perf_counter() - t0) * 1000:.2f} ms")
+    sched.stop()
+
+    t0 = time.perf_counter()
+    restarted = ReminderScheduler(journal)
+    restarted.start()
+    print(f"Journal replay:     {time.perf_counter() - t0:.2f} s ({len(restarted)} pending)")
+
+    fired = []
+    restarted.on_fire = lambda rem: fired.append(time.time() - rem.due)
+    burst = 1000
+    for i in range(burst):
+        restarted.add_in(f"burst {i}", 0.5 + i / burst)
+    while len(fired) < burst:
+        time.sleep(0.05)
+    fired.sort()
+    print(f"Firing lag:         p50 {fired[burst // 2] * 1000:.2f} ms, max {fired[-1] * 1000:.2f} ms")
+    restarted.stop()
+
+
+if __name__ == "__main__":
+    main()
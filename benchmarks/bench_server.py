@@ -0,0 +1,257 @@
+"""
+Load test for the command server (command_server.py) with local fakes.
+
+    python benchmarks/bench_server.py                          # 50 clients, 1/4/8 workers
+    python benchmarks/bench_server.py --clients 200 --queue-limit 32
+
+Orion is imported against the fakes in fakes.py (Gemini with a streamed,
+delayed answer, a browser that takes a few milliseconds), and a
+CommandServer is started in-process on a free port. --clients simulated
+clients then send --per-client commands each from one event loop, half
+over POST /command and half over a WebSocket, each waiting for its
+previous reply before sending the next (a closed loop). The command mix
+is the one bench_e2e.py uses.
+
+For every worker count it reports throughput, latency to the "result"
+event (p50/p95/p99), time to the first streamed event after the session
+event, and how many requests were refused with 503 / "busy" because the
+queue was full.
+
+Before the load runs it checks the access rules against ACCESS_CASES:
+requests without the token and Origins that only start like a local one
+(http://localhost.evil.com) must be refused on /command, /ws and /health.
+Any mismatch is listed and the script exits with status 1.
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import itertools
+import tempfile
+from types import SimpleNamespace
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+import fakes  # noqa: E402
+from fakes import Latency  # noqa: E402
+
+COMMAND_MIX = [
+    (3, "open youtube"),
+    (2, "play tum hi ho"),
+    (2, "remind me to stretch in 10 minutes"),
+    (2, "list reminders"),
+    (1, "cache stats"),
+    (2, "find file report"),
+    (3, "what is the capital of france"),
+    (2, "explain how black holes form number {n}"),
+]
+# (path, Origin header or None, send the token, expected HTTP status)
+ACCESS_CASES = [
+    ("/health", None, True, 200), ("/health", None, False, 401),
+    ("/health", "http://localhost:3000", True, 200), ("/health", "http://127.0.0.1", True, 200),
+    ("/health", "http://[::1]:8080", True, 200),
+    ("/health", "http://localhost.evil.com", True, 403), ("/health", "http://127.0.0.1.attacker.net", True, 403),
+    ("/health", "https://evil.com/http://localhost", True, 403), ("/health", "null", True, 403),
+    ("/ws", "http://localhost.evil.com", True, 403), ("/ws", "http://127.0.0.1.attacker.net", True, 403),
+    ("/ws", None, False, 401), ("/ws", "http://localhost:5173", True, 101),
+    ("/command", "http://localhost.evil.com", True, 403), ("/command", None, False, 401),
+]
+_unique = itertools.count(1)   # across runs too, so a later run does not hit the response cache
+
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def load_orion(args):
+    data = tempfile.mkdtemp(prefix="orion_server_")
+    roots = os.path.join(data, "files")
+    os.makedirs(roots)
+    for name in ("report.txt", "quarterly report.pdf", "notes.md"):
+        open(os.path.join(roots, name), "w").close()
+    os.environ["ORION_DATA_DIR"] = data
+    os.environ["ORION_SEARCH_ROOTS"] = roots
+    os.environ["ORION_AI_WORKERS"] = str(args.ai_workers)
+    fakes.SCALE = args.scale
+    fakes.install(browser_latency=Latency(args.browser, seed=4))
+    import main
+    main._clients["gemini"] = fakes.FakeGemini(Latency(args.gemini_first, seed=5),
+                                               Latency(args.gemini_chunk, seed=6))
+    main._clients["wake_word"] = SimpleNamespace(available=False)
+    main.SPEECH_SINK = lambda text: None   # reminders firing during the run
+    main.reminder_scheduler.start(main.core.start())
+    return main
+
+
+class Client:
+    def __init__(self, n, url, http, mode, commands):
+        self.n = n
+        self.url = url
+        self.http = http
+        self.mode = mode
+        self.commands = commands
+        self.latencies, self.first_events, self.rejected, self.errors = [], [], 0, 0
+
+    def record(self, started, first, final):
+        if final.get("error") == "busy":
+            self.rejected += 1
+        elif final.get("type") != "result":
+            self.errors += 1
+        else:
+            self.latencies.append(time.perf_counter() - started)
+            if first is not None:
+                self.first_events.append(first - started)
+
+    async def run_http(self):
+        session = None
+        for command in self.commands:
+            started, first, final = time.perf_counter(), None, {}
+            async with self.http.post(self.url + "/command", json={"command": command, "session": session}) as r:
+                if r.status == 503:
+                    final = {"type": "error", "error": "busy"}
+                else:
+                    session = r.headers.get("X-Orion-Session")
+                    async for line in r.content:
+                        event = json.loads(line)
+                        if event["type"] in ("log", "say") and first is None:
+                            first = time.perf_counter()
+                        elif event["type"] in ("result", "error"):
+                            final = event
+            self.record(started, first, final)
+
+    async def run_ws(self):
+        async with self.http.ws_connect(self.url + "/ws") as ws:
+            await ws.receive_json()   # session
+            for i, command in enumerate(self.commands):
+                started, first = time.perf_counter(), None
+                await ws.send_json({"id": i, "command": command})
+                while True:
+                    event = await ws.receive_json()
+                    if event["type"] in ("log", "say") and first is None:
+                        first = time.perf_counter()
+                    elif event["type"] in ("result", "error"):
+                        break
+                self.record(started, first, event)
+
+    async def run(self):
+        await (self.run_http() if self.mode == "http" else self.run_ws())
+
+
+async def check_access(url, token):
+    """Mismatches of the server's answers against ACCESS_CASES."""
+    import aiohttp
+    wrong = []
+    async with aiohttp.ClientSession() as http:
+        for path, origin, with_token, expected in ACCESS_CASES:
+            headers = {"Authorization": f"Bearer {token}"} if with_token else {}
+            if origin is not None:
+                headers["Origin"] = origin
+            if path == "/ws":
+                try:
+                    async with http.ws_connect(url + path, headers=headers):
+                        status = 101
+                except aiohttp.WSServerHandshakeError as e:
+                    status = e.status
+            elif path == "/command":
+                async with http.post(url + path, json={"command": "cache stats"}, headers=headers) as r:
+                    status = r.status
+            else:
+                async with http.get(url + path, headers=headers) as r:
+                    status = r.status
+            if status != expected:
+                wrong.append((path, origin, with_token, expected, status))
+    return wrong
+
+
+async def drive(url, args, seed, token):
+    import aiohttp
+    rnd = random.Random(seed)
+    weights = [w for w, _ in COMMAND_MIX]
+    clients = []
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector, headers={"Authorization": f"Bearer {token}"}) as http:
+        for n in range(args.clients):
+            commands = []
+            for _ in range(args.per_client):
+                commands.append(rnd.choices([c for _, c in COMMAND_MIX], weights)[0].format(n=next(_unique)))
+            clients.append(Client(n, url, http, "http" if n % 2 == 0 else "ws", commands))
+        t0 = time.perf_counter()
+        await asyncio.gather(*(c.run() for c in clients))
+        wall = time.perf_counter() - t0
+    return clients, wall
+
+
+def bench(main, workers, args):
+    from command_server import CommandServer
+    server = CommandServer(main.serve_command, port=0, workers=workers, queue_limit=args.queue_limit,
+                           on_session_end=main.end_server_session)
+    main.core.submit(server.start()).result()
+    try:
+        clients, wall = asyncio.run(drive(f"http://127.0.0.1:{server.port}", args, args.seed, server.token))
+    finally:
+        main.core.submit(server.stop()).result(10)
+        main.speech_worker.wait_idle(5)
+    latencies = [x for c in clients for x in c.latencies]
+    first = [x for c in clients for x in c.first_events]
+    rejected = sum(c.rejected for c in clients)
+    errors = sum(c.errors for c in clients)
+    return {
+        "workers": workers,
+        "throughput": len(latencies) / wall,
+        "p50": percentile(latencies, 50), "p95": percentile(latencies, 95), "p99": percentile(latencies, 99),
+        "first50": percentile(first, 50), "first95": percentile(first, 95),
+        "ok": len(latencies), "rejected": rejected, "errors": errors,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=50, help="concurrent clients, half HTTP, half WebSocket")
+    ap.add_argument("--per-client", type=int, default=6, help="commands each client sends, one after another")
+    ap.add_argument("--workers", default="1,4,8", help="server worker counts to compare")
+    ap.add_argument("--queue-limit", type=int, default=64)
+    ap.add_argument("--ai-workers", type=int, default=8, help="ORION_AI_WORKERS for the run")
+    ap.add_argument("--scale", type=float, default=1.0, help="multiplies every fake delay")
+    ap.add_argument("--gemini-first", default="lognormal:0.5:0.4")
+    ap.add_argument("--gemini-chunk", default="uniform:0.02:0.08")
+    ap.add_argument("--browser", default="fixed:0.01")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    orion = load_orion(args)
+    from command_server import CommandServer
+    server = CommandServer(orion.serve_command, port=0, workers=1, on_session_end=orion.end_server_session)
+    orion.core.submit(server.start()).result()
+    try:
+        wrong = asyncio.run(check_access(f"http://127.0.0.1:{server.port}", server.token))
+    finally:
+        orion.core.submit(server.stop()).result(10)
+    print(f"Access cases: {len(ACCESS_CASES)}, wrong: {len(wrong)}")
+    for path, origin, with_token, expected, status in wrong:
+        print(f"  {path} origin={origin} token={'yes' if with_token else 'no'}: expected {expected}, got {status}")
+    if wrong:
+        orion.core.stop()
+        sys.exit(1)
+    total = args.clients * args.per_client
+    print(f"{args.clients} clients x {args.per_client} commands ({total} total), queue limit {args.queue_limit}, "
+          f"{args.ai_workers} AI workers, fake delay scale {args.scale}")
+    print(f"{'workers':>8}{'cmd/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'first p50':>11}{'first p95':>11}"
+          f"{'ok':>6}{'busy':>6}{'errors':>8}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        r = bench(orion, workers, args)
+        print(f"{r['workers']:>8}{r['throughput']:>8.1f}{r['p50'] * 1000:>9.0f}{r['p95'] * 1000:>9.0f}"
+              f"{r['p99'] * 1000:>9.0f}{r['first50'] * 1000:>11.0f}{r['first95'] * 1000:>11.0f}"
+              f"{r['ok']:>6}{r['rejected']:>6}{r['errors']:>8}")
+    orion.core.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: inline voice loop vs. the staged speech pipeline.
+
+    python benchmarks/bench_speech_pipeline.py --bursts 6 --recognize 0.8 --execute 1.5
+
+A synthetic recording is replayed in real time, like a live microphone.
+Recognition and command execution are simulated with sleeps. The inline
+loop (the old listen_command) stops reading the microphone while it
+recognizes and runs a command. Any delay in reading a frame is audio the
+user spoke while Orion was deaf. The pipeline keeps reading on time and
+reports its per-stage queue metrics.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from audio_capture import AudioCapture, WavSource  # noqa: E402
+from speech_pipeline import SpeechPipeline  # noqa: E402
+from bench_audio_capture import synth_wav  # noqa: E402
+
+
+class LagProbe(WavSource):
+    """Real-time WAV source that records how late each frame was read."""
+    def frames(self):
+        self.worst_lag = 0.0
+        frame_sec = self.chunk / self.sample_rate
+        t0 = time.perf_counter()
+        for i, frame in enumerate(super().frames()):
+            lag = time.perf_counter() - (t0 + (i + 1) * frame_sec)
+            self.worst_lag = max(self.worst_lag, lag)
+            yield frame
+
+
+def run(path, pipelined, args):
+    source = LagProbe(path, realtime=True)
+    capture = AudioCapture(source)
+    done = []
+
+    def recognize(utterance):
+        time.sleep(args.recognize)
+        return utterance
+
+    def execute(utterance):
+        time.sleep(args.execute)
+        done.append(time.perf_counter())
+
+    t0 = time.perf_counter()
+    metrics = None
+    if pipelined:
+        pipeline = SpeechPipeline(capture, recognize, execute, recognizers=args.workers)
+        pipeline.run()
+        metrics = pipeline.metrics()
+    else:
+        for utterance in capture.utterances():
+            execute(recognize(utterance))
+    return time.perf_counter() - t0, source.worst_lag, len(done), metrics
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bursts", type=int, default=6)
+    ap.add_argument("--recognize", type=float, default=0.8, help="simulated recognition seconds")
+    ap.add_argument("--execute", type=float, default=1.5, help="simulated command seconds")
+    ap.add_argument("--workers", type=int, default=2)
+    args = ap.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), "orion_pipeline_speech.wav")
+    synth_wav(path, bursts=args.bursts)
+
+    for name, pipelined in (("inline", False), ("pipeline", True)):
+        total, lag, handled, metrics = run(path, pipelined, args)
+        print(f"{name:>8}: {total:6.2f}s wall, mic read up to {lag:5.2f}s late, {handled} commands run")
+        if metrics:
+            for stage in ("recognize", "execute"):
+                m = metrics[stage]
+                print(f"          {stage:>9}: peak depth {m['max_depth']}/{m['capacity']}, "
+                      f"dropped {m['dropped']}, wait {m['avg_wait_ms']:.0f} ms, "
+                      f"service {m['avg_service_ms']:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: cold startup of Orion's command path.
+
+    python benchmarks/bench_startup.py                  # measure, compare to baseline
+    python benchmarks/bench_startup.py --save-baseline  # record the current numbers
+
+Each run starts a fresh interpreter, so nothing is warm in sys.modules:
+
+* import:   `import main` (what a test or another tool pays)
+* headless: `main.py --headless` answering one local command
+
+The median of --runs is compared against benchmarks/startup_baseline.json;
+a slowdown beyond --tolerance exits with status 1. The slowest imports
+made by main (from `python -X importtime`) are listed so a regression is easy to trace.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+
+CASES = {
+    "import": (["-c", "import main"], ""),
+    "headless": (["main.py", "--headless"], "cache stats\n"),
+}
+
+
+def run_once(args, stdin, env):
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable] + args, input=stdin, cwd=ROOT, env=env,
+                   capture_output=True, text=True, check=True)
+    return time.perf_counter() - t0
+
+
+def slowest_imports(env, top=10):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if len(name) - len(name.lstrip()) == 3:   # imported directly by main
+            rows.append((int(cumulative_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--tolerance", type=float, default=0.20, help="allowed slowdown vs. baseline")
+    ap.add_argument("--save-baseline", action="store_true")
+    args = ap.parse_args()
+
+    env = dict(os.environ, ORION_DATA_DIR=tempfile.mkdtemp(prefix="orion_startup_"))
+    results = {}
+    for name, (cmd, stdin) in CASES.items():
+        times = [run_once(cmd, stdin, env) for _ in range(args.runs)]
+        results[name] = statistics.median(times)
+        print(f"{name:>9}: median {results[name] * 1000:7.1f} ms, best {min(times) * 1000:7.1f} ms")
+
+    print("slowest imports made by main (cumulative):")
+    for us, name in slowest_imports(env):
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    if args.save_baseline:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump({k: round(v, 4) for k, v in results.items()}, f, indent=2)
+        print(f"baseline saved to {BASELINE}")
+        return 0
+
+    if not os.path.exists(BASELINE):
+        print("no baseline yet; run with --save-baseline")
+        return 0
+    with open(BASELINE, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    failed = False
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        change = value / baseline[name] - 1
+        flag = "REGRESSION" if change > args.tolerance else "ok"
+        failed |= flag != "ok"
+        print(f"{name:>9}: {change:+.0%} vs. baseline {baseline[name] * 1000:.1f} ms  {flag}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Benchmark: full-text "find text" search (text_search.py) on a synthetic corpus.
+
+    python benchmarks/bench_text_search.py --files 3000 --large 12
+    python benchmarks/bench_text_search.py --dir /tmp/corpus --keep
+
+Builds a folder tree of small notes, a few large log files, binaries and
+files above the size limit, with the query planted in some of them. The
+page cache is warmed first, then the corpus is searched:
+
+* naive:      os.walk, read and lowercase every file, substring test,
+              one file after another (what a straightforward search does);
+* TextSearch: with thread and process pools of increasing size.
+
+Reports wall time, MB/s of text scanned, time to the first result, the
+number of matching files, and how long a search takes to return once it
+is cancelled right after its first result.
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from text_search import TextSearch  # noqa: E402
+
+QUERY = "orbital resonance"
+WORDS = ("invoice meeting budget report deploy server error token python lunch flight hotel "
+         "address phone draft review merge branch release orbit resonance signal").split()
+
+
+def build_corpus(root, files, large, large_mb, seed):
+    rnd = random.Random(seed)
+    planted = 0
+    for i in range(files):
+        d = os.path.join(root, f"dir{i % 40:02d}", f"sub{i % 7}")
+        os.makedirs(d, exist_ok=True)
+        words = [rnd.choice(WORDS) for _ in range(rnd.randrange(300, 8000))]
+        if rnd.random() < 0.05:
+            words.insert(rnd.randrange(len(words)), QUERY.title())
+            planted += 1
+        with open(os.path.join(d, f"note{i}.txt"), "w") as f:
+            f.write(" ".join(words))
+    line = "2024-05-01 12:00:00 INFO worker request served in 12 ms from cache " * 2 + "\n"
+    for i in range(large):
+        with open(os.path.join(root, f"dir{i % 40:02d}", f"service{i}.log"), "w") as f:
+            chunk = line * (1024 * 1024 // len(line))
+            for mb in range(large_mb):
+                f.write(chunk)
+                if i % 3 == 0 and mb == large_mb // 2:
+                    f.write(f"ERROR {QUERY} detected\n")
+            planted += i % 3 == 0
+    blob = os.urandom(1024 * 1024)
+    for i in range(20):
+        with open(os.path.join(root, f"dir{i:02d}", f"image{i}.png"), "wb") as f:
+            f.write(blob)
+        with open(os.path.join(root, f"dir{i:02d}", f"dump{i}.txt"), "wb") as f:
+            f.write(b"\0" + blob + QUERY.encode())
+    with open(os.path.join(root, "huge.txt"), "wb") as f:
+        f.truncate(80 * 1024 * 1024)
+    return planted
+
+
+def naive(root, query):
+    q = query.lower()
+    found = []
+    scanned = 0
+    for d, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(d, name)
+            try:
+                with open(path, "rb") as f:
+                    text = f.read().decode("utf-8", "ignore")
+            except OSError:
+                continue
+            scanned += len(text)
+            if q in text.lower():
+                found.append(path)
+    return found, scanned
+
+
+def run(search, query, cancel_after_first=False):
+    first = []
+    cancel_at = []
+
+    def on_result(match, rank):
+        if not first:
+            first.append(time.perf_counter())
+            if cancel_after_first:
+                cancel_at.append(first[0])
+
+    t0 = time.perf_counter()
+    report = search.search(query, limit=10, on_result=on_result, cancelled=lambda: bool(cancel_at))
+    end = time.perf_counter()
+    return report, end - t0, (first[0] - t0) if first else None, (end - cancel_at[0]) if cancel_at else None
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dir", help="corpus folder (default: a temporary one)")
+    ap.add_argument("--keep", action="store_true", help="keep the corpus after the run")
+    ap.add_argument("--files", type=int, default=3000)
+    ap.add_argument("--large", type=int, default=12, help="number of large log files")
+    ap.add_argument("--large-mb", type=int, default=16)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    root = args.dir or tempfile.mkdtemp(prefix="orion_text_")
+    try:
+        if not os.listdir(root):
+            t0 = time.perf_counter()
+            planted = build_corpus(root, args.files, args.large, args.large_mb, args.seed)
+            print(f"Built corpus in {time.perf_counter() - t0:.1f} s, query planted in {planted} text files")
+        naive(root, QUERY)   # warm the page cache
+
+        t0 = time.perf_counter()
+        found, scanned = naive(root, QUERY)
+        wall = time.perf_counter() - t0
+        print(f"{os.cpu_count()} CPUs, corpus {scanned / 1e6:.0f} MB read by the naive search")
+        print(f"{'search':<18}{'wall s':>8}{'MB/s':>8}{'first ms':>10}{'matches':>9}{'cancel ms':>11}")
+        print(f"{'naive':<18}{wall:>8.2f}{scanned / 1e6 / wall:>8.0f}{'-':>10}{len(found):>9}{'-':>11}")
+
+        cpus = os.cpu_count() or 1
+        sizes = sorted({1, 2, cpus, 2 * cpus})
+        for processes in (False, True):
+            for workers in sizes:
+                search = TextSearch([root], workers=workers, processes=processes)
+                run(search, "warm up the pool")
+                report, wall, first, _ = run(search, QUERY)
+                _, _, _, cancel = run(search, QUERY, cancel_after_first=True)
+                search.stop()
+                label = f"{'processes' if processes else 'threads'} x{workers}"
+                mb = report.counters["bytes"] / 1e6
+                first_ms = f"{first * 1000:.0f}" if first is not None else "-"
+                cancel_ms = f"{cancel * 1000:.0f}" if cancel is not None else "-"
+                print(f"{label:<18}{wall:>8.2f}{mb / wall:>8.0f}{first_ms:>10}{report.total:>9}{cancel_ms:>11}")
+        c = report.counters
+        print(f"TextSearch skipped {c['skipped_type']} by extension, {c['binary']} binary, "
+              f"{c['too_large']} too large; scanned {c['scanned']} files, {c['bytes'] / 1e6:.0f} MB")
+    finally:
+        if not args.keep and not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
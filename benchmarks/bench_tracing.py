@@ -0,0 +1,53 @@
+"""
+Benchmark: cost of tracing instrumentation, disabled and enabled.
+
+    python benchmarks/bench_tracing.py --spans 200000
+
+A command touches about five spans (route, skill/ai, command, speak, ...),
+so the disabled cost per command is roughly five times the per-span figure.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tracing import Tracer  # noqa: E402
+
+
+def per_span(tracer, n):
+    t0 = time.perf_counter()
+    with tracer.activate(tracer.new_trace()):
+        for _ in range(n):
+            with tracer.span("route"):
+                pass
+    return (time.perf_counter() - t0) / n
+
+
+def baseline(n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        pass
+    return (time.perf_counter() - t0) / n
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--spans", type=int, default=200_000)
+    args = ap.parse_args()
+
+    empty = baseline(args.spans)
+    disabled = per_span(Tracer(None), args.spans) - empty
+    path = os.path.join(tempfile.mkdtemp(prefix="orion_trace_"), "traces.jsonl")
+    tracer = Tracer(path)
+    enabled = per_span(tracer, args.spans) - empty
+    tracer.close()
+
+    print(f"disabled: {disabled * 1e9:8.0f} ns per span")
+    print(f"enabled:  {enabled * 1e9:8.0f} ns per span (histogram + JSONL, written off-thread)")
+    print(f"trace file: {os.path.getsize(path) / 1024:.0f} KB for {args.spans} spans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Local stand-ins for everything Orion talks to outside the process, for the
+end-to-end benchmarks.
+
+* speech_recognition: Microphone plays scripted utterances in real time,
+  Recognizer.recognize_google returns the scripted transcripts.
+* pyttsx3 / pygame: rendering takes `render` seconds; playback lasts
+  `per_word` seconds per word and can be stopped, as the mixer can.
+* Gemini: generate_content() with a first-token delay and streamed chunks.
+* webbrowser.open: records URLs instead of launching a browser.
+
+Every delay is a Latency, so runs can model slow networks or be scaled
+to zero to measure Orion's own overhead. install() must run before main
+is imported.
+"""
+import sys
+import math
+import time
+import types
+import random
+import struct
+import threading
+import webbrowser
+from collections import deque
+
+SCALE = 1.0   # multiplies every fake delay
+
+
+class Latency:
+    """
+    A delay distribution parsed from "fixed:0.2", "uniform:0.1:0.4",
+    "normal:0.3:0.05" or "lognormal:<median>:<sigma>" (seconds).
+    """
+    def __init__(self, spec, seed=None):
+        self.spec = spec
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        self.random = random.Random(seed)
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"unknown latency distribution: {spec}")
+
+    def sample(self):
+        p = self.params
+        if self.kind == "fixed":
+            value = p[0]
+        elif self.kind == "uniform":
+            value = self.random.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = self.random.gauss(p[0], p[1])
+        else:
+            value = p[0] * math.exp(self.random.gauss(0, p[1]))
+        return max(0.0, value) * SCALE
+
+    def wait(self):
+        delay = self.sample()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def __repr__(self):
+        return self.spec
+
+
+# ---- speech_recognition ----
+
+class UnknownValueError(Exception):
+    pass
+
+
+class RequestError(Exception):
+    pass
+
+
+class AudioData:
+    def __init__(self, frame_data, sample_rate, sample_width):
+        self.frame_data = frame_data
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+
+
+class FakeRecognizer:
+    """Hands out scripted transcripts in recognition order after `latency`."""
+    latency = Latency("lognormal:0.6:0.3")
+    transcripts = deque()
+    lock = threading.Lock()
+
+    def recognize_google(self, audio):
+        with self.lock:
+            text = self.transcripts.popleft() if self.transcripts else None
+        self.latency.wait()
+        if text is None:
+            raise UnknownValueError()
+        return text
+
+
+class _FakeStream:
+    def __init__(self, mic):
+        self.mic = mic
+
+    def read(self, chunk):
+        return self.mic.next_frame(chunk)
+
+
+class FakeMicrophone:
+    """
+    Plays `script` [(transcript, speech_seconds)] as tone bursts between
+    stretches of low noise, paced like a real microphone. Before each burst
+    it waits until `ready()` is true (e.g. Orion finished talking) and then
+    `gap` seconds more, like a user taking turns. Raises EOFError from the
+    stream once the script is done and `tail` seconds of silence were read.
+    burst_ends[i] is the perf_counter time the i-th burst finished.
+    """
+    SAMPLE_RATE = 16000
+    SAMPLE_WIDTH = 2
+    CHUNK = 1024
+
+    def __init__(self, script=(), gap=0.6, tail=2.0, ready=None, seed=1):
+        self.script = list(script)
+        self.gap = gap
+        self.tail = tail
+        self.ready = ready
+        self.random = random.Random(seed)
+        self.burst_ends = []
+        self.stream = _FakeStream(self)
+        self._plan = self._frames()
+        self._next_at = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def _noise(self, n):
+        return [int(self.random.gauss(0, 40)) for _ in range(n)]
+
+    def _frames(self):
+        chunk, rate = self.CHUNK, self.SAMPLE_RATE
+        for text, seconds in self.script:
+            waited = 0.0
+            while waited < self.gap or (self.ready is not None and not self.ready()):
+                yield self._noise(chunk), None
+                waited += chunk / rate
+            f0 = self.random.uniform(110, 220)
+            n = int(seconds * rate)
+            for start in range(0, n, chunk):
+                frame = []
+                for i in range(start, min(start + chunk, n)):
+                    t = i / rate
+                    env = math.sin(math.pi * t / seconds)
+                    frame.append(int(3000 * env * math.sin(2 * math.pi * f0 * t)))
+                frame += self._noise(chunk - len(frame))
+                yield frame, (start + chunk >= n)
+        for _ in range(int(self.tail * rate / chunk)):
+            yield self._noise(chunk), None
+
+    def next_frame(self, chunk):
+        item = next(self._plan, None)
+        if item is None:
+            raise EOFError("fake microphone script finished")
+        samples, burst_done = item
+        if self._next_at is None:
+            self._next_at = time.perf_counter()
+        self._next_at += chunk / self.SAMPLE_RATE
+        delay = self._next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        if burst_done:
+            self.burst_ends.append(time.perf_counter())
+        return struct.pack(f"<{len(samples)}h", *[max(-32768, min(32767, s)) for s in samples])
+
+
+# ---- pyttsx3 / pygame ----
+
+class TTSTimings:
+    render = Latency("lognormal:0.15:0.3")
+    per_word = Latency("fixed:0.3")
+
+
+class _Voice:
+    def __init__(self, vid):
+        self.id = vid
+
+
+class FakeEngine:
+    def __init__(self):
+        self.props = {"voices": [_Voice("fake-0"), _Voice("fake-1")]}
+        self.jobs = []
+
+    def getProperty(self, name):
+        return self.props.get(name)
+
+    def setProperty(self, name, value):
+        self.props[name] = value
+
+    def say(self, text):
+        self.jobs.append((text, None))
+
+    def save_to_file(self, text, path):
+        self.jobs.append((text, path))
+
+    def runAndWait(self):
+        jobs, self.jobs = self.jobs, []
+        for text, path in jobs:
+            TTSTimings.render.wait()
+            duration = sum(TTSTimings.per_word.sample() for _ in text.split())
+            if path is None:
+                time.sleep(duration)
+            else:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(repr(duration))
+
+
+class _FakeMusic:
+    def __init__(self):
+        self.duration = 0.0
+        self.ends = 0.0
+
+    def load(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            self.duration = float(f.read() or 0)
+
+    def play(self):
+        self.ends = time.perf_counter() + self.duration
+
+    def get_busy(self):
+        return time.perf_counter() < self.ends
+
+    def stop(self):
+        self.ends = 0.0
+
+    def unload(self):
+        pass
+
+
+# ---- Gemini ----
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGemini:
+    """generate_content(prompt, stream=False) with a first-token delay and chunk delays."""
+    ANSWER = ("Here is a short answer to your question. It has a few sentences, "
+              "like a real reply would. The last one wraps it up.")
+
+    def __init__(self, first_token=None, per_chunk=None, words_per_chunk=6):
+        self.first_token = first_token or Latency("lognormal:0.5:0.4")
+        self.per_chunk = per_chunk or Latency("uniform:0.02:0.08")
+        self.words_per_chunk = words_per_chunk
+        self.calls = 0
+
+    def _chunks(self):
+        words = self.ANSWER.split(" ")
+        for i in range(0, len(words), self.words_per_chunk):
+            yield " ".join(words[i:i + self.words_per_chunk]) + " "
+
+    def _stream(self):
+        self.first_token.wait()
+        for i, text in enumerate(self._chunks()):
+            if i:
+                self.per_chunk.wait()
+            yield _Chunk(text)
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls += 1
+        if stream:
+            return self._stream()
+        return _Chunk("".join(c.text for c in self._stream()))
+
+
+# ---- webbrowser ----
+
+class FakeBrowser:
+    def __init__(self, latency=None):
+        self.latency = latency or Latency("fixed:0.01")
+        self.opened = []
+
+    def open(self, url, *args, **kwargs):
+        self.latency.wait()
+        self.opened.append(url)
+        return True
+
+
+def install(recognizer_latency=None, tts_render=None, tts_per_word=None, browser_latency=None):
+    """
+    Registers the fake speech_recognition, pyttsx3 and pygame modules and
+    patches webbrowser.open. Returns the FakeBrowser.
+    """
+    if recognizer_latency is not None:
+        FakeRecognizer.latency = recognizer_latency
+    if tts_render is not None:
+        TTSTimings.render = tts_render
+    if tts_per_word is not None:
+        TTSTimings.per_word = tts_per_word
+
+    sr = types.ModuleType("speech_recognition")
+    sr.Recognizer = FakeRecognizer
+    sr.Microphone = FakeMicrophone
+    sr.AudioData = AudioData
+    sr.UnknownValueError = UnknownValueError
+    sr.RequestError = RequestError
+    sys.modules["speech_recognition"] = sr
+
+    tts = types.ModuleType("pyttsx3")
+    tts.init = FakeEngine
+    sys.modules["pyttsx3"] = tts
+
+    pygame = types.ModuleType("pygame")
+    pygame.mixer = types.SimpleNamespace(init=lambda *a, **k: None, music=_FakeMusic())
+    sys.modules["pygame"] = pygame
+
+    browser = FakeBrowser(browser_latency)
+    webbrowser.open = browser.open
+    return browser
@@ -0,0 +1,295 @@
+"""
+Clipboard history: a size-capped ring of recent clipboard texts.
+
+A poller (a thread, or a task on the core asyncio loop) watches the
+clipboard. Where the OS exposes a clipboard sequence number (Windows), an
+unchanged clipboard is not read at all; elsewhere the text is read and
+compared with the previous one by its (cached) string hash, and dropped
+straight away when nothing changed. Copying something that is already in
+the history moves it to the front instead of storing it twice.
+
+Entries up to INLINE_CHARS are kept as str, larger ones zlib-compressed.
+A trigram index over the first INDEX_CHARS characters of every entry
+narrows substring searches to a few candidates, which are then checked
+exactly; entries longer than that are always checked, so text past the
+indexed part is still found. Stored bytes plus an estimate of the index
+size are kept under max_bytes by evicting the oldest entries. Nothing is
+written to disk.
+"""
+import time
+import zlib
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+
+INLINE_CHARS = 1024     # longer entries are compressed
+INDEX_CHARS = 4096      # only this much of each entry is indexed
+INDEX_COST = 64         # estimated bytes per (trigram, entry) index posting
+ENTRY_COST = 200        # estimated fixed bytes per entry
+PREVIEW_CHARS = 60
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def windows_sequence_number():
+    """GetClipboardSequenceNumber on Windows, else None."""
+    try:
+        import ctypes
+        return ctypes.windll.user32.GetClipboardSequenceNumber
+    except Exception:
+        return None
+
+
+class ClipEntry:
+    __slots__ = ("id", "digest", "text", "blob", "length", "time", "cost")
+
+    def __init__(self, eid, digest, text, data, at):
+        self.id = eid
+        self.digest = digest
+        self.length = len(text)
+        self.time = at
+        if len(text) > INLINE_CHARS:
+            self.text = None
+            self.blob = zlib.compress(data, 6)
+            self.cost = ENTRY_COST + len(self.blob)
+        else:
+            self.text = text
+            self.blob = None
+            self.cost = ENTRY_COST + len(data)
+
+    def value(self):
+        if self.blob is None:
+            return self.text
+        return zlib.decompress(self.blob).decode("utf-8", "surrogatepass")
+
+    def preview(self, limit=PREVIEW_CHARS):
+        """The first `limit` characters with whitespace folded; never decompresses the whole entry."""
+        if self.blob is None:
+            head = self.text[:limit * 2]
+        else:
+            head = zlib.decompressobj().decompress(self.blob, limit * 8).decode("utf-8", "ignore")
+        head = " ".join(head.split())
+        return head if len(head) <= limit else head[:limit].rstrip() + "…"
+
+
+class ClipboardHistory:
+    """
+    history.start(loop)                 # or history.poll() from your own timer
+    history.search("invoice")           # [(item number, ClipEntry)], newest first
+    history.item(3)                     # third most recent ClipEntry
+    history.recall(3)                   # puts item 3 back on the clipboard
+    read()/write(text) default to pyperclip; sequence() to the Windows
+    clipboard sequence number.
+    """
+    def __init__(self, max_entries=200, max_bytes=8 * 1024 * 1024, max_item_bytes=2 * 1024 * 1024,
+                 interval=1.0, read=None, write=None, sequence=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.interval = interval
+        self.read = read or self._pyperclip_paste
+        self.write = write or self._pyperclip_copy
+        # A custom reader has no OS sequence number unless one is passed along with it.
+        self.sequence = sequence if sequence is not None or read is not None else windows_sequence_number()
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()   # id -> ClipEntry, oldest first
+        self.by_digest = {}            # content digest -> id
+        self.index = {}                # trigram -> set of ids
+        self.bytes = 0
+        self.next_id = 1
+        self.last_hash = None
+        self.last_sequence = None
+        self.counters = {"polls": 0, "reads": 0, "stored": 0, "deduped": 0, "evicted": 0, "too_large": 0}
+        self._thread = None
+        self._task = None
+        self._stopped = False
+
+    @staticmethod
+    def _pyperclip_paste():
+        import pyperclip
+        return pyperclip.paste()
+
+    @staticmethod
+    def _pyperclip_copy(text):
+        import pyperclip
+        pyperclip.copy(text)
+
+    def __len__(self):
+        return len(self.entries)
+
+    # ---- polling ----
+    def _sequence_unchanged(self):
+        self.counters["polls"] += 1
+        if self.sequence is None:
+            return False
+        seq = self.sequence()
+        if seq == self.last_sequence:
+            return True
+        self.last_sequence = seq
+        return False
+
+    def _read(self):
+        try:
+            text = self.read()
+        except Exception as e:
+            print("Clipboard read error:", e)
+            return False
+        self.counters["reads"] += 1
+        if not isinstance(text, str) or not text.strip():
+            return False
+        h = hash(text)
+        if h == self.last_hash:
+            return False
+        self.last_hash = h
+        return self.add(text)
+
+    def poll(self):
+        """One look at the clipboard. Returns True if the history changed."""
+        if self._sequence_unchanged():
+            return False
+        return self._read()
+
+    def start(self, loop=None):
+        """Polls every `interval` seconds: as a task on `loop` if given, else on a thread."""
+        if self._thread is not None or self._task is not None:
+            return
+        if loop is not None:
+            self._task = asyncio.run_coroutine_threadsafe(self._run_async(), loop)
+        else:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+
+    def _run(self):
+        while not self._stopped:
+            self.poll()
+            time.sleep(self.interval)
+
+    async def _run_async(self):
+        while not self._stopped:
+            # The sequence check is cheap; only an actual read leaves the loop.
+            if not self._sequence_unchanged():
+                await asyncio.to_thread(self._read)
+            await asyncio.sleep(self.interval)
+
+    # ---- storage ----
+    def add(self, text):
+        """Stores text as the newest entry (or moves its duplicate there). Returns True if stored."""
+        data = text.encode("utf-8", "surrogatepass")
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        with self.lock:
+            eid = self.by_digest.get(digest)
+            if eid is not None:
+                self.entries.move_to_end(eid)
+                self.entries[eid].time = time.time()
+                self.counters["deduped"] += 1
+                return True
+            if len(data) > self.max_item_bytes:
+                self.counters["too_large"] += 1
+                return False
+            entry = ClipEntry(self.next_id, digest, text, data, time.time())
+            self.next_id += 1
+            grams = _trigrams(text[:INDEX_CHARS].lower())
+            for g in grams:
+                self.index.setdefault(g, set()).add(entry.id)
+            entry.cost += len(grams) * INDEX_COST
+            self.entries[entry.id] = entry
+            self.by_digest[digest] = entry.id
+            self.bytes += entry.cost
+            self.counters["stored"] += 1
+            while len(self.entries) > 1 and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+                self._evict_oldest()
+            return True
+
+    def _evict_oldest(self):
+        """Caller holds the lock."""
+        _, entry = self.entries.popitem(last=False)
+        del self.by_digest[entry.digest]
+        for g in _trigrams(entry.value()[:INDEX_CHARS].lower()):
+            ids = self.index.get(g)
+            if ids is not None:
+                ids.discard(entry.id)
+                if not ids:
+                    del self.index[g]
+        self.bytes -= entry.cost
+        self.counters["evicted"] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.by_digest.clear()
+            self.index.clear()
+            self.bytes = 0
+
+    # ---- lookup ----
+    def item(self, number):
+        """The number-th most recent entry (1 = newest), or None."""
+        with self.lock:
+            if not 1 <= number <= len(self.entries):
+                return None
+            for i, entry in enumerate(reversed(self.entries.values()), 1):
+                if i == number:
+                    return entry
+
+    def recent(self, limit=5):
+        """[(item number, ClipEntry)] for the newest entries."""
+        with self.lock:
+            result = []
+            for i, entry in enumerate(reversed(self.entries.values()), 1):
+                if i > limit:
+                    break
+                result.append((i, entry))
+            return result
+
+    def search(self, query, limit=5):
+        """Entries containing query (case-insensitive), newest first, as [(item number, ClipEntry)]."""
+        q = query.lower().strip()
+        if not q:
+            return []
+        with self.lock:
+            candidates = None
+            if 3 <= len(q) <= INDEX_CHARS:
+                postings = sorted((self.index.get(g, ()) for g in _trigrams(q)), key=len)
+                candidates = set(postings[0])
+                for ids in postings[1:]:
+                    if not candidates:
+                        break
+                    candidates &= ids
+            result = []
+            for i, entry in enumerate(reversed(self.entries.values()), 1):
+                if candidates is not None and entry.id not in candidates and entry.length <= INDEX_CHARS:
+                    continue
+                if q in entry.value().lower():
+                    result.append((i, entry))
+                    if len(result) >= limit:
+                        break
+            return result
+
+    def recall(self, number):
+        """
+        Copies item `number` back to the clipboard. The history keeps its
+        order, so item numbers stay valid for follow-up commands.
+        Returns the entry or None.
+        """
+        entry = self.item(number)
+        if entry is None:
+            return None
+        text = entry.value()
+        self.write(text)
+        self.last_hash = hash(text)   # the poller will see this text; don't re-add it
+        return entry
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats.update(entries=len(self.entries), bytes=self.bytes,
+                         chars=sum(e.length for e in self.entries.values()),
+                         trigrams=len(self.index))
+            return stats
@@ -0,0 +1,298 @@
+"""
+Local HTTP and WebSocket front end for Orion commands (aiohttp).
+
+    POST /command   {"command": "open youtube", "session": "<id>"}  -> NDJSON event stream
+    GET  /ws        WebSocket: send {"id": 1, "command": "..."}, receive events tagged "id": 1
+    GET  /health    pool and session counters
+
+A command's reply is a stream of events: "session" (the client's
+session id) first, then "log" for every line Orion would show in its log
+and "say" for everything it would speak (AI answers arrive sentence by
+sentence while the model is still streaming), and finally "result" with
+the response and the time taken, or "error".
+
+Commands run on a fixed pool of worker threads. At most queue_limit
+commands wait for a worker; further requests are refused straight away
+(HTTP 503 with Retry-After, or an "error" event) instead of queueing
+without bound. Each client has a session with its own state (main.py
+keeps the conversation memory there); a session's commands run one at a
+time, in order, so one client cannot take over the whole pool. Idle
+sessions expire after session_ttl seconds and at most max_sessions are
+kept.
+
+The server binds to 127.0.0.1. POST bodies must be application/json, an
+Origin header must name a local host (localhost, 127.0.0.1 or ::1, any
+port) and every request must carry the token as "Authorization: Bearer
+<token>" (or ?token=), so a web page cannot drive it. Without a token one
+is generated at startup (server.token).
+"""
+import json
+import time
+import uuid
+import asyncio
+import secrets
+from collections import OrderedDict
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web, WSMsgType
+
+LOCAL_HOSTS = frozenset(("localhost", "127.0.0.1", "::1"))
+
+
+def local_origin(origin):
+    """True if an Origin header names this machine (http or https, any port)."""
+    try:
+        parts = urlsplit(origin)
+        return parts.scheme in ("http", "https") and parts.hostname in LOCAL_HOSTS
+    except ValueError:
+        return False
+
+
+class ClientSession:
+    __slots__ = ("id", "created", "last_seen", "commands", "state", "lock")
+
+    def __init__(self, sid):
+        self.id = sid
+        self.created = self.last_seen = time.time()
+        self.commands = 0
+        self.state = {}          # for the application, e.g. conversation memory
+        self.lock = asyncio.Lock()
+
+
+class CommandServer:
+    """
+    server = CommandServer(execute, workers=4)
+    await server.start()            # on the core loop: core.submit(server.start()).result()
+    execute(session, command, emit) runs on a worker thread and returns the
+    response; emit(event) streams an event dict to the client. Clients must
+    send server.token, which is generated when none is given.
+    """
+    def __init__(self, execute, host="127.0.0.1", port=8765, workers=4, queue_limit=64, token=None,
+                 session_ttl=1800, max_sessions=256, on_session_end=None):
+        self.execute = execute
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.token = token or secrets.token_urlsafe(24)
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        self.on_session_end = on_session_end
+        self.sessions = OrderedDict()   # id -> ClientSession, least recently used first
+        self.pending = 0                # admitted commands not finished yet (queued + running)
+        self.counters = {"commands": 0, "rejected": 0, "errors": 0, "sessions": 0, "expired": 0}
+        self.executor = None
+        self.loop = None
+        self._runner = None
+        self._expiry = None
+
+    # ---- lifecycle (on the event loop) ----
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="server")
+        app = web.Application(client_max_size=64 * 1024)
+        app.add_routes([web.post("/command", self.handle_command),
+                        web.get("/ws", self.handle_ws),
+                        web.get("/health", self.handle_health)])
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            self.port = site._server.sockets[0].getsockname()[1]
+        self._expiry = asyncio.ensure_future(self._expire_loop())
+        return self
+
+    async def stop(self):
+        if self._expiry is not None:
+            self._expiry.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        for session in list(self.sessions.values()):
+            self._end_session(session)
+
+    # ---- sessions ----
+    def session(self, sid=None):
+        """The session for sid, or a new one if sid is unknown or missing."""
+        session = self.sessions.get(sid) if sid else None
+        if session is None:
+            session = ClientSession(uuid.uuid4().hex[:16])
+            self.sessions[session.id] = session
+            self.counters["sessions"] += 1
+            while len(self.sessions) > self.max_sessions:
+                oldest = next(iter(self.sessions.values()))
+                if oldest.lock.locked():
+                    break
+                self._end_session(oldest)
+        else:
+            self.sessions.move_to_end(sid)
+        session.last_seen = time.time()
+        return session
+
+    def _end_session(self, session):
+        self.sessions.pop(session.id, None)
+        if self.on_session_end is not None:
+            try:
+                self.on_session_end(session)
+            except Exception as e:
+                print("Session end error:", e)
+
+    async def _expire_loop(self):
+        while True:
+            await asyncio.sleep(min(60, self.session_ttl))
+            cutoff = time.time() - self.session_ttl
+            for session in [s for s in self.sessions.values() if s.last_seen < cutoff and not s.lock.locked()]:
+                self._end_session(session)
+                self.counters["expired"] += 1
+
+    # ---- execution ----
+    def full(self):
+        return self.pending >= self.workers + self.queue_limit
+
+    async def run(self, session, command, send, alive=None):
+        """
+        Runs command in session, passing every event to `await send(event)`.
+        A command still waiting for its session when alive() turns false
+        (the client went away) is dropped.
+        """
+        if self.full():
+            self.counters["rejected"] += 1
+            await send({"type": "error", "error": "busy", "retry_after": 1})
+            return
+        self.pending += 1
+        self.counters["commands"] += 1
+        session.commands += 1
+        started = time.perf_counter()
+        events = asyncio.Queue()
+        loop = self.loop
+
+        def emit(event):
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        def work():
+            try:
+                return self.execute(session, command, emit)
+            finally:
+                emit(None)
+
+        connected = True
+        try:
+            async with session.lock:
+                if alive is not None and not alive():
+                    return
+                future = loop.run_in_executor(self.executor, work)
+                while True:
+                    event = await events.get()
+                    if event is None:
+                        break
+                    if connected:
+                        try:
+                            await send(event)
+                        except (ConnectionError, RuntimeError):
+                            connected = False   # keep draining; the command still finishes
+                try:
+                    response = await future
+                    final = {"type": "result", "response": response,
+                             "ms": round((time.perf_counter() - started) * 1000, 1)}
+                except Exception as e:
+                    self.counters["errors"] += 1
+                    final = {"type": "error", "error": str(e)}
+                session.last_seen = time.time()
+            if connected:
+                await send(final)
+        finally:
+            self.pending -= 1
+
+    # ---- access checks ----
+    def _denied(self, request):
+        origin = request.headers.get("Origin")
+        if origin is not None and not local_origin(origin):
+            return web.json_response({"error": "forbidden origin"}, status=403)
+        auth = request.headers.get("Authorization", "")
+        given = auth[7:] if auth.startswith("Bearer ") else request.query.get("token", "")
+        if not secrets.compare_digest(given.encode("utf-8"), self.token.encode("utf-8")):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        return None
+
+    # ---- handlers ----
+    async def handle_command(self, request):
+        denied = self._denied(request)
+        if denied is not None:
+            return denied
+        if request.content_type != "application/json":
+            return web.json_response({"error": "expected application/json"}, status=415)
+        try:
+            body = await request.json()
+            command = str(body.get("command", "")).strip()
+        except (ValueError, AttributeError):
+            return web.json_response({"error": "invalid JSON"}, status=400)
+        if not command:
+            return web.json_response({"error": "missing command"}, status=400)
+        if self.full():
+            self.counters["rejected"] += 1
+            return web.json_response({"error": "busy"}, status=503, headers={"Retry-After": "1"})
+        session = self.session(body.get("session") or request.headers.get("X-Orion-Session"))
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson",
+                                               "X-Orion-Session": session.id})
+        await response.prepare(request)
+
+        async def send(event):
+            await response.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+
+        await send({"type": "session", "session": session.id})
+        transport = request.transport
+        await self.run(session, command, send, alive=lambda: not transport.is_closing())
+        try:
+            await response.write_eof()
+        except ConnectionError:
+            pass
+        return response
+
+    async def handle_ws(self, request):
+        denied = self._denied(request)
+        if denied is not None:
+            return denied
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        session = self.session(request.query.get("session"))
+        await ws.send_json({"type": "session", "session": session.id})
+        tasks = set()
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            try:
+                data = json.loads(msg.data)
+                command = str(data.get("command", "")).strip()
+            except (ValueError, AttributeError):
+                await ws.send_json({"type": "error", "error": "invalid JSON"})
+                continue
+            cid = data.get("id")
+            if not command:
+                await ws.send_json({"type": "error", "error": "missing command", "id": cid})
+                continue
+
+            async def send(event, cid=cid):
+                event["id"] = cid
+                await ws.send_json(event)
+
+            # Commands already running finish if the client goes away; waiting ones are dropped.
+            task = asyncio.ensure_future(self.run(session, command, send, alive=lambda: not ws.closed))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        return ws
+
+    async def handle_health(self, request):
+        denied = self._denied(request)
+        if denied is not None:
+            return denied
+        return web.json_response(self.stats())
+
+    def stats(self):
+        stats = dict(self.counters)
+        stats.update(workers=self.workers, pending=self.pending, queue_limit=self.queue_limit,
+                     active_sessions=len(self.sessions))
+        return stats
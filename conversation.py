@@ -0,0 +1,288 @@
+"""
+Conversation memory for the AI fallback.
+
+Recent turns are kept in a rolling window with a token budget; turns that
+fall out of the window are folded into a running summary (by the model,
+or extractively if no summarizer is available). Summaries run on one
+worker thread shared by every memory, a batch at a time, so however many
+sessions are open at most one summary is being written.
+The context handed to the model is the summary plus the window and never
+exceeds summary_tokens + window_tokens, so prompt size stays flat however
+long the session runs. Each turn costs O(1) to add and trim, and the
+context string is rebuilt only when the memory changes.
+
+Sessions persist as append-only JSON-lines journals (one file per
+session) that are replayed on load and compacted when they grow.
+"""
+import os
+import re
+import json
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+CHARS_PER_TOKEN = 4
+
+# Words that point back at earlier turns ("what is its population?").
+FOLLOW_UP_WORDS = {
+    "it", "its", "it's", "that", "this", "those", "these", "they", "them", "their",
+    "he", "him", "his", "she", "her", "hers", "there", "then", "more", "else",
+    "another", "again", "also", "same", "previous", "last", "earlier", "above",
+}
+FOLLOW_UP_OPENERS = ("and ", "but ", "so ", "why", "what about", "how about", "what else", "and then")
+
+# Shared by every ConversationMemory that is not given its own executor.
+SUMMARY_WORKER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary")
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token for English)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_tokens(text, budget, keep="start"):
+    """Cuts text to about `budget` tokens at a word boundary."""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    if keep == "end":
+        cut = text[-limit:]
+        return "…" + cut[cut.find(" ") + 1:] if " " in cut else cut
+    cut = text[:limit]
+    return (cut[:cut.rfind(" ")] if " " in cut else cut) + "…"
+
+
+def is_follow_up(command):
+    """True when the command refers back to the conversation rather than standing alone."""
+    text = command.lower().strip()
+    if text.startswith(FOLLOW_UP_OPENERS):
+        return True
+    return any(w in FOLLOW_UP_WORDS for w in re.findall(r"[a-z']+", text))
+
+
+class Turn:
+    __slots__ = ("user", "assistant", "tokens", "time")
+
+    def __init__(self, user, assistant, at=None):
+        self.user = user
+        self.assistant = assistant
+        self.tokens = estimate_tokens(user) + estimate_tokens(assistant) + 4
+        self.time = at or time.time()
+
+    def text(self):
+        return f"User: {self.user}\nOrion: {self.assistant}"
+
+
+class ConversationMemory:
+    """
+    memory.add(user, assistant) after every AI answer; memory.context() is the
+    text to put in front of the next prompt ("" while the session is empty).
+    summarize(previous_summary, turns_text, budget_tokens) -> new summary;
+    it runs on `executor` (default: SUMMARY_WORKER).
+    """
+    def __init__(self, path=None, window_tokens=600, summary_tokens=250,
+                 turn_tokens=200, summarize=None, executor=None):
+        self.path = path
+        self.window_tokens = window_tokens
+        self.summary_tokens = summary_tokens
+        self.turn_tokens = turn_tokens
+        self.summarize = summarize
+        self.executor = executor or SUMMARY_WORKER
+        self.lock = threading.Lock()
+        self.window = deque()     # recent Turns, oldest first
+        self.window_used = 0      # tokens in self.window
+        self.evicted = []         # Turns waiting to be folded into the summary
+        self.summary = ""
+        self.summaries = 0
+        self._context = ""
+        self._dirty = False
+        self._journal = None
+        self._journal_lines = 0
+        self._summarizing = False  # a pass is queued or running
+        self._generation = 0      # bumped by clear() so stale summaries are discarded
+        self.loaded = False
+
+    def __len__(self):
+        return len(self.window)
+
+    # ---- journal ----
+    def load(self):
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+            if not self.path:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        self._journal_lines += 1
+                        try:
+                            rec = json.loads(line)
+                        except ValueError:
+                            continue
+                        self._apply(rec)
+                # Whatever was evicted but never summarized is folded in now.
+                if self.evicted:
+                    self._fold(self._extractive(self.summary, self.evicted), len(self.evicted))
+                if self._journal_lines > 2 * len(self.window) + 50:
+                    self._compact()
+            self._journal = open(self.path, "a", encoding="utf-8")
+
+    def _apply(self, rec):
+        op = rec.get("op")
+        if op == "turn":
+            self._push(Turn(rec["user"], rec["assistant"], rec.get("t")))
+        elif op == "summary":
+            self._fold(rec["text"], rec.get("covers", 0))
+        elif op == "clear":
+            self._reset()
+
+    def _compact(self):
+        """Rewrites the journal as one summary record plus the current window."""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            if self.summary:
+                f.write(json.dumps({"op": "summary", "text": self.summary, "covers": 0}) + "\n")
+            for turn in self.window:
+                f.write(json.dumps({"op": "turn", "user": turn.user, "assistant": turn.assistant,
+                                    "t": turn.time}, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+        self._journal_lines = len(self.window) + bool(self.summary)
+
+    def _log(self, rec):
+        if self._journal is None:
+            return
+        self._journal.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        self._journal_lines += 1
+
+    # ---- window ----
+    def _push(self, turn):
+        """Appends a turn and evicts the oldest ones until the window fits. Caller holds the lock."""
+        self.window.append(turn)
+        self.window_used += turn.tokens
+        while self.window_used > self.window_tokens and len(self.window) > 1:
+            old = self.window.popleft()
+            self.window_used -= old.tokens
+            self.evicted.append(old)
+        self._dirty = True
+
+    def _fold(self, summary, covers):
+        """Replaces the summary and drops the `covers` oldest evicted turns. Caller holds the lock."""
+        self.summary = truncate_tokens(summary.strip(), self.summary_tokens, keep="end")
+        del self.evicted[:covers]
+        self.summaries += 1
+        self._dirty = True
+
+    def _reset(self):
+        self._generation += 1
+        self.window.clear()
+        self.window_used = 0
+        self.evicted = []
+        self.summary = ""
+        self._dirty = True
+
+    @staticmethod
+    def _extractive(previous, turns):
+        """Summary without a model: the questions asked, newest kept when over budget."""
+        asked = "; ".join(t.user for t in turns)
+        return f"{previous} Earlier the user asked: {asked}." if previous else f"Earlier the user asked: {asked}."
+
+    # ---- public API ----
+    def add(self, user, assistant):
+        self.load()
+        turn = Turn(truncate_tokens(user, self.turn_tokens // 2),
+                    truncate_tokens(assistant, self.turn_tokens))
+        with self.lock:
+            self._push(turn)
+            self._log({"op": "turn", "user": turn.user, "assistant": turn.assistant, "t": turn.time})
+            start = bool(self.evicted) and not self._summarizing
+            if start:
+                self._summarizing = True
+        if start:
+            self._queue_summary()
+
+    def _queue_summary(self):
+        try:
+            self.executor.submit(self._summarize)
+        except RuntimeError:   # the worker was shut down at exit
+            with self.lock:
+                self._summarizing = False
+
+    def _summarize(self):
+        """
+        One pass: folds what has been evicted so far. Turns evicted meanwhile
+        get another pass queued behind other memories' rather than a loop here.
+        """
+        with self.lock:
+            batch = list(self.evicted)
+            previous = self.summary
+            generation = self._generation
+            if not batch:
+                self._summarizing = False
+                return
+        text = "\n".join(t.text() for t in batch)
+        summary = None
+        if self.summarize is not None:
+            try:
+                summary = self.summarize(previous, text, self.summary_tokens)
+            except Exception as e:
+                print("Conversation summary error:", e)
+        if not summary:
+            summary = self._extractive(previous, batch)
+        with self.lock:
+            if generation == self._generation:
+                self._fold(summary, len(batch))
+                self._log({"op": "summary", "text": self.summary, "covers": len(batch)})
+            again = self._summarizing = bool(self.evicted)
+        if again:
+            self._queue_summary()
+
+    def context(self):
+        """Summary and recent turns as prompt text; at most summary_tokens + window_tokens."""
+        self.load()
+        with self.lock:
+            if self._dirty:
+                recent = ""
+                if self.window:
+                    recent = "Recent conversation:\n" + "\n".join(t.text() for t in self.window)
+                parts = []
+                if self.summary:
+                    # Headers count against the budget too, so the summary gives way.
+                    room = self.window_tokens + self.summary_tokens - estimate_tokens(recent) - 10
+                    parts.append("Summary of the earlier conversation: "
+                                 + truncate_tokens(self.summary, max(room, 0), keep="end"))
+                if recent:
+                    parts.append(recent)
+                self._context = "\n".join(parts)
+                self._dirty = False
+            return self._context
+
+    def has_context(self):
+        self.load()
+        return bool(self.window or self.summary)
+
+    def clear(self):
+        self.load()
+        with self.lock:
+            self._reset()
+            self._log({"op": "clear"})
+
+    def stats(self):
+        with self.lock:
+            return {
+                "turns": len(self.window),
+                "window_tokens": self.window_used,
+                "summary_tokens": estimate_tokens(self.summary),
+                "summaries": self.summaries,
+                "pending_summary": len(self.evicted),
+            }
+
+    def close(self):
+        with self.lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
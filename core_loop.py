@@ -0,0 +1,134 @@
+"""
+One asyncio event loop for commands, reminders and network refreshes.
+
+The loop runs on a single daemon thread. Other threads hand it work with
+submit() (a coroutine, returns a concurrent Future) or call() (a plain
+callback). A pending command or timer on the loop is a small object, not
+a sleeping thread, so thousands of them cost next to nothing. Blocking
+work leaves the loop on one of two small bounded executors: commands
+(skills, model calls) through run_blocking(), and background refreshes
+(location, clipboard) through asyncio.to_thread(), which uses the loop's
+default executor. Slow commands therefore cannot starve the refreshes.
+
+Nothing on the loop touches Tk. Results for the window go through
+TkBridge, which the Tk thread drains from an after() loop, so widgets are
+only ever used from the thread that runs mainloop().
+"""
+import queue
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CoreLoop:
+    """
+    core = CoreLoop(workers=3, background_workers=2)
+    future = core.submit(coro)            # from any thread
+    result = await core.run_blocking(fn, *args)   # inside a coroutine, on the command executor
+    result = await asyncio.to_thread(fn, *args)   # on the background executor
+    """
+    def __init__(self, workers=3, background_workers=2, name="orion-core"):
+        self.workers = workers
+        self.name = name
+        self.loop = None
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="core-io")
+        self.background = ThreadPoolExecutor(max_workers=background_workers, thread_name_prefix="core-bg")
+        self._thread = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Starts the loop thread (once) and returns the running loop."""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        self._ready.wait()
+        return self.loop
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.set_default_executor(self.background)
+        self.loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+
+    def in_loop(self):
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro):
+        """Schedules a coroutine on the loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def call(self, fn, *args):
+        """Runs fn(*args) on the loop thread as soon as possible."""
+        self.start().call_soon_threadsafe(fn, *args)
+
+    async def run_blocking(self, fn, *args):
+        """Awaits fn(*args) run on the bounded executor."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def pending(self):
+        """Tasks currently scheduled on the loop."""
+        if self.loop is None or self.loop.is_closed():
+            return 0
+        return len(asyncio.all_tasks(self.loop))
+
+    def stop(self, timeout=5.0):
+        """Stops the loop (cancelling pending tasks) and the executors."""
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+            if not self.in_loop():
+                self._thread.join(timeout)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.background.shutdown(wait=False, cancel_futures=True)
+
+
+class TkBridge:
+    """
+    Runs callbacks on the Tk thread. call() may be used from any thread;
+    the Tk thread drains the queue every `interval_ms`, at most `batch`
+    callbacks per pass so a flood cannot freeze the window.
+    """
+    def __init__(self, root, interval_ms=20, batch=200):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.batch = batch
+        self.queue = queue.SimpleQueue()
+        self._after_id = None
+
+    def call(self, fn, *args):
+        self.queue.put((fn, args))
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _drain(self):
+        for _ in range(self.batch):
+            try:
+                fn, args = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception as e:
+                print("Tk callback error:", e)
+        self._after_id = self.root.after(self.interval_ms, self._drain)
@@ -0,0 +1,240 @@
+"""
+Persistent file-name index used by the "find file" command.
+
+The index keeps every file name under the configured roots in a trigram
+table, so a lookup only touches the files that share the query's trigrams
+instead of walking the disk. Directory mtimes are stored alongside the
+names: a refresh stats each directory and only re-lists the ones whose
+mtime changed since the last pass. The walk runs without the index lock;
+only applying a directory's changes takes it, so searches are answered
+from the current index while a refresh is still scanning.
+"""
+import os
+import heapq
+import pickle
+import threading
+
+INDEX_VERSION = 1
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _score(name, query, pos):
+    """Lower is better: exact stem, then prefix, then word start, then anywhere."""
+    stem = os.path.splitext(name)[0]
+    if stem == query or name == query:
+        rank = 0
+    elif pos == 0:
+        rank = 1
+    elif not name[pos - 1].isalnum():
+        rank = 2
+    else:
+        rank = 3
+    return rank, len(name)
+
+
+class FileIndex:
+    """
+    Trigram index over file names below one or more root folders.
+    Call refresh() to bring it in sync with the disk and search() to query it.
+    """
+    def __init__(self, roots, path=None):
+        self.roots = [os.path.abspath(r) for r in roots]
+        self.path = path
+        self.lock = threading.RLock()            # guards dirs, files, grams and next_id
+        self._refreshing = threading.Lock()      # one refresh pass at a time
+        self.dirs = {}    # dir path -> [mtime_ns, {file name: file id}, [sub dirs]]
+        self.files = {}   # file id -> (dir path, file name)
+        self.grams = {}   # trigram -> set of file ids
+        self.next_id = 0
+        self.loaded = False
+        self._refresher = None
+        self._wake = threading.Event()
+
+    def __len__(self):
+        return len(self.files)
+
+    def load(self):
+        """Loads the saved index from disk. Returns True if one was found."""
+        self.loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                state = pickle.load(f)
+        except Exception as e:
+            print("File index load error:", e)
+            return False
+        if state.get("version") != INDEX_VERSION:
+            return False
+        with self.lock:
+            self.dirs = state["dirs"]
+            self.files = state["files"]
+            self.next_id = state["next_id"]
+            self.grams = {}
+            for fid, (_, name) in self.files.items():
+                for g in _trigrams(name.lower()):
+                    self.grams.setdefault(g, set()).add(fid)
+        return True
+
+    def save(self):
+        with self._refreshing:
+            self._save()
+
+    def _save(self):
+        # Only refresh passes change the index, and they hold _refreshing, so
+        # searches can go on under self.lock while the state is pickled.
+        if not self.path:
+            return
+        state = {
+            "version": INDEX_VERSION,
+            "dirs": self.dirs,
+            "files": self.files,
+            "next_id": self.next_id,
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+
+    def refresh(self):
+        """
+        Brings the index in sync with the disk. Unchanged directories cost
+        one stat() each; only changed ones are listed again.
+        Returns the number of directories that were (re)scanned.
+        """
+        changed = 0
+        with self._refreshing:
+            if not self.loaded:
+                self.load()
+            seen = set()
+            stack = list(self.roots)
+            while stack:
+                d = stack.pop()
+                if d in seen:
+                    continue
+                seen.add(d)
+                try:
+                    mtime = os.stat(d).st_mtime_ns
+                except OSError:
+                    continue
+                entry = self.dirs.get(d)   # only refresh passes change self.dirs
+                if entry is not None and entry[0] == mtime:
+                    stack.extend(entry[2])
+                    continue
+                names, subdirs = self._list_dir(d)
+                with self.lock:
+                    self._apply_dir(d, mtime, names, subdirs)
+                changed += 1
+                stack.extend(subdirs)
+            with self.lock:
+                for d in [d for d in self.dirs if d not in seen]:
+                    for name in list(self.dirs[d][1]):
+                        self._remove_file(d, name)
+                    del self.dirs[d]
+                    changed += 1
+            if changed:
+                self._save()
+        return changed
+
+    @staticmethod
+    def _list_dir(d):
+        """(file names, sub dir paths) of d; empty if it cannot be listed."""
+        names = set()
+        subdirs = []
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            subdirs.append(e.path)
+                        else:
+                            names.add(e.name)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return names, subdirs
+
+    def _apply_dir(self, d, mtime, names, subdirs):
+        """Brings d's entry in line with a fresh listing; call with self.lock held."""
+        entry = self.dirs.get(d) or [mtime, {}, []]
+        entry[0] = mtime
+        entry[2] = subdirs
+        self.dirs[d] = entry
+        for name in [n for n in entry[1] if n not in names]:
+            self._remove_file(d, name)
+        for name in names:
+            if name not in entry[1]:
+                self._add_file(d, name)
+        return entry
+
+    def _add_file(self, d, name):
+        fid = self.next_id
+        self.next_id += 1
+        self.files[fid] = (d, name)
+        self.dirs[d][1][name] = fid
+        for g in _trigrams(name.lower()):
+            self.grams.setdefault(g, set()).add(fid)
+
+    def _remove_file(self, d, name):
+        fid = self.dirs[d][1].pop(name)
+        del self.files[fid]
+        for g in _trigrams(name.lower()):
+            ids = self.grams.get(g)
+            if ids is not None:
+                ids.discard(fid)
+                if not ids:
+                    del self.grams[g]
+
+    def search(self, query, limit=10):
+        """
+        Returns up to `limit` full paths whose file name contains `query`,
+        best matches first. Queries of three or more characters are answered
+        from the trigram table; shorter ones scan the in-memory names.
+        """
+        q = query.lower().strip()
+        if not q:
+            return []
+        with self.lock:
+            if len(q) >= 3:
+                postings = sorted((self.grams.get(g, ()) for g in _trigrams(q)), key=len)
+                if not postings[0]:
+                    return []
+                candidates = set(postings[0]).intersection(*postings[1:])
+            else:
+                candidates = self.files.keys()
+            scored = []
+            for fid in candidates:
+                d, name = self.files[fid]
+                low = name.lower()
+                pos = low.find(q)
+                if pos >= 0:
+                    scored.append((_score(low, q, pos), d, name))
+        best = heapq.nsmallest(limit, scored)
+        return [os.path.join(d, name) for _, d, name in best]
+
+    def start_background_refresh(self, interval=60):
+        """Refreshes once now and then every `interval` seconds on a daemon thread."""
+        if self._refresher is not None:
+            return
+
+        def run():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print("File index refresh error:", e)
+                self._wake.wait(interval)
+                self._wake.clear()
+
+        self._refresher = threading.Thread(target=run, daemon=True)
+        self._refresher.start()
+
+    def request_refresh(self):
+        """Wakes the background refresher early (e.g. after a failed lookup)."""
+        if self._refresher is not None:
+            self._wake.set()
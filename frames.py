@@ -0,0 +1,139 @@
+"""
+Frame scheduler for the GUI.
+
+Every animation registers a callback that is ticked from one Tk after()
+loop on the main thread, so no worker thread touches a widget. Callbacks
+receive the elapsed time in seconds and should move by time, not by
+frame, which lets the scheduler drop frames under load without slowing
+the motion down. While the window is minimized, or no animation is
+active, the loop falls back to a slow idle poll.
+"""
+import time
+from collections import deque
+
+FPS_WINDOW = 2.0    # seconds of drawn frames the measured rate is taken over
+
+
+class _Animation:
+    __slots__ = ("callback", "interval", "active", "last")
+
+    def __init__(self, callback, interval, active):
+        self.callback = callback
+        self.interval = interval
+        self.active = active
+        self.last = None
+
+
+class FrameScheduler:
+    """
+    register(name, callback, interval=0, active=None):
+      callback(dt) is called every frame, or at most every `interval` seconds;
+      `active()` returning False skips the animation (and lets the loop idle).
+    """
+    def __init__(self, root, fps=50, idle_interval=0.25):
+        self.root = root
+        self.fps = fps
+        self.idle_interval = idle_interval
+        self.animations = {}
+        self.running = False
+        self.paused = False
+        self.frames = 0
+        self.skipped = 0
+        self.frame_times = deque(maxlen=120)   # seconds of work per frame
+        self.tick_stamps = deque()             # perf_counter() of each frame drawn in the last FPS_WINDOW
+        self.started_at = None
+        self._after_id = None
+
+    def register(self, name, callback, interval=0.0, active=None):
+        self.animations[name] = _Animation(callback, interval, active)
+
+    def unregister(self, name):
+        self.animations.pop(name, None)
+
+    def set_fps(self, fps):
+        self.fps = max(1, fps)
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self.started_at = time.perf_counter()
+            self._after_id = self.root.after(0, self._tick)
+
+    def stop(self):
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _hidden(self):
+        try:
+            return self.root.state() == "iconic" or not self.root.winfo_viewable()
+        except Exception:
+            return True
+
+    def _tick(self):
+        if not self.running:
+            return
+        started = time.perf_counter()
+        budget = 1.0 / self.fps
+        self.paused = self._hidden()
+        next_due = self.idle_interval
+        drew = False
+        if not self.paused:
+            for name, anim in list(self.animations.items()):
+                if anim.active is not None and not anim.active():
+                    anim.last = None
+                    continue
+                wait = 0.0 if anim.last is None else anim.interval - (started - anim.last)
+                if wait > 0:
+                    next_due = min(next_due, wait)
+                    continue
+                dt = 0.0 if anim.last is None else started - anim.last
+                anim.last = started
+                try:
+                    anim.callback(dt)
+                except Exception as e:
+                    print(f"Animation '{name}' error:", e)
+                drew = True
+                next_due = min(next_due, max(anim.interval, budget))
+        if drew:
+            work = time.perf_counter() - started
+            self.frames += 1
+            self.frame_times.append(work)
+            if self.tick_stamps and started - self.tick_stamps[-1] > 2 * budget and next_due <= budget:
+                self.skipped += int((started - self.tick_stamps[-1]) / budget) - 1
+            self.tick_stamps.append(started)
+            while started - self.tick_stamps[0] > FPS_WINDOW:
+                self.tick_stamps.popleft()
+            if work >= budget:
+                # Over budget: give the next frame slot back to Tk instead of queueing another.
+                self.skipped += 1
+            else:
+                next_due -= work
+        self._after_id = self.root.after(max(1, int(next_due * 1000)), self._tick)
+
+    def stats(self):
+        """
+        Measured frames per second, average/max frame work in ms and frames
+        skipped. Safe to call from any thread (works on copies).
+
+        The rate counts the frames drawn in the last FPS_WINDOW seconds up to
+        now, so it drops while the loop is idle or paused instead of keeping
+        the rate of the last burst of animation.
+        """
+        now = time.perf_counter()
+        stamps = [t for t in list(self.tick_stamps) if now - t <= FPS_WINDOW]
+        window = min(FPS_WINDOW, now - self.started_at) if self.started_at is not None else 0.0
+        times = list(self.frame_times)
+        return {
+            "fps": len(stamps) / window if window > 0 else 0.0,
+            "target_fps": self.fps,
+            "frame_ms_avg": sum(times) / len(times) * 1000 if times else 0.0,
+            "frame_ms_max": max(times) * 1000 if times else 0.0,
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "paused": self.paused,
+        }
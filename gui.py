@@ -0,0 +1,375 @@
+"""
+Tk user interface: system panel, orbital animation, log and command entry.
+
+Only imported when the window is actually shown, so headless runs never
+load Tk, customtkinter or the imaging libraries.
+"""
+import math
+import queue
+from datetime import datetime
+
+try:
+    import customtkinter as ctk
+except Exception as e:
+    print("Missing packages or import error:", e)
+    print("Install dependencies: pip install customtkinter")
+    raise
+
+from frames import FrameScheduler
+from core_loop import TkBridge
+from telemetry import HISTORY
+
+
+def _format_rate(bytes_per_sec):
+    if bytes_per_sec >= 1024 ** 2:
+        return f"{bytes_per_sec / 1024 ** 2:.1f} MB/s"
+    return f"{bytes_per_sec / 1024:.0f} KB/s"
+
+
+class Sparkline(ctk.CTkCanvas):
+    """
+    Tiny line chart of a telemetry ring buffer, newest sample on the right.
+    Only ever redrawn from the Tk thread.
+    """
+    def __init__(self, master, width=180, height=24, bg="#05121a", color="#00e6ff"):
+        super().__init__(master, width=width, height=height, highlightthickness=0, bg=bg)
+        self.w = width
+        self.h = height
+        self.step = width / (HISTORY - 1)
+        self.line = self.create_line(0, height - 2, width, height - 2, fill=color, width=1)
+
+    def draw(self, values, max_value=None):
+        if len(values) < 2:
+            return
+        top = max_value or max(max(values), 1e-9)
+        n = len(values)
+        points = []
+        for i, v in enumerate(values):
+            points.append(self.w - (n - 1 - i) * self.step)
+            points.append(self.h - 2 - (self.h - 4) * min(v / top, 1.0))
+        self.coords(self.line, *points)
+
+
+class CoreBars(ctk.CTkCanvas):
+    """One vertical bar per logical CPU showing its latest load."""
+    def __init__(self, master, cores, width=180, height=18, bg="#05121a", color="#0d8fb3"):
+        super().__init__(master, width=width, height=height, highlightthickness=0, bg=bg)
+        self.h = height
+        bar_w = width / max(cores, 1)
+        self.spans = [(i * bar_w + 1, (i + 1) * bar_w - 1) for i in range(cores)]
+        self.bars = [self.create_rectangle(x0, height, x1, height, fill=color, outline="") for x0, x1 in self.spans]
+
+    def draw(self, percents):
+        for bar, (x0, x1), p in zip(self.bars, self.spans, percents):
+            self.coords(bar, x0, self.h - self.h * min(p, 100) / 100, x1, self.h)
+
+
+class ListeningIndicator(ctk.CTkCanvas):
+    """
+    Circular arc that rotates while listening. Uses CTkCanvas but behaves similarly to Tk Canvas.
+    start/stop_animation may be called from any thread; drawing happens in the frame scheduler.
+    """
+    DEGREES_PER_SEC = 300
+
+    def __init__(self, master, frames, size=100, bg="#0f1216"):
+        super().__init__(master, width=size, height=size, highlightthickness=0, bg=bg)
+        self.size = size
+        self.angle = 0
+        pad = 6
+        self.arc = self.create_arc(pad, pad, size - pad, size - pad, start=0, extent=60, style="arc", outline="#00ffff", width=4)
+        self.animating = False
+        frames.register("indicator", self._animate, active=lambda: self.animating or self.angle != 0)
+
+    def start_animation(self):
+        self.animating = True
+
+    def stop_animation(self):
+        self.animating = False
+
+    def _animate(self, dt):
+        if self.animating:
+            self.angle = (self.angle + self.DEGREES_PER_SEC * dt) % 360
+        else:
+            self.angle = 0
+        self.itemconfig(self.arc, start=self.angle)
+
+class OrbitalCanvas(ctk.CTkCanvas):
+    """
+    Central sci-fi orbital visualization with multiple rotating rings and orbiting dots.
+    """
+    DEGREES_PER_SEC = 75
+
+    def __init__(self, master, frames, size=420, bg="#07080a"):
+        super().__init__(master, width=size, height=size, highlightthickness=0, bg=bg)
+        self.size = size
+        self.center = (size // 2, size // 2)
+        self.rings = [40, 70, 100, 130, 160]
+        self.dots = []
+        self.angles = [i * 30 for i in range(len(self.rings))]
+        self._create_static()
+        self.running = True
+        frames.register("orbital", self._animate, active=lambda: self.running)
+
+    def _create_static(self):
+        cx, cy = self.center
+        self.create_oval(cx-40, cy-40, cx+40, cy+40, fill="#001f3f", outline="#00e6ff", width=3)
+        self.create_text(cx, cy, text="ORION", fill="#00e6ff", font=("Orbitron", 14, "bold"))
+        for r in self.rings:
+            self.create_oval(cx-r, cy-r, cx+r, cy+r, outline="#0d4b66", width=1)
+        for i, r in enumerate(self.rings):
+            a = math.radians(self.angles[i])
+            x = cx + r * math.cos(a)
+            y = cy + r * math.sin(a)
+            dot = self.create_oval(x-6, y-6, x+6, y+6, fill="#00e6ff", outline="")
+            self.dots.append((dot, r, (i % 2)*0.6 + 0.6))
+
+    def _animate(self, dt):
+        cx, cy = self.center
+        for i in range(len(self.dots)):
+            dot_id, r, speed = self.dots[i]
+            self.angles[i] = (self.angles[i] + self.DEGREES_PER_SEC * speed * dt) % 360
+            a = math.radians(self.angles[i])
+            x = cx + r * math.cos(a)
+            y = cy + r * math.sin(a)
+            self.coords(dot_id, x-5, y-5, x+5, y+5)
+
+    def stop(self):
+        self.running = False
+
+class LogPane:
+    """
+    Bounded log widget. write() may be called from any thread and only
+    queues the line; the Tk thread drains the queue every `interval_ms`,
+    inserts the batch with one insert() and trims the widget back to
+    `max_lines`. If more lines are waiting than the widget can show, only
+    the newest `max_lines` are inserted.
+    """
+    def __init__(self, root, textbox, max_lines=1000, interval_ms=50):
+        self.root = root
+        self.textbox = textbox
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self.queue = queue.SimpleQueue()
+        self.lines = int(textbox.index("end-1c").split(".")[0]) - 1
+        self._after_id = None
+
+    def write(self, message):
+        self.queue.put(message)
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _drain(self):
+        batch = []
+        try:
+            while True:
+                batch.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            try:
+                self._insert(batch)
+            except Exception as e:
+                print("Log pane error:", e)
+        self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def _insert(self, batch):
+        lines = [line for message in batch for line in str(message).split("\n")]
+        if len(lines) > self.max_lines:
+            skipped = len(lines) - self.max_lines + 1
+            lines = [f"... {skipped} lines not shown (see the transcript)"] + lines[skipped:]
+        self.textbox.insert("end", "\n".join(lines) + "\n")
+        self.lines += len(lines)
+        if self.lines > self.max_lines:
+            self.textbox.delete("1.0", f"{self.lines - self.max_lines + 1}.0")
+            self.lines = self.max_lines
+        self.textbox.see("end")
+
+
+class ORIONApp(ctk.CTk):
+    """
+    Main window. on_command(text, log) hands a typed command off without
+    blocking the Tk thread and logs its "You:" line; log() may be called from any thread (lines are
+    batched into a LogPane of `log_lines` lines and, if given, appended to
+    `transcript`, see transcript.py); other calls from background threads go
+    through self.bridge (see core_loop.py). telemetry is the TelemetrySampler
+    behind the system panel and get_location() returns the location label.
+    """
+    def __init__(self, on_command, telemetry, get_location, geometry="1100x650", fps=50,
+                 transcript=None, log_lines=1000):
+        super().__init__()
+        self.on_command = on_command
+        self.telemetry = telemetry
+        self.get_location = get_location
+        self.transcript = transcript
+        self.log_lines = log_lines
+        self.title("O.R.I.O.N - AI Assistant")
+        self.geometry(geometry)
+        self.minsize(1000, 600)
+        ctk.set_appearance_mode("dark")
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+        self.frames = FrameScheduler(self, fps=fps)
+        self.bridge = TkBridge(self)
+
+        self.left_panel = ctk.CTkFrame(self, width=220, corner_radius=8, fg_color="#071021")
+        self.left_panel.grid(row=0, column=0, sticky="nsw", padx=(12,6), pady=12)
+        self._build_left_panel()
+
+
+        self.center_panel = ctk.CTkFrame(self, corner_radius=10, fg_color="#08121a")
+        self.center_panel.grid(row=0, column=1, sticky="nsew", padx=6, pady=12)
+        self.center_panel.grid_rowconfigure(1, weight=1)
+        self._build_center_panel()
+
+        self.header = ctk.CTkLabel(self, text="O.R.I.O.N", font=("Orbitron", 20, "bold"), text_color="#00e6ff")
+        self.header.place(x=80, y=8)
+
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.frames.start()
+        self.bridge.start()
+        self.log_pane.start()
+
+    def _build_left_panel(self):
+        t = ctk.CTkLabel(self.left_panel, text="SYSTEM", font=("Roboto", 14, "bold"), text_color="#7fd3ff")
+        t.pack(pady=(25, 25))
+        self.system_labels = {}
+        self.sparklines = {}
+        self._label_text = {}
+
+        for name in ["CPU", "Memory", "Disk", "Network", "Power", "Location"]:
+            f = ctk.CTkFrame(self.left_panel, fg_color="#05121a", corner_radius=6)
+            f.pack(fill="x", padx=10, pady=6)
+            lbl = ctk.CTkLabel(f, text=name, anchor="w", font=("Helvetica", 11))
+            lbl.grid(row=0, column=0, sticky="w", padx=8, pady=6)
+            val_lbl = ctk.CTkLabel(f, text="...", anchor="e", font=("Helvetica", 12, "bold"), text_color="#00e6ff")
+            val_lbl.grid(row=0, column=1, sticky="e", padx=8, pady=6)
+            f.grid_columnconfigure(0, weight=1)
+            f.grid_columnconfigure(1, weight=0)
+            self.system_labels[name] = val_lbl
+            if name in ("CPU", "Memory", "Disk", "Network"):
+                spark = Sparkline(f)
+                spark.grid(row=1, column=0, columnspan=2, sticky="ew", padx=8, pady=(0, 6))
+                self.sparklines[name] = spark
+            if name == "CPU":
+                self.core_bars = CoreBars(f, len(self.telemetry.cores))
+                self.core_bars.grid(row=2, column=0, columnspan=2, sticky="ew", padx=8, pady=(0, 6))
+
+        self.telemetry.start()
+        self.after(500, self._refresh_system_stats)
+
+    def _set_label(self, name, text):
+        if self._label_text.get(name) != text:
+            self._label_text[name] = text
+            self.system_labels[name].configure(text=text)
+
+    def _refresh_system_stats(self):
+        """Runs on the Tk thread: reads the telemetry ring buffers and redraws the panel."""
+        t = self.telemetry
+        try:
+            s = t.series
+            self._set_label("CPU", f"{s['cpu'].latest():.1f}%")
+            self._set_label("Memory", f"{t.latest['mem_used_gb']:.1f}/{t.latest['mem_total_gb']:.1f} GB")
+            self._set_label("Disk", f"{t.latest['disk_percent']:.1f}%")
+            self._set_label("Network", _format_rate(s["net_recv"].latest() + s["net_sent"].latest()))
+            self._set_label("Power", t.latest["power"])
+            self._set_label("Location", self.get_location())
+
+            self.sparklines["CPU"].draw(s["cpu"].values(), 100)
+            self.sparklines["Memory"].draw(s["mem_percent"].values(), 100)
+            disk_io = [a + b for a, b in zip(s["disk_read"].values(), s["disk_write"].values())]
+            self.sparklines["Disk"].draw(disk_io)
+            net_io = [a + b for a, b in zip(s["net_recv"].values(), s["net_sent"].values())]
+            self.sparklines["Network"].draw(net_io)
+            self.core_bars.draw([core.latest() for core in t.cores])
+        except Exception as e:
+            print("System stats update error:", e)
+        self.after(int(t.interval * 1000), self._refresh_system_stats)
+
+    def _build_center_panel(self):
+        top_frame = ctk.CTkFrame(self.center_panel, fg_color="#07131a", corner_radius=8)
+        top_frame.grid(row=0, column=0, sticky="ew", padx=12, pady=(12,8))
+        top_frame.grid_columnconfigure(0, weight=1)
+        top_frame.grid_columnconfigure(1, weight=0)
+
+        self.orbital = OrbitalCanvas(top_frame, self.frames, size=420, bg="#04050a")
+        self.orbital.grid(row=0, column=0, padx=12, pady=12)
+
+        mini = ctk.CTkFrame(top_frame, fg_color="#05121a", width=220, corner_radius=8)
+        mini.grid(row=0, column=1, sticky="n", padx=(6,12), pady=12)
+        mini.grid_rowconfigure(3, weight=1)
+        lbl_time = ctk.CTkLabel(mini, text="SYSTEM TIME", font=("Roboto", 10), text_color="#9adcfb")
+        lbl_time.pack(pady=(8,2))
+        self.lbl_clock = ctk.CTkLabel(mini, text="00:00:00", font=("Orbitron", 16, "bold"), text_color="#00e6ff")
+        self.lbl_clock.pack(pady=(0,8))
+
+        bottom_frame = ctk.CTkFrame(self.center_panel, fg_color="#07131a", corner_radius=8)
+        bottom_frame.grid(row=1, column=0, sticky="nsew", padx=12, pady=(8,12))
+        bottom_frame.grid_rowconfigure(0, weight=1)
+        bottom_frame.grid_columnconfigure(0, weight=1)
+
+        self.textbox = ctk.CTkTextbox(bottom_frame, width=780, height=160, corner_radius=8, font=("Consolas", 11))
+        self.textbox.grid(row=0, column=0, sticky="nsew", padx=12, pady=12)
+        self.textbox.insert("end", ">>> Welcome, Sir. Orion is online.\n")
+        self.log_pane = LogPane(self, self.textbox, max_lines=self.log_lines)
+
+        control_frame = ctk.CTkFrame(bottom_frame, fg_color="#07131a", corner_radius=8)
+        control_frame.grid(row=1, column=0, sticky="ew", padx=12, pady=(0,12))
+        control_frame.grid_columnconfigure(0, weight=1)
+        control_frame.grid_columnconfigure(1, weight=0)
+
+        left_controls = ctk.CTkFrame(control_frame, fg_color="#07131a", corner_radius=8)
+        left_controls.grid(row=0, column=0, sticky="w", padx=6)
+        self.indicator = ListeningIndicator(left_controls, self.frames, size=64, bg="#07121a")
+        self.indicator.pack(side="left", padx=(6,12))
+
+        self.input_entry = ctk.CTkEntry(control_frame, placeholder_text="Type a command or press Speak...", width=420)
+        self.input_entry.grid(row=0, column=1, sticky="e", padx=(0,6))
+        self.input_entry.bind("<Return>", self._on_enter_pressed)
+
+        help_lbl = ctk.CTkLabel(control_frame, text="Tip: Try 'open youtube', 'remind me to call in 10 minutes', 'find file report'",
+                                font=("Roboto", 9), text_color="#8fd8ff")
+        help_lbl.grid(row=1, column=0, columnspan=2, sticky="w", padx=10, pady=(6,0))
+
+
+    def _on_enter_pressed(self, event):
+        txt = self.input_entry.get().strip()
+        if txt:
+            self.input_entry.delete(0, "end")
+            self.on_command(txt, self.log)
+
+    def log(self, message):
+        self.log_pane.write(message)
+        if self.transcript is not None:
+            self.transcript.write(message)
+
+    def on_closing(self):
+        try:
+            self.orbital.stop()
+            self.frames.stop()
+            self.bridge.stop()
+            self.log_pane.stop()
+        except Exception:
+            pass
+        if hasattr(self, 'cap') and self.cap.isOpened():
+            self.cap.release()
+        self.destroy()
+
+
+def start_clock(app):
+    """Updates the clock label from the app's frame scheduler, at most twice a second."""
+    def update(dt):
+        now = datetime.now().strftime("%H:%M:%S")
+        if app.lbl_clock.cget("text") != now:
+            app.lbl_clock.configure(text=now)
+    app.frames.register("clock", update, interval=0.5)
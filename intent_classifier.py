@@ -0,0 +1,199 @@
+"""
+Local intent classifier for phrasings the keyword router misses.
+
+"launch youtube" or "power off the computer" contain none of the router's
+trigger keywords and would otherwise go to the model. Each skill can give
+example phrasings, each tied to a canonical command the router does
+understand ("launch {}" -> "open {}"). A command is turned into hashed
+word, word-pair and character-trigram features, weighted by TF-IDF and
+compared with every example by cosine similarity in one NumPy
+matrix-vector product. The best example wins if it clears the confidence
+threshold and beats the best example of any other label by a margin.
+Words and trigrams no example contains still count toward the command's
+length, at the weight of the rarest known feature, so "go to sleep" is
+not a perfect match for "go to {}" just because "sleep" is unknown;
+generic questions are trained as a "leave it to the model" label so they
+do not get pulled into a skill. Scores cannot tell "go to sleep" from "go
+to wikipedia", so skills with side effects check the slot before a match
+runs (see verify in intent_router.py). NumPy is imported on first use, so
+it does not slow down startup.
+
+A winning command is rewritten into its canonical form: the slot "{}" is
+filled with what remains of the command once the words its label's
+examples put before and after the slot, and a few fillers, are stripped
+from both ends ("launch youtube please" -> "open youtube").
+"""
+import re
+import zlib
+
+DIM = 1 << 12          # hashed feature buckets
+SLOT = "{}"
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+# Words that may come before or after a slot in any phrasing.
+LEADING_FILLER = {
+    "a", "an", "the", "please", "can", "could", "would", "will", "you", "me", "for", "my",
+    "to", "up", "now", "just", "hey", "orion", "kindly", "i", "want", "like", "some",
+}
+TRAILING_FILLER = {"please", "now", "thanks", "for", "me"}
+
+# Phrasings that belong to the model, not to a skill.
+QUESTION_EXAMPLES = [
+    "what is the capital of france", "who wrote pride and prejudice", "how do black holes form",
+    "why is the sky blue", "explain quantum computing simply", "tell me a joke",
+    "what does photosynthesis mean", "how far is the moon from earth", "when did world war two end",
+    "write a poem about the sea", "summarize the history of rome", "what should i cook for dinner",
+    "how do i learn python", "translate good morning into spanish", "what is the meaning of life",
+    "give me ideas for a birthday gift", "is coffee bad for you", "how many people live in india",
+    "what is the difference between a virus and bacteria", "can you help me with my homework",
+    "who is the president of the united states", "recommend a good book",
+    "what time is it in tokyo", "how does a computer work", "define the word serendipity",
+]
+
+
+def _bucket(key):
+    return zlib.crc32(key.encode("utf-8")) & (DIM - 1)
+
+
+def features(text):
+    """Hashed feature counts {bucket: weight} for words, word pairs and character trigrams."""
+    words = WORD_RE.findall(text.lower())
+    counts = {}
+    for i, w in enumerate(words):
+        b = _bucket("w:" + w)
+        counts[b] = counts.get(b, 0.0) + 1.0
+        if i:
+            b = _bucket("b:" + words[i - 1] + " " + w)
+            counts[b] = counts.get(b, 0.0) + 1.0
+        padded = f"#{w}#"
+        for j in range(len(padded) - 2):
+            b = _bucket("c:" + padded[j:j + 3])
+            counts[b] = counts.get(b, 0.0) + 0.25
+    return counts
+
+
+class Prediction:
+    __slots__ = ("label", "canonical", "phrase", "score", "margin")
+
+    def __init__(self, label, canonical, phrase, score, margin):
+        self.label = label
+        self.canonical = canonical
+        self.phrase = phrase
+        self.score = score
+        self.margin = margin
+
+    def __repr__(self):
+        return f"Prediction({self.label!r}, {self.canonical!r}, score={self.score:.2f}, margin={self.margin:.2f})"
+
+
+class IntentClassifier:
+    """
+    clf.add("open_site", "launch {}", canonical="open {}")
+    clf.add_questions(QUESTION_EXAMPLES)
+    pred = clf.classify("launch youtube")      # None below the threshold
+    command = clf.rewrite("launch youtube", pred)   # "open youtube"
+    """
+    def __init__(self, threshold=0.6, margin=0.08):
+        self.threshold = threshold
+        self.margin = margin
+        self.examples = []     # (label, phrase, canonical)
+        self.before = {}       # label -> words its phrasings put before the slot
+        self.after = {}        # label -> words its phrasings put after the slot
+        self.matrix = None     # (DIM, examples) TF-IDF columns, L2-normalized
+        self.idf = None
+        self.unseen_idf = 0.0  # weight of a feature no example has
+        self.label_ids = None
+
+    def add(self, label, phrase, canonical=None):
+        """label None means "send to the model"; canonical defaults to the phrase itself."""
+        self.examples.append((label, phrase, canonical if canonical is not None else phrase))
+        head, _, tail = phrase.lower().partition(SLOT)
+        self.before.setdefault(label, set()).update(WORD_RE.findall(head))
+        self.after.setdefault(label, set()).update(WORD_RE.findall(tail))
+        self.matrix = None
+
+    def add_questions(self, phrases=QUESTION_EXAMPLES):
+        for phrase in phrases:
+            self.add(None, phrase)
+
+    def __len__(self):
+        return len(self.examples)
+
+    def fit(self):
+        import numpy as np
+        n = len(self.examples)
+        counts = np.zeros((DIM, n), dtype=np.float32)
+        for col, (_, phrase, _) in enumerate(self.examples):
+            for b, c in features(phrase.replace(SLOT, " ")).items():
+                counts[b, col] = c
+        df = np.count_nonzero(counts, axis=1)
+        self.idf = np.where(df > 0, np.log((1 + n) / (1 + df)) + 1, 0).astype(np.float32)
+        self.unseen_idf = float(self.idf.max()) if n else 0.0
+        counts *= self.idf[:, None]
+        norms = np.linalg.norm(counts, axis=0)
+        counts /= np.where(norms > 0, norms, 1)
+        self.matrix = counts
+        labels = {label: i for i, label in enumerate(dict.fromkeys(label for label, _, _ in self.examples))}
+        self.label_ids = np.array([labels[label] for label, _, _ in self.examples])
+
+    def scores(self, text):
+        """Cosine similarity of text with every example (unknown features only lower it)."""
+        import numpy as np
+        if self.matrix is None:
+            self.fit()
+        feats = features(text)
+        if not feats:
+            return None
+        idx = np.fromiter(feats.keys(), dtype=np.intp, count=len(feats))
+        counts = np.fromiter(feats.values(), dtype=np.float32, count=len(feats))
+        idf = self.idf[idx]
+        weights = counts * idf
+        full = counts * np.where(idf > 0, idf, self.unseen_idf)
+        norm = float(np.sqrt(full @ full))
+        if norm == 0:
+            return None
+        return (weights / norm) @ self.matrix[idx]
+
+    def classify(self, text):
+        """
+        Best confident Prediction for text, or None (also None when a question
+        wins).
+        """
+        if not self.examples:
+            return None
+        scores = self.scores(text)
+        if scores is None:
+            return None
+        best = int(scores.argmax())
+        score = float(scores[best])
+        others = scores[self.label_ids != self.label_ids[best]]
+        margin = score - float(others.max()) if others.size else score
+        label, phrase, canonical = self.examples[best]
+        if label is None or score < self.threshold or margin < self.margin:
+            return None
+        return Prediction(label, canonical, phrase, score, margin)
+
+    def _slot(self, text, label):
+        """(word spans of text, i, j): spans[i:j] fill the slot of label's phrasings."""
+        spans = [(m.start(), m.end(), m.group()) for m in WORD_RE.finditer(text.lower())]
+        leading = self.before.get(label, set()) | LEADING_FILLER
+        trailing = self.after.get(label, set()) | TRAILING_FILLER
+        i, j = 0, len(spans)
+        while i < j and spans[i][2] in leading:
+            i += 1
+        while j > i and spans[j - 1][2] in trailing:
+            j -= 1
+        return spans, i, j
+
+    def rewrite(self, text, pred):
+        """The canonical command for text, with the slot filled from text."""
+        if SLOT not in pred.canonical:
+            return pred.canonical
+        spans, i, j = self._slot(text, pred.label)
+        slot = text[spans[i][0]:spans[j - 1][1]].strip() if i < j else ""
+        return pred.canonical.replace(SLOT, slot).strip()
+
+    def stats(self):
+        labels = {label for label, _, _ in self.examples}
+        return {"examples": len(self.examples), "labels": len(labels - {None}),
+                "bytes": 0 if self.matrix is None else self.matrix.nbytes}
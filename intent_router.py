@@ -0,0 +1,122 @@
+"""
+Keyword-indexed intent router.
+
+Each skill registers trigger keywords (single words or short phrases), an
+optional list of regex patterns with named groups for its slots, and an
+explicit priority. At dispatch the command is tokenized once and every
+token is looked up in a dict of trigger words, so only the handful of
+intents whose keywords actually occur are considered; their patterns are
+then tried in priority order (lower number wins). Cost depends on the
+command length and the number of candidates, not on how many skills exist.
+
+Commands no keyword claims can be handed to an IntentClassifier (see
+intent_classifier.py), trained on example phrasings given at register()
+time, before they fall through to the model. A skill with side effects
+can pass verify(command, slots), which must accept the rewritten command
+(e.g. the slot names a known site) before a classifier match runs it.
+"""
+import re
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class Intent:
+    def __init__(self, name, handler, keywords, patterns, priority, verify=None):
+        self.name = name
+        self.handler = handler
+        self.keywords = [tuple(tokenize(k)) for k in keywords]
+        self.patterns = [re.compile(p, re.IGNORECASE) for p in patterns]
+        self.priority = priority
+        self.verify = verify
+
+    def match(self, text):
+        """Returns the slot dict if this intent accepts text, else None."""
+        if not self.patterns:
+            return {}
+        for pattern in self.patterns:
+            m = pattern.search(text)
+            if m:
+                return {k: (v or "").strip() for k, v in m.groupdict().items()}
+        return None
+
+    def __repr__(self):
+        return f"Intent({self.name!r}, priority={self.priority})"
+
+
+class IntentRouter:
+    """
+    router.register("open_site", handler, keywords=["open"],
+                    patterns=[r"^open\\s+(?P<site>\\S+)"], priority=50)
+    intent, slots = router.match("open youtube")
+
+    examples maps a canonical command to phrasings of it for the classifier,
+    e.g. {"open {}": ["launch {}", "go to {}"]}; verify(command, slots)
+    returning False sends such a match to the model instead.
+    """
+    def __init__(self, classifier=None):
+        self.intents = {}
+        self.index = {}        # first keyword token -> [(keyword tokens, intent)]
+        self.always = []       # intents without keywords, tried on every command
+        self.classifier = classifier
+
+    def register(self, name, handler, keywords=(), patterns=(), priority=100, examples=None, verify=None):
+        if name in self.intents:
+            raise ValueError(f"Intent {name!r} is already registered")
+        intent = Intent(name, handler, keywords, patterns, priority, verify)
+        if self.classifier is not None and examples:
+            for canonical, phrases in examples.items():
+                for phrase in phrases:
+                    self.classifier.add(name, phrase, canonical)
+        self.intents[name] = intent
+        if intent.keywords:
+            for kw in intent.keywords:
+                self.index.setdefault(kw[0], []).append((kw, intent))
+        else:
+            self.always.append(intent)
+        return intent
+
+    def route(self, name, keywords=(), patterns=(), priority=100, examples=None, verify=None):
+        """Decorator form of register()."""
+        def wrap(handler):
+            self.register(name, handler, keywords, patterns, priority, examples, verify)
+            return handler
+        return wrap
+
+    def candidates(self, tokens):
+        found = {}
+        for i, tok in enumerate(tokens):
+            for kw, intent in self.index.get(tok, ()):
+                if len(kw) == 1 or tuple(tokens[i:i + len(kw)]) == kw:
+                    found[intent.name] = intent
+        for intent in self.always:
+            found.setdefault(intent.name, intent)
+        return sorted(found.values(), key=lambda it: it.priority)
+
+    def match(self, text):
+        """Returns (intent, slots) for the best matching intent, or (None, {})."""
+        intent, slots, _ = self.resolve(text)
+        return intent, slots
+
+    def resolve(self, text):
+        """
+        Like match(), plus the command to hand to the intent's handler: text
+        itself for a keyword match, the canonical rewrite for a classifier
+        match. Returns (None, {}, text) when the command is left to the model.
+        """
+        for intent in self.candidates(tokenize(text)):
+            slots = intent.match(text)
+            if slots is not None:
+                return intent, slots, text
+        if self.classifier is not None:
+            pred = self.classifier.classify(text)
+            if pred is not None:
+                command = self.classifier.rewrite(text, pred)
+                intent = self.intents[pred.label]
+                slots = intent.match(command)
+                if slots is not None and (intent.verify is None or intent.verify(command, slots)):
+                    return intent, slots, command
+        return None, {}, text
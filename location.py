@@ -0,0 +1,172 @@
+"""
+IP-based location lookup for the system panel.
+
+get() never touches the network: it returns the last known location from
+memory (loaded from a JSON cache file at start). A background refresher
+(a daemon thread, or a task on the core asyncio loop) keeps it fresh, but
+only calls the geolocation service when the cached value is older than the
+TTL or the machine's network interfaces/addresses changed.
+All requests go through one pooled session with a hard timeout.
+"""
+import os
+import json
+import asyncio
+import time
+import socket
+import hashlib
+import threading
+
+import psutil
+import requests
+
+DEFAULT_URL = "https://ipinfo.io/json"
+UNKNOWN = "Location N/A"
+
+
+def network_fingerprint():
+    """Hash of the non-loopback interface addresses; changes when the network does."""
+    try:
+        addrs = psutil.net_if_addrs()
+    except Exception:
+        return ""
+    items = []
+    for iface, entries in addrs.items():
+        for a in entries:
+            if a.family in (socket.AF_INET, socket.AF_INET6) and not a.address.startswith(("127.", "::1")):
+                items.append(f"{iface}={a.address}")
+    return hashlib.sha1("|".join(sorted(items)).encode("utf-8")).hexdigest()
+
+
+class LocationProvider:
+    """
+    Cached, non-blocking location source. Call start() once, then get() as
+    often as needed.
+    """
+    def __init__(self, cache_path=None, url=DEFAULT_URL, ttl=6 * 3600,
+                 timeout=3.0, check_interval=30):
+        self.cache_path = cache_path
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.session = requests.Session()
+        self.session.headers["Accept"] = "application/json"
+        self.location = None
+        self.ip = ""
+        self.fetched = 0.0
+        self.fingerprint = ""
+        self.lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.loop = None
+        self._task = None
+        self._async_wake = None
+        self._load()
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.location = data.get("location")
+            self.ip = data.get("ip", "")
+            self.fetched = data.get("fetched", 0.0)
+            self.fingerprint = data.get("fingerprint", "")
+        except Exception as e:
+            print("Location cache load error:", e)
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"location": self.location, "ip": self.ip,
+                           "fetched": self.fetched, "fingerprint": self.fingerprint}, f)
+            os.replace(tmp, self.cache_path)
+        except Exception as e:
+            print("Location cache save error:", e)
+
+    def get(self):
+        """Last known location string; never blocks on the network."""
+        return self.location or UNKNOWN
+
+    def needs_refresh(self, fingerprint=None):
+        fingerprint = network_fingerprint() if fingerprint is None else fingerprint
+        return (self.location is None
+                or time.time() - self.fetched > self.ttl
+                or fingerprint != self.fingerprint)
+
+    def refresh(self):
+        """Fetches the location now. Returns True on success."""
+        fingerprint = network_fingerprint()
+        try:
+            response = self.session.get(self.url, timeout=self.timeout)
+            if response.status_code != 200:
+                return False
+            data = response.json()
+        except Exception as e:
+            print("Error fetching location:", e)
+            return False
+        parts = [data.get("city", ""), data.get("region", ""), data.get("country", "")]
+        with self.lock:
+            self.location = ", ".join(p for p in parts if p) or UNKNOWN
+            self.ip = data.get("ip", "")
+            self.fetched = time.time()
+            self.fingerprint = fingerprint
+            self._save()
+        return True
+
+    def start(self, loop=None):
+        """
+        Starts the background refresher: a task on `loop` if given (the
+        request itself runs in the loop's default executor), else a thread.
+        """
+        if self._thread is not None or self._task is not None:
+            return
+        if loop is not None:
+            self.loop = loop
+            self._task = asyncio.run_coroutine_threadsafe(self._run_async(), loop)
+        else:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def request_refresh(self):
+        self._wake.set()
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._set_async_wake)
+
+    def _set_async_wake(self):
+        if self._async_wake is not None:
+            self._async_wake.set()
+
+    def _step(self, failures):
+        """One refresher pass; returns the new failure count."""
+        forced = self._wake.is_set()
+        self._wake.clear()
+        if forced or self.needs_refresh():
+            failures = 0 if self.refresh() else failures + 1
+        return failures
+
+    def _backoff(self, failures):
+        # Back off while offline instead of retrying every check.
+        return self.check_interval * min(2 ** failures, 20)
+
+    def _run(self):
+        failures = 0
+        while True:
+            failures = self._step(failures)
+            self._wake.wait(self._backoff(failures))
+
+    async def _run_async(self):
+        self._async_wake = asyncio.Event()
+        failures = 0
+        while True:
+            self._async_wake.clear()
+            failures = await asyncio.to_thread(self._step, failures)
+            try:
+                await asyncio.wait_for(self._async_wake.wait(), self._backoff(failures))
+            except asyncio.TimeoutError:
+                pass
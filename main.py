@@ -1,582 +1,1267 @@
-from dotenv import load_dotenv
-import os
-import sys
-import time
-import math
-import threading
-import subprocess
-import webbrowser
-from datetime import datetime
-import psutil
-import cv2
-from PIL import Image, ImageTk
-import requests
-
-try:
-    import customtkinter as ctk
-    import speech_recognition as sr
-    import pyttsx3
-    from gtts import gTTS
-    import pygame
-    import pyperclip
-    import google.generativeai as genai
-except Exception as e:
-    print("Missing packages or import error:", e)
-    print("Install dependencies: pip install customtkinter SpeechRecognition pyttsx3 gTTS pygame pyperclip openai")
-    raise
-
-try:
-    import musicLibrary
-except Exception:
-    class DummyMusic:
-        music = {"test": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"} 
-    musicLibrary = DummyMusic()
-
-load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-GEMINI_MODEL = genai.GenerativeModel("gemini-2.0-flash")
-
-LISTENING_ACTIVE = False  
-EXIT_REQUESTED = False
-
-
-
-VOICE_RATE = 160
-VOICE_VOLUME = 1.0
-MALE_VOICE_INDEX = 1
-WINDOW_SIZE = "1100x650"
-
-r = sr.Recognizer()
-mic = sr.Microphone()
-
-engine = pyttsx3.init()
-voices = engine.getProperty('voices')
-try:
-    engine.setProperty('voice', voices[MALE_VOICE_INDEX].id)
-except Exception:
-    pass
-engine.setProperty('rate', VOICE_RATE)
-engine.setProperty('volume', VOICE_VOLUME)
-
-pygame.mixer.init()
-
-def get_real_location():
-    """
-    Returns a string with city, region, country using IP-based geolocation.
-    """
-    try:
-        response = requests.get("https://ipinfo.io/json")
-        if response.status_code == 200:
-            data = response.json()
-            city = data.get("city", "")
-            region = data.get("region", "")
-            country = data.get("country", "")
-            return f"{city}, {region}, {country}"
-        else:
-            return "Location N/A"
-    except Exception as e:
-        print("Error fetching location:", e)
-        return "Location N/A"
-    
-def speak(text):
-    """Primary TTS via pyttsx3, fallback to gTTS + pygame if pyttsx3 fails."""
-    if not text:
-        return
-    try:
-        engine.say(text)
-        engine.runAndWait()
-    except Exception:
-        try:
-            tts = gTTS(text=text, lang='en')
-            filename = "temp_tts.mp3"
-            tts.save(filename)
-            pygame.mixer.music.load(filename)
-            pygame.mixer.music.play()
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-            pygame.mixer.music.unload()
-            if os.path.exists(filename):
-                os.remove(filename)
-        except Exception as e:
-            print("TTS Error:", e)
-
-def aiProcess(command):
-    """
-    Uses Google Gemini 2.0 Flash for AI responses.
-    """
-    try:
-        response = GEMINI_MODEL.generate_content(
-            f"You are Orion, a helpful AI assistant. Respond clearly and naturally.\nUser: {command}"
-        )
-        return response.text.strip() if response.text else "I couldn't generate a response."
-    except Exception as e:
-        print("AI Error:", e)
-        return "Sorry, I cannot process that right now."
-
-def write_app(app_name):
-    """
-    Opens desktop applications using os.system without needing full paths.
-    """
-    app_name = app_name.lower()
-    try:
-        app_commands = {
-            "notepad": "notepad",
-            "calculator": "calc",
-            "snipping tool": "snippingtool",
-            "word": "winword",
-            "excel": "excel",
-            "powerpoint": "powerpnt",
-            "chrome": "chrome",
-            "edge": "msedge",
-            "this pc": "explorer shell:MyComputerFolder",
-            "network": "explorer shell:NetworkPlacesFolder",
-            "recycle bin": "explorer shell:RecycleBinFolder",
-            "control panel": "control",
-            "windows explorer": "explorer",
-            "adobe reader": "AcroRd32",  
-            "zoom": r"C:\Users\LENOVO\AppData\Roaming\Zoom\bin\Zoom.exe",
-        }
-
-        command = app_commands.get(app_name)
-        if command:
-            os.system(f"start {command}")
-        else:
-            speak(f"Sorry, I don't know how to open {app_name}")
-    except Exception as e:
-        speak(f"Error opening {app_name}: {e}")
-        
-def open_folder(folder_path):
-    """
-    Opens a folder in Windows Explorer.
-    folder_path: full path to the folder
-    """
-    try:
-        if os.path.exists(folder_path):
-            os.startfile(folder_path)
-        else:
-            speak(f"The folder {folder_path} does not exist.")
-    except Exception as e:
-        speak(f"Error opening folder: {e}")
-
-def system_action(action):
-    action = action.lower()
-    try:
-        if "shutdown" in action:
-            os.system("shutdown /s /t 5")
-            speak("Shutting down the PC.")
-        elif "restart" in action:
-            os.system("shutdown /r /t 5")
-            speak("Restarting the PC.")
-        elif "lock" in action:
-            os.system("rundll32.exe user32.dll,LockWorkStation")
-            speak("Locking the PC.")
-        elif "log off" in action or "logoff" in action:
-            os.system("shutdown /l")
-            speak("Logging off.")
-        else:
-            speak("I cannot perform that system action.")
-    except Exception as e:
-        speak(f"System action error: {e}")
-
-def search_file(file_name, search_path=r"C:\Users\LENOVO\Desktop"):
-    found = False
-    for root, dirs, files in os.walk(search_path):
-        for f in files:
-            if file_name.lower() in f.lower():
-                file_path = os.path.join(root, f)
-                speak(f"Found {f} at {file_path}")
-                try:
-                    os.startfile(file_path)
-                except Exception:
-                    pass
-                found = True
-                return
-    if not found:
-        speak(f"{file_name} not found in {search_path}")
-
-def clipboard_action(action):
-    try:
-        if "paste" in action or "show" in action:
-            text = pyperclip.paste()
-            speak(f"Clipboard contains: {text}")
-        else:
-            speak("Clipboard action not recognized.")
-    except Exception as e:
-        speak(f"Clipboard error: {e}")
-
-def set_reminder(reminder_text, delay_sec):
-    def remind():
-        time.sleep(delay_sec)
-        speak(f"Reminder: {reminder_text}")
-    threading.Thread(target=remind, daemon=True).start()
-    speak(f"Reminder set for {delay_sec} seconds.")
-
-def processCommand(command, log_callback):
-    """
-    Processes the text command. Uses AI for fallback.
-    Keeps log_callback to push messages to GUI.
-    """
-    command_lower = command.lower()
-    response = ""
-
-    if "open " in command_lower and "open app" not in command_lower:
-        try:
-            after = command_lower.split("open",1)[1].strip()
-            site = after.split()[0]
-            if "." in site or "http" in site:
-                url = site if site.startswith("http") else f"https://{site}"
-            else:
-                url = f"https://{site}.com"
-            webbrowser.open(url)
-            response = f"Opening {site}"
-        except Exception as e:
-            response = f"Failed to open site: {e}"
-
-    elif "open app" in command_lower or "write app" in command_lower:
-        app_name = command_lower.replace("open app", "").replace("write app", "").strip()
-        write_app(app_name)
-        response = f"Opening {app_name}"
-
-
-    elif command_lower.startswith("play"):
-        parts = command_lower.split()
-        if len(parts) >= 2:
-            song = parts[1]
-            if song in getattr(musicLibrary, "music", {}):
-                webbrowser.open(musicLibrary.music[song])
-                response = f"Playing {song}"
-            else:
-                response = f"Sorry, {song} not found in library."
-        else:
-            response = "Please say the song name."
-
-    elif any(x in command_lower for x in ["shutdown", "restart", "lock", "log off", "logoff"]):
-        system_action(command_lower)
-        response = f"Performing {command_lower}"
-
-    elif "find file" in command_lower:
-        file_name = command_lower.replace("find file", "").strip()
-        search_file(file_name)
-        response = f"Searching for {file_name}"
-
-    elif "clipboard" in command_lower or "paste" in command_lower:
-        clipboard_action(command_lower)
-        response = "Clipboard command executed."
-
-    elif "remind me" in command_lower:
-        try:
-            parts = command_lower.split(" in ")
-            reminder_text = parts[0].replace("remind me to", "").replace("remind me", "").strip()
-            delay_sec = int(parts[1].split()[0])
-            set_reminder(reminder_text, delay_sec)
-            response = f"Reminder set for {delay_sec} seconds."
-        except Exception:
-            response = "Failed to set reminder. Try 'remind me to <task> in <seconds>'."
-
-    else:
-        response = aiProcess(command)
-
-    speak(response)
-    log_callback(f"Orion: {response}")
-
-def listen_command(log_callback, indicator):
-    """
-    Continuously listens via microphone and processes recognized speech.
-    Responds to "Orion start", "Orion stop", and "Orion exit" commands.
-    """
-    global LISTENING_ACTIVE, EXIT_REQUESTED
-
-    while not EXIT_REQUESTED:
-        with mic as source:
-            try:
-                r.adjust_for_ambient_noise(source, duration=0.8)
-            except Exception:
-                pass
-
-            if LISTENING_ACTIVE:
-                log_callback("🎧 Listening (Orion active)...")
-                indicator.start_animation()
-            else:
-                log_callback("🟡 Say 'Orion start' to activate listening.")
-                indicator.stop_animation()
-
-            try:
-                audio = r.listen(source, timeout=10, phrase_time_limit=10)
-            except sr.WaitTimeoutError:
-                continue
-            except Exception as e:
-                log_callback(f"Microphone error: {e}")
-                continue
-
-        try:
-            command = r.recognize_google(audio).lower()
-            log_callback(f"You: {command}")
-
-            if "orion start" in command:
-                LISTENING_ACTIVE = True
-                speak("Listening activated.")
-                log_callback("🟢 Orion is now active.")
-                continue
-
-            elif "orion stop" in command:
-                LISTENING_ACTIVE = False
-                speak("Listening paused.")
-                log_callback("🔴 Orion stopped listening.")
-                continue
-
-            elif "orion exit" in command or "orion close" in command:
-                speak("Goodbye.")
-                log_callback("⚪ Orion is shutting down...")
-                EXIT_REQUESTED = True
-                indicator.stop_animation()
-                threading.Thread(target=lambda: os._exit(0), daemon=True).start()
-                break
-
-            if LISTENING_ACTIVE:
-                indicator.start_animation()
-                processCommand(command, log_callback)
-                indicator.stop_animation()
-
-        except sr.UnknownValueError:
-            if LISTENING_ACTIVE:
-                speak("Sorry, I didn’t catch that.")
-            continue
-        except Exception as e:
-            log_callback(f"Recognition error: {e}")
-            continue
-
-def continuous_listen(app):
-    """Continuously listen for commands in the background."""
-    global EXIT_REQUESTED
-    while not EXIT_REQUESTED:
-        try:
-            listen_command(app.log, app.indicator)
-        except Exception as e:
-            app.log(f"Error in listening loop: {e}")
-            time.sleep(2)
-
-
-class ListeningIndicator(ctk.CTkCanvas):
-    """
-    Circular arc that rotates while listening. Uses CTkCanvas but behaves similarly to Tk Canvas.
-    """
-    def __init__(self, master, size=100, bg="#0f1216"):
-        super().__init__(master, width=size, height=size, highlightthickness=0, bg=bg)
-        self.size = size
-        self.angle = 0
-        pad = 6
-        self.arc = self.create_arc(pad, pad, size - pad, size - pad, start=0, extent=60, style="arc", outline="#00ffff", width=4)
-        self.animating = False
-
-    def start_animation(self):
-        if not self.animating:
-            self.animating = True
-            threading.Thread(target=self._animate, daemon=True).start()
-
-    def stop_animation(self):
-        self.animating = False
-        self.itemconfig(self.arc, start=0)
-
-    def _animate(self):
-        while self.animating:
-            self.angle = (self.angle + 6) % 360
-            try:
-                self.itemconfig(self.arc, start=self.angle)
-            except Exception:
-                pass
-            time.sleep(0.02)
-
-class OrbitalCanvas(ctk.CTkCanvas):
-    """
-    Central sci-fi orbital visualization with multiple rotating rings and orbiting dots.
-    """
-    def __init__(self, master, size=420, bg="#07080a"):
-        super().__init__(master, width=size, height=size, highlightthickness=0, bg=bg)
-        self.size = size
-        self.center = (size // 2, size // 2)
-        self.rings = [40, 70, 100, 130, 160]
-        self.dots = []
-        self.angles = [i * 30 for i in range(len(self.rings))]
-        self._create_static()
-        self.running = True
-        threading.Thread(target=self._animate, daemon=True).start()
-
-    def _create_static(self):
-        cx, cy = self.center
-        self.create_oval(cx-40, cy-40, cx+40, cy+40, fill="#001f3f", outline="#00e6ff", width=3)
-        self.create_text(cx, cy, text="ORION", fill="#00e6ff", font=("Orbitron", 14, "bold"))
-        for r in self.rings:
-            self.create_oval(cx-r, cy-r, cx+r, cy+r, outline="#0d4b66", width=1)
-        for i, r in enumerate(self.rings):
-            a = math.radians(self.angles[i])
-            x = cx + r * math.cos(a)
-            y = cy + r * math.sin(a)
-            dot = self.create_oval(x-6, y-6, x+6, y+6, fill="#00e6ff", outline="")
-            self.dots.append((dot, r, (i % 2)*0.6 + 0.6))
-
-    def _animate(self):
-        cx, cy = self.center
-        while self.running:
-            for i in range(len(self.dots)):
-                dot_id, r, speed = self.dots[i]
-                self.angles[i] = (self.angles[i] + 1.5 * speed) % 360
-                a = math.radians(self.angles[i])
-                x = cx + r * math.cos(a)
-                y = cy + r * math.sin(a)
-                self.coords(dot_id, x-5, y-5, x+5, y+5)
-            time.sleep(0.02)
-
-    def stop(self):
-        self.running = False
-
-class ORIONApp(ctk.CTk):
-    def __init__(self):
-        super().__init__()
-        self.title("O.R.I.O.N - AI Assistant")
-        self.geometry(WINDOW_SIZE)
-        self.minsize(1000, 600)
-        ctk.set_appearance_mode("dark")
-
-        self.grid_rowconfigure(0, weight=1)
-        self.grid_columnconfigure(1, weight=1)
-
-        self.left_panel = ctk.CTkFrame(self, width=220, corner_radius=8, fg_color="#071021")
-        self.left_panel.grid(row=0, column=0, sticky="nsw", padx=(12,6), pady=12)
-        self._build_left_panel()
-
-
-        self.center_panel = ctk.CTkFrame(self, corner_radius=10, fg_color="#08121a")
-        self.center_panel.grid(row=0, column=1, sticky="nsew", padx=6, pady=12)
-        self.center_panel.grid_rowconfigure(1, weight=1)
-        self._build_center_panel()
-
-        self.header = ctk.CTkLabel(self, text="O.R.I.O.N", font=("Orbitron", 20, "bold"), text_color="#00e6ff")
-        self.header.place(x=80, y=8)
-
-        self.protocol("WM_DELETE_WINDOW", self.on_closing)
-
-    def _build_left_panel(self):
-        t = ctk.CTkLabel(self.left_panel, text="SYSTEM", font=("Roboto", 14, "bold"), text_color="#7fd3ff")
-        t.pack(pady=(25, 25))
-        self.system_labels = {}
-
-        for name in ["CPU", "Memory", "Disk", "Power", "Location"]:
-            f = ctk.CTkFrame(self.left_panel, fg_color="#05121a", corner_radius=6)
-            f.pack(fill="x", padx=10, pady=6)
-            lbl = ctk.CTkLabel(f, text=name, anchor="w", font=("Helvetica", 11))
-            lbl.grid(row=0, column=0, sticky="w", padx=8, pady=6)
-            val_lbl = ctk.CTkLabel(f, text="...", anchor="e", font=("Helvetica", 12, "bold"), text_color="#00e6ff")
-            val_lbl.grid(row=0, column=1, sticky="e", padx=8, pady=6)
-            f.grid_columnconfigure(0, weight=1)
-            f.grid_columnconfigure(1, weight=0)
-            self.system_labels[name] = val_lbl
-
-        threading.Thread(target=self._update_system_stats, daemon=True).start()
-
-    def _update_system_stats(self):
-        while True:
-            try:
-                cpu = psutil.cpu_percent(interval=1)
-                mem = psutil.virtual_memory().used / (1024 ** 3)
-                total_mem = psutil.virtual_memory().total / (1024 ** 3)
-                disk = psutil.disk_usage('/').percent
-                try:
-                    battery = psutil.sensors_battery()
-                    power = "AC" if battery.power_plugged else f"{battery.percent:.0f}%"
-                except Exception:
-                    power = "N/A"
-
-                self.system_labels["CPU"].configure(text=f"{cpu:.1f}%")
-                self.system_labels["Memory"].configure(text=f"{mem:.1f}/{total_mem:.1f} GB")
-                self.system_labels["Disk"].configure(text=f"{disk:.1f}%")
-                self.system_labels["Power"].configure(text=power)
-                location = get_real_location()
-                self.system_labels["Location"].configure(text=location)
-
-            except Exception as e:
-                print("System stats update error:", e)
-            time.sleep(2)
-
-    def _build_center_panel(self):
-        top_frame = ctk.CTkFrame(self.center_panel, fg_color="#07131a", corner_radius=8)
-        top_frame.grid(row=0, column=0, sticky="ew", padx=12, pady=(12,8))
-        top_frame.grid_columnconfigure(0, weight=1)
-        top_frame.grid_columnconfigure(1, weight=0)
-
-        self.orbital = OrbitalCanvas(top_frame, size=420, bg="#04050a")
-        self.orbital.grid(row=0, column=0, padx=12, pady=12)
-
-        mini = ctk.CTkFrame(top_frame, fg_color="#05121a", width=220, corner_radius=8)
-        mini.grid(row=0, column=1, sticky="n", padx=(6,12), pady=12)
-        mini.grid_rowconfigure(3, weight=1)
-        lbl_time = ctk.CTkLabel(mini, text="SYSTEM TIME", font=("Roboto", 10), text_color="#9adcfb")
-        lbl_time.pack(pady=(8,2))
-        self.lbl_clock = ctk.CTkLabel(mini, text="00:00:00", font=("Orbitron", 16, "bold"), text_color="#00e6ff")
-        self.lbl_clock.pack(pady=(0,8))
-
-        bottom_frame = ctk.CTkFrame(self.center_panel, fg_color="#07131a", corner_radius=8)
-        bottom_frame.grid(row=1, column=0, sticky="nsew", padx=12, pady=(8,12))
-        bottom_frame.grid_rowconfigure(0, weight=1)
-        bottom_frame.grid_columnconfigure(0, weight=1)
-
-        self.textbox = ctk.CTkTextbox(bottom_frame, width=780, height=160, corner_radius=8, font=("Consolas", 11))
-        self.textbox.grid(row=0, column=0, sticky="nsew", padx=12, pady=12)
-        self.textbox.insert("end", ">>> Welcome, Sir. Orion is online.\n")
-
-        control_frame = ctk.CTkFrame(bottom_frame, fg_color="#07131a", corner_radius=8)
-        control_frame.grid(row=1, column=0, sticky="ew", padx=12, pady=(0,12))
-        control_frame.grid_columnconfigure(0, weight=1)
-        control_frame.grid_columnconfigure(1, weight=0)
-
-        left_controls = ctk.CTkFrame(control_frame, fg_color="#07131a", corner_radius=8)
-        left_controls.grid(row=0, column=0, sticky="w", padx=6)
-        self.indicator = ListeningIndicator(left_controls, size=64, bg="#07121a")
-        self.indicator.pack(side="left", padx=(6,12))
-
-        self.input_entry = ctk.CTkEntry(control_frame, placeholder_text="Type a command or press Speak...", width=420)
-        self.input_entry.grid(row=0, column=1, sticky="e", padx=(0,6))
-        self.input_entry.bind("<Return>", self._on_enter_pressed)
-
-        help_lbl = ctk.CTkLabel(control_frame, text="Tip: Try 'open youtube', 'remind me to call in 10', 'find file report'",
-                                font=("Roboto", 9), text_color="#8fd8ff")
-        help_lbl.grid(row=1, column=0, columnspan=2, sticky="w", padx=10, pady=(6,0))
-
-
-    def _on_enter_pressed(self, event):
-        txt = self.input_entry.get().strip()
-        if txt:
-            self.log(f"You: {txt}")
-            self.input_entry.delete(0, "end")
-            threading.Thread(target=processCommand, args=(txt, self.log), daemon=True).start()
-
-    def log(self, message):
-        self.textbox.insert("end", message + "\n")
-        self.textbox.see("end")
-
-    def on_closing(self):
-        try:
-            self.orbital.stop()
-        except Exception:
-            pass
-        if hasattr(self, 'cap') and self.cap.isOpened():
-            self.cap.release()
-        self.destroy()
-
-
-def start_clock(app):
-    def update():
-        while True:
-            now = datetime.now().strftime("%H:%M:%S")
-            try:
-                app.lbl_clock.configure(text=now)
-            except Exception:
-                pass
-            time.sleep(1)
-    threading.Thread(target=update, daemon=True).start()
-    
-if __name__ == "__main__":
-    threading.Thread(target=speak, args=("Initializing Orion interface. Say 'Orion start' to begin.",), daemon=True).start()
-    app = ORIONApp()
-    start_clock(app)
-    threading.Thread(target=continuous_listen, args=(app,), daemon=True).start()
-    app.mainloop()
+from dotenv import load_dotenv
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import itertools
+import threading
+import subprocess
+import webbrowser
+
+from file_index import FileIndex
+from reminders import ReminderScheduler, parse_when, parse_duration, describe_delay
+from response_cache import ResponseCache
+from streaming import SentenceSplitter, split_sentences
+from speech import SpeechWorker, PRIORITY_ALERT, PRIORITY_NORMAL, PRIORITY_CHATTER
+from intent_router import IntentRouter
+from intent_classifier import IntentClassifier
+from music_index import MusicIndex
+from audio_capture import AudioCapture, MicrophoneSource, PocketSphinxWakeWord
+from recognizers import GoogleBackend, PocketSphinxBackend, RecognizerSelector, NoSpeech
+from speech_pipeline import SpeechPipeline
+from tracing import Tracer
+from conversation import ConversationMemory, is_follow_up
+from ai_pool import AIPool, Cancelled
+from core_loop import CoreLoop
+from clipboard_history import ClipboardHistory
+from text_search import TextSearch
+from transcript import Transcript
+from power import PowerGovernor, TIERS
+
+load_dotenv()
+GEMINI_MODEL_NAME = "gemini-2.0-flash"
+
+# Only written by the voice pipeline's single execution worker and shutdown().
+LISTENING_ACTIVE = False  
+EXIT_REQUESTED = False
+
+
+
+VOICE_RATE = 160
+VOICE_VOLUME = 1.0
+MALE_VOICE_INDEX = 1
+WINDOW_SIZE = "1100x650"
+ANIMATION_FPS = 50
+GUI_LOG_LINES = 1000   # older lines stay in the transcript
+TRANSCRIPT_MAX_BYTES = 2 * 1024 * 1024
+TRANSCRIPT_BACKUPS = 10
+DATA_DIR = os.getenv("ORION_DATA_DIR", os.path.join(os.path.expanduser("~"), ".orion"))
+SEARCH_ROOTS = [p for p in os.getenv("ORION_SEARCH_ROOTS", r"C:\Users\LENOVO\Desktop").split(os.pathsep) if p]
+FILE_INDEX_REFRESH_SEC = 60
+TEXT_SEARCH_ROOTS = [p for p in os.getenv("ORION_TEXT_ROOTS", os.pathsep.join(SEARCH_ROOTS)).split(os.pathsep) if p]
+TEXT_SEARCH_WORKERS = int(os.getenv("ORION_TEXT_WORKERS", "0")) or None   # default: one per CPU
+TEXT_SEARCH_TIMEOUT_SEC = 30
+WAKE_WORD = os.getenv("ORION_WAKE_WORD", "orion")
+MUSIC_CATALOG = os.getenv("ORION_MUSIC_CATALOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "music_catalog.json"))
+TELEMETRY_INTERVAL_SEC = float(os.getenv("ORION_TELEMETRY_INTERVAL", "2"))
+POWER_MODE = os.getenv("ORION_POWER_MODE", "auto")   # auto, or a tier from power.py
+POWER_CHECK_SEC = 5
+STREAM_AI_RESPONSES = os.getenv("ORION_STREAM_AI", "1") != "0"
+RECOGNITION_WORKERS = int(os.getenv("ORION_RECOGNIZERS", "2"))
+RECOGNIZER_BACKEND = os.getenv("ORION_RECOGNIZER", "auto")   # auto, google or sphinx
+RECOGNIZER_MAX_LATENCY_SEC = float(os.getenv("ORION_RECOGNIZER_MAX_LATENCY", "2.5"))
+TRACE_ENABLED = os.getenv("ORION_TRACE", "0") == "1"
+DRY_RUN = os.getenv("ORION_DRY_RUN", "0") == "1"   # report desktop actions instead of running them
+METRICS_PORT = int(os.getenv("ORION_METRICS_PORT", "9464"))
+SERVER_PORT = int(os.getenv("ORION_SERVER_PORT", "8765"))
+SERVER_WORKERS = int(os.getenv("ORION_SERVER_WORKERS", "4"))
+SERVER_TOKEN = os.getenv("ORION_SERVER_TOKEN") or None
+AI_PROMPT = "You are Orion, a helpful AI assistant. Respond clearly and naturally.\nUser: {command}"
+AI_CONTEXT_PROMPT = "You are Orion, a helpful AI assistant. Respond clearly and naturally.\n{context}\nUser: {command}"
+SUMMARY_PROMPT = ("Summarize this conversation between a user and the assistant Orion in at most {words} words. "
+                  "Keep names, numbers, decisions and open questions.\n{previous}\n{turns}")
+AI_WORKERS = int(os.getenv("ORION_AI_WORKERS", "2"))
+AI_TIMEOUT_SEC = float(os.getenv("ORION_AI_TIMEOUT", "20"))
+AI_TIMEOUT_REPLY = "Sorry, that is taking too long. Please try again."
+CORE_WORKERS = 3   # blocking commands leaving the core loop
+CORE_BACKGROUND_WORKERS = 2   # location and clipboard refreshes, kept apart from commands
+CLIPBOARD_HISTORY_ENTRIES = 200
+CLIPBOARD_HISTORY_MB = float(os.getenv("ORION_CLIPBOARD_MB", "8"))
+INTENT_THRESHOLD = float(os.getenv("ORION_INTENT_THRESHOLD", "0.5"))
+# Bare names a paraphrase like "launch youtube" may open; domains ("github.com") always may.
+KNOWN_SITES = {
+    "youtube", "google", "gmail", "github", "wikipedia", "reddit", "amazon", "netflix", "spotify",
+    "stackoverflow", "twitter", "facebook", "instagram", "linkedin", "whatsapp", "chatgpt", "maps",
+    "outlook", "bing", "yahoo", "twitch", "pinterest", "quora", "flipkart", "hotstar", "primevideo",
+} | {s.strip().lower() for s in os.getenv("ORION_SITES", "").split(",") if s.strip()}
+CONVERSATION_SESSION = os.getenv("ORION_SESSION", "default")
+CONVERSATION_WINDOW_TOKENS = 600
+CONVERSATION_SUMMARY_TOKENS = 250
+
+speech_pipeline = None
+power_governor = None   # created with the window (see run_gui)
+frame_scheduler = None  # the window's FrameScheduler (see frames.py)
+power_tier = TIERS[0]   # the tier last applied by apply_power_tier()
+tracer = Tracer(os.path.join(DATA_DIR, "traces.jsonl") if TRACE_ENABLED else None)
+SPEECH_SINK = None   # headless mode: callable receiving text instead of the TTS worker
+ACTION_SINK = None   # headless mode: callable receiving every desktop action as (action, target)
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _client(name, factory):
+    """
+    Creates a heavy client (model, microphone, recognizer, ...) on first use.
+    Nothing here runs at import time, so headless runs and benchmarks only
+    pay for what their commands actually touch.
+    """
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = factory()
+    return client
+
+def _make_gemini():
+    import google.generativeai as genai
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel(GEMINI_MODEL_NAME)
+
+def _make_location_provider():
+    from location import LocationProvider, DEFAULT_URL
+    return LocationProvider(
+        os.path.join(DATA_DIR, "location.json"),
+        url=os.getenv("ORION_LOCATION_URL", DEFAULT_URL),
+    )
+
+def _make_telemetry_sampler():
+    from telemetry import TelemetrySampler
+    return TelemetrySampler(interval=TELEMETRY_INTERVAL_SEC)
+
+def _make_speech_recognizers():
+    selector = RecognizerSelector([GoogleBackend(recognizer), PocketSphinxBackend()],
+                                  max_latency=RECOGNIZER_MAX_LATENCY_SEC)
+    if RECOGNIZER_BACKEND != "auto" and not selector.force(RECOGNIZER_BACKEND):
+        print("Unknown recognizer:", RECOGNIZER_BACKEND)
+    return selector
+
+def gemini_model():
+    return _client("gemini", _make_gemini)
+
+def recognizer():
+    import speech_recognition as sr
+    return _client("recognizer", sr.Recognizer)
+
+def microphone():
+    import speech_recognition as sr
+    return _client("microphone", sr.Microphone)
+
+def speech_recognizers():
+    return _client("recognizers", _make_speech_recognizers)
+
+def wake_detector():
+    return _client("wake_word", lambda: PocketSphinxWakeWord(WAKE_WORD))
+
+def location_provider():
+    return _client("location", _make_location_provider)
+
+def telemetry_sampler():
+    return _client("telemetry", _make_telemetry_sampler)
+
+speech_worker = SpeechWorker(
+    os.path.join(DATA_DIR, "tts_cache"),
+    voice_index=MALE_VOICE_INDEX,
+    rate=VOICE_RATE,
+    volume=VOICE_VOLUME,
+    prerender=[
+        "Listening activated.", "Listening paused.", "Goodbye.",
+        "Sorry, I didn’t catch that.",
+        "Reminder set for 10 minutes.", "Reminder set for 5 minutes.",
+    ],
+)
+
+file_index = FileIndex(SEARCH_ROOTS, os.path.join(DATA_DIR, "file_index.pkl"))
+text_search = TextSearch(TEXT_SEARCH_ROOTS, workers=TEXT_SEARCH_WORKERS)
+transcript = Transcript(os.path.join(DATA_DIR, "transcript.log"),
+                        max_bytes=TRANSCRIPT_MAX_BYTES, backups=TRANSCRIPT_BACKUPS)
+reminder_scheduler = ReminderScheduler(
+    os.path.join(DATA_DIR, "reminders.journal"),
+    on_fire=lambda rem: speak(f"Reminder: {rem.text}", PRIORITY_ALERT),
+)
+response_cache = ResponseCache(os.path.join(DATA_DIR, "responses.db"))
+music_index = MusicIndex(MUSIC_CATALOG)
+clipboard_history = ClipboardHistory(
+    max_entries=CLIPBOARD_HISTORY_ENTRIES,
+    max_bytes=int(CLIPBOARD_HISTORY_MB * 1024 * 1024),
+)
+
+ai_pool = AIPool(workers=AI_WORKERS, timeout=AI_TIMEOUT_SEC)
+core = CoreLoop(workers=CORE_WORKERS, background_workers=CORE_BACKGROUND_WORKERS)
+_command_ids = itertools.count(1)
+_command_lock = threading.Lock()
+_latest_commands = {}   # session id (None for the desktop) -> id of its latest command
+_session = threading.local()   # set on command server threads: the client's session id, conversation and sink;
+                               # on every command thread: when the command came in (started)
+                               # and the name of the intent it resolved to ("ai" for none)
+
+def summarize_conversation(previous, turns, budget_tokens, session=None):
+    """
+    Folds older turns into the running conversation summary (see conversation.py).
+    The call goes through ai_pool with its deadline; conversation memories
+    summarize one at a time, so summaries never hold more than one of its
+    workers. A newer command does not cancel it, ending the session does.
+    """
+    previous = f"Summary so far: {previous}" if previous else ""
+    prompt = SUMMARY_PROMPT.format(words=budget_tokens * 3 // 4, previous=previous, turns=turns)
+
+    def produce(req):
+        response = gemini_model().generate_content(
+            prompt, request_options={"timeout": max(1.0, req.remaining())})
+        req.push(response.text or "")
+
+    return ai_pool.submit(prompt, produce, owner=("summary", session)).result().strip()
+
+conversation = ConversationMemory(
+    os.path.join(DATA_DIR, "conversations", f"{CONVERSATION_SESSION}.jsonl"),
+    window_tokens=CONVERSATION_WINDOW_TOKENS,
+    summary_tokens=CONVERSATION_SUMMARY_TOKENS,
+    summarize=summarize_conversation,
+)
+
+def session_id():
+    """The command server session this thread is working for; None for the desktop."""
+    return getattr(_session, "id", None)
+
+def current_conversation():
+    """The desktop conversation, or the command server session's own memory."""
+    memory = getattr(_session, "conversation", None)
+    return conversation if memory is None else memory
+
+def get_real_location():
+    """
+    Returns a string with city, region, country using IP-based geolocation.
+    Served from LocationProvider's cache (see location.py); never blocks.
+    """
+    return location_provider().get()
+
+def desktop_action(action, fn, target):
+    """
+    Runs fn(target), a call that acts on the machine: opening a page, an
+    app or a file, shutting down or locking. Headless runs report it to
+    ACTION_SINK; with DRY_RUN (--dry-run) it is only reported, so scripted
+    runs can exercise every skill without touching the desktop.
+    """
+    if ACTION_SINK is not None:
+        ACTION_SINK((action, target))
+    if not DRY_RUN:
+        fn(target)
+
+def start_file(path):
+    os.startfile(path)   # Windows only; looked up when the action runs, not when it is reported
+
+def speak(text, priority=PRIORITY_NORMAL, on_start=None, wait=False):
+    """
+    Queues text on the speech worker (see speech.py) and returns immediately
+    unless wait=True. Returns an Event that is set once the text was spoken.
+    In headless mode the text goes to SPEECH_SINK instead, and for command
+    server clients to their session's sink.
+    """
+    sink = getattr(_session, "sink", None) or SPEECH_SINK
+    if sink is not None:
+        sink(text)
+        done = threading.Event()
+        done.set()
+        return done
+    on_start = tracer.until("speak", on_start, priority=priority, chars=len(text))
+    done = speech_worker.say(text, priority, on_start)
+    if wait:
+        done.wait()
+    return done
+
+def build_prompt(command):
+    """
+    Returns (prompt, cacheable). Follow-up questions ("what is its
+    population?") get the conversation context and bypass the response
+    cache; stand-alone questions are sent, and cached, without it.
+    """
+    memory = current_conversation()
+    if is_follow_up(command) and memory.has_context():
+        return AI_CONTEXT_PROMPT.format(context=memory.context(), command=command), False
+    return AI_PROMPT.format(command=command), True
+
+def model_stream(prompt):
+    """Returns the ai_pool job that streams the model's answer for prompt into its request."""
+    def produce(req):
+        response = gemini_model().generate_content(
+            prompt, stream=True, request_options={"timeout": max(1.0, req.remaining())})
+        for chunk in response:
+            if not req.push(getattr(chunk, "text", "") or ""):
+                break   # cancelled or past its deadline
+    return produce
+
+def aiProcess(command, superseded=None):
+    """
+    Uses Google Gemini 2.0 Flash for AI responses.
+    Answers are cached by normalized prompt (see response_cache.py).
+    Every answer is added to the conversation memory (see conversation.py).
+    The call runs on ai_pool (see ai_pool.py) with a deadline; returns ""
+    if a newer command superseded this one.
+    """
+    memory = current_conversation()
+    prompt, cacheable = build_prompt(command)
+    cached = response_cache.get(command) if cacheable else None
+    if cached is not None:
+        memory.add(command, cached)
+        return cached
+    ai_pool.cancel_pending(keep=prompt, owner=session_id())
+    try:
+        started = time.perf_counter()
+        text = ai_pool.submit(prompt, model_stream(prompt), owner=session_id()).result().strip()
+        if superseded is not None and superseded():
+            return ""
+        if not text:
+            return "I couldn't generate a response."
+        if cacheable:
+            response_cache.put(command, text, time.perf_counter() - started)
+        memory.add(command, text)
+        return text
+    except Cancelled:
+        return ""
+    except TimeoutError:
+        print("AI Error: request timed out")
+        return AI_TIMEOUT_REPLY
+    except Exception as e:
+        print("AI Error:", e)
+        return "Sorry, I cannot process that right now."
+
+def aiProcessStream(command, on_sentence, superseded=None):
+    """
+    Streaming variant of aiProcess: calls on_sentence(sentence) as soon as each
+    sentence of the answer is complete. Returns the full answer text.
+    Stops quietly once superseded() reports a newer command.
+    """
+    memory = current_conversation()
+    prompt, cacheable = build_prompt(command)
+    cached = response_cache.get(command) if cacheable else None
+    if cached is not None:
+        memory.add(command, cached)
+        for sentence in split_sentences(cached):
+            on_sentence(sentence)
+        return cached
+    ai_pool.cancel_pending(keep=prompt, owner=session_id())
+    splitter = SentenceSplitter()
+    parts = []
+    try:
+        started = time.perf_counter()
+        for text in ai_pool.submit(prompt, model_stream(prompt), owner=session_id()).stream():
+            if superseded is not None and superseded():
+                return ""
+            parts.append(text)
+            for sentence in splitter.feed(text):
+                on_sentence(sentence)
+        for sentence in splitter.flush():
+            on_sentence(sentence)
+        full = "".join(parts).strip()
+        if not full:
+            full = "I couldn't generate a response."
+            on_sentence(full)
+        else:
+            if cacheable:
+                response_cache.put(command, full, time.perf_counter() - started)
+            memory.add(command, full)
+        return full
+    except Cancelled:
+        return ""
+    except Exception as e:
+        print("AI Error:", e if not isinstance(e, TimeoutError) else "request timed out")
+        for sentence in splitter.flush():
+            on_sentence(sentence)
+        fallback = AI_TIMEOUT_REPLY if isinstance(e, TimeoutError) else "Sorry, I cannot process that right now."
+        on_sentence(fallback)
+        return fallback
+
+def report_first_audio(command, seconds):
+    print(f"[timing] first audio after {seconds * 1000:.0f} ms for: {command}")
+
+def cache_stats_report():
+    s = response_cache.stats()
+    return (f"AI cache hit rate {s['hit_rate'] * 100:.0f} percent over "
+            f"{s['memory_hits'] + s['disk_hits'] + s['misses']} lookups, "
+            f"saved {s['saved_seconds']:.1f} seconds of model time. "
+            + ai_pool_report())
+
+def ai_pool_report():
+    s = ai_pool.stats()
+    return (f"{s['submitted']} model calls, {s['coalesced']} shared with an identical request, "
+            f"{s['cancelled']} cancelled, {s['timeouts']} timed out.")
+
+def pipeline_stats_report():
+    if speech_pipeline is None:
+        return "The voice pipeline is not running."
+    m = speech_pipeline.metrics()
+    rec, exe = m["recognize"], m["execute"]
+    return (f"Captured {m['captured']} utterances, dropped {rec['dropped']}. "
+            f"Recognition queue {rec['depth']} of {rec['capacity']}, peak {rec['max_depth']}, "
+            f"{rec['avg_service_ms']:.0f} milliseconds each. "
+            f"Command queue {exe['depth']} of {exe['capacity']}, peak {exe['max_depth']}.")
+
+def frame_stats_report():
+    if frame_scheduler is None:
+        return "The window is not open."
+    s = frame_scheduler.stats()
+    if s["paused"]:
+        return "Animations are paused while the window is hidden."
+    return (f"Drawing {s['fps']:.0f} frames per second of a target {s['target_fps']}, "
+            f"{s['frame_ms_avg']:.1f} milliseconds per frame on average, {s['frame_ms_max']:.1f} at most. "
+            f"{s['skipped']} of {s['frames'] + s['skipped']} frames skipped.")
+
+def write_app(app_name):
+    """
+    Opens desktop applications using os.system without needing full paths.
+    """
+    app_name = app_name.lower()
+    try:
+        app_commands = {
+            "notepad": "notepad",
+            "calculator": "calc",
+            "snipping tool": "snippingtool",
+            "word": "winword",
+            "excel": "excel",
+            "powerpoint": "powerpnt",
+            "chrome": "chrome",
+            "edge": "msedge",
+            "this pc": "explorer shell:MyComputerFolder",
+            "network": "explorer shell:NetworkPlacesFolder",
+            "recycle bin": "explorer shell:RecycleBinFolder",
+            "control panel": "control",
+            "windows explorer": "explorer",
+            "adobe reader": "AcroRd32",  
+            "zoom": r"C:\Users\LENOVO\AppData\Roaming\Zoom\bin\Zoom.exe",
+        }
+
+        command = app_commands.get(app_name)
+        if command:
+            desktop_action("open_app", os.system, f"start {command}")
+        else:
+            speak(f"Sorry, I don't know how to open {app_name}")
+    except Exception as e:
+        speak(f"Error opening {app_name}: {e}")
+        
+def open_folder(folder_path):
+    """
+    Opens a folder in Windows Explorer.
+    folder_path: full path to the folder
+    """
+    try:
+        if os.path.exists(folder_path):
+            desktop_action("open_folder", start_file, folder_path)
+        else:
+            speak(f"The folder {folder_path} does not exist.")
+    except Exception as e:
+        speak(f"Error opening folder: {e}")
+
+def system_action(action):
+    action = action.lower()
+    try:
+        if "shutdown" in action:
+            desktop_action("system", os.system, "shutdown /s /t 5")
+            speak("Shutting down the PC.")
+        elif "restart" in action:
+            desktop_action("system", os.system, "shutdown /r /t 5")
+            speak("Restarting the PC.")
+        elif "lock" in action:
+            desktop_action("system", os.system, "rundll32.exe user32.dll,LockWorkStation")
+            speak("Locking the PC.")
+        elif "log off" in action or "logoff" in action:
+            desktop_action("system", os.system, "shutdown /l")
+            speak("Logging off.")
+        else:
+            speak("I cannot perform that system action.")
+    except Exception as e:
+        speak(f"System action error: {e}")
+
+def search_file(file_name):
+    """
+    Looks the name up in the file index (see file_index.py) and opens the best match.
+    Returns the ranked list of matching paths.
+    """
+    if not file_index.loaded:
+        file_index.refresh()
+    matches = file_index.search(file_name, limit=5)
+    if not matches:
+        file_index.request_refresh()
+        speak(f"{file_name} not found in {', '.join(SEARCH_ROOTS)}")
+        return []
+    file_path = matches[0]
+    speak(f"Found {os.path.basename(file_path)} at {file_path}")
+    try:
+        desktop_action("open_file", start_file, file_path)
+    except Exception:
+        pass
+    return matches
+
+def search_text(query, log_callback):
+    """
+    Looks for query inside the files below TEXT_SEARCH_ROOTS (see text_search.py).
+    Matches are logged as they are found; a newer command stops the search.
+    Returns the text to speak.
+    """
+    sid = session_id()
+    command_id = _latest_commands.get(sid)
+    report = text_search.search(
+        query, limit=5,
+        on_result=lambda match, rank: log_callback(f"Match {rank}: {match.path} - {match.snippet}"),
+        cancelled=lambda: EXIT_REQUESTED or _latest_commands.get(sid) != command_id,
+        timeout=TEXT_SEARCH_TIMEOUT_SEC,
+    )
+    if not report.matches:
+        if report.cancelled:
+            return f"Stopped searching for {query}."
+        return f"No file mentions {query}."
+    for match in report.matches[1:]:
+        log_callback(f"Also found in: {match.path}")
+    best = os.path.basename(report.matches[0].path)
+    stopped = " before the search finished" if report.cancelled else ""
+    files = "1 file" if report.total == 1 else f"{report.total} files"
+    return f"Found {query} in {files}{stopped}. Best match: {best}."
+
+def transcript_action(query, log_callback):
+    """
+    Logs transcript lines containing query, newest first (see transcript.py),
+    leaving out the lines written since this command came in, its own
+    "You:" line included. Returns the text to speak.
+    """
+    lines = transcript.search(query, limit=20, before=getattr(_session, "started", None))
+    if not lines:
+        return f"Nothing about {query} in the transcript."
+    for line in reversed(lines):
+        log_callback(f"  {line}")
+    return f"Found {len(lines)} transcript lines about {query}." if len(lines) > 1 else f"Found one transcript line about {query}."
+
+NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+                "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10}
+
+def clipboard_action(action):
+    """
+    "clipboard search <text>", "paste item <n>", "clipboard history" and
+    "show clipboard". All but the last are answered from clipboard_history
+    (see clipboard_history.py). Returns the text to speak.
+    """
+    try:
+        m = re.search(r"clipboard search\s+(.+)$|search (?:the |my )?clipboard (?:for )?(.+)$", action)
+        if m:
+            query = (m.group(1) or m.group(2)).strip()
+            found = clipboard_history.search(query)
+            if not found:
+                return f"Nothing in the clipboard history matches {query}."
+            return (f"Found {len(found)} clipboard items. "
+                    + "; ".join(f"Item {n}: {entry.preview()}" for n, entry in found))
+        m = re.search(r"\bitem\s+(\d+|" + "|".join(NUMBER_WORDS) + r")\b", action)
+        if m:
+            n = NUMBER_WORDS.get(m.group(1)) or int(m.group(1))
+            entry = clipboard_history.recall(n)
+            if entry is None:
+                return f"There is no clipboard item {n}."
+            return f"Item {n} is on the clipboard: {entry.preview()}"
+        if "history" in action:
+            recent = clipboard_history.recent()
+            if not recent:
+                return "The clipboard history is empty."
+            return "; ".join(f"Item {n}: {entry.preview()}" for n, entry in recent)
+        if "paste" in action or "show" in action:
+            import pyperclip
+            return f"Clipboard contains: {pyperclip.paste()}"
+        return "Clipboard action not recognized."
+    except Exception as e:
+        return f"Clipboard error: {e}"
+
+def set_reminder(reminder_text, delay_sec):
+    """Schedules a reminder `delay_sec` seconds from now (see reminders.py)."""
+    return reminder_scheduler.add_in(reminder_text, delay_sec)
+
+REMINDER_ID_RE = re.compile(r"\b(?:reminder|number)\s+(?:number\s+)?(\d+|" + "|".join(NUMBER_WORDS) + r")\b")
+
+def reminder_action(command_lower):
+    """Handles 'list reminders', 'cancel reminder <id>' and 'snooze reminder <id> for <duration>'."""
+    words = command_lower.split()
+    # The id is the number after "reminder"/"number", not the first one ("snooze for 5 minutes reminder 2").
+    m = REMINDER_ID_RE.search(command_lower)
+    rid = (NUMBER_WORDS.get(m.group(1)) or int(m.group(1))) if m else None
+    if "cancel" in words or "delete" in words:
+        rem = reminder_scheduler.cancel(rid) if rid is not None else None
+        return f"Cancelled reminder {rid}: {rem.text}" if rem else "No such reminder."
+    if "snooze" in words:
+        delay = 300
+        for sep in (" for ", " by "):
+            if sep in command_lower:
+                delay = parse_duration(command_lower.split(sep, 1)[1]) or delay
+        rem = reminder_scheduler.snooze(rid, delay) if rid is not None else None
+        return f"Reminder {rid} snoozed for {describe_delay(delay)}." if rem else "No such reminder."
+    pending = reminder_scheduler.list(limit=5)
+    if not pending:
+        return "You have no pending reminders."
+    now = time.time()
+    items = [f"{rem.id}: {rem.text} in {describe_delay(rem.due - now)}" for rem in pending]
+    return f"You have {len(reminder_scheduler)} reminders. " + "; ".join(items)
+
+# Phrasings without trigger keywords are matched by example (see intent_classifier.py).
+intent_classifier = IntentClassifier(threshold=INTENT_THRESHOLD)
+intent_classifier.add_questions()
+command_router = IntentRouter(intent_classifier)
+
+@command_router.route("open_app", keywords=["open app", "write app"],
+                      patterns=[r"(?:open|write) app\s*(?P<app>.*)$"], priority=10)
+def skill_open_app(command, slots, log_callback):
+    write_app(slots["app"])
+    return f"Opening {slots['app']}"
+
+REMINDER_PREFIX_RE = re.compile(r"^.*?\b(?:remind me|(?:set|add|create) (?:a )?reminder)\b(?:\s+(?:to|for|about)\b)?")
+
+def split_reminder(command_lower):
+    """(text before the time, due time) for "... in 10 minutes" / "... at 17:30", or (command, None)."""
+    for sep in (" in ", " at "):
+        if sep in command_lower:
+            text, when = command_lower.rsplit(sep, 1)
+            due = parse_when(sep.strip() + " " + when)
+            if due is not None:
+                return text, due
+    return command_lower, None
+
+# Classifier matches must pass these before a skill with side effects runs.
+def verify_reminder(command, slots):
+    return split_reminder(command.lower())[1] is not None
+
+def verify_song(command, slots):
+    return bool(slots.get("song")) and music_index.best(slots["song"]) is not None
+
+DOMAIN_RE = re.compile(r"^(?:https?://)?[a-z0-9-]+(?:\.[a-z0-9-]+)+(?:/\S*)?$")
+
+def verify_site(command, slots):
+    site = slots.get("site", "").lower()
+    return site in KNOWN_SITES or bool(DOMAIN_RE.match(site))
+
+@command_router.route("remind_me", keywords=["remind me", "set a reminder", "set reminder", "add a reminder",
+                                            "create a reminder"], priority=15, verify=verify_reminder, examples={
+    "remind me to {}": ["don't let me forget to {}", "ping me to {}", "alert me to {}", "nudge me to {}"]})
+def skill_remind_me(command, slots, log_callback):
+    head, due = split_reminder(command.lower())
+    if due is None:
+        return "Failed to set reminder. Try 'remind me to <task> in 10 minutes' or 'at 17:30'."
+    reminder_text = REMINDER_PREFIX_RE.sub("", head, count=1).strip()
+    rem = reminder_scheduler.add(reminder_text, due)
+    return f"Reminder set for {describe_delay(rem.due - time.time())}."
+
+@command_router.route("play", keywords=["play"], patterns=[r"^\s*play\b\s*(?P<song>.*)$"], priority=20,
+                      verify=verify_song, examples={
+    "play {}": ["can you play {}", "please play {}", "put on {}", "i want to hear {}", "listen to {}",
+                "start playing {}"]})
+def skill_play(command, slots, log_callback):
+    song = slots["song"]
+    if not song:
+        return "Please say the song name."
+    match = music_index.best(song)
+    if match is None:
+        return f"Sorry, {song} not found in library."
+    title, url = match
+    desktop_action("open_url", webbrowser.open, url)
+    return f"Playing {title}"
+
+@command_router.route("find_file", keywords=["find file"], patterns=[r"find file\s*(?P<name>.*)$"], priority=20, examples={
+    "find file {}": ["where is my file {}", "locate the file {}", "search for the file {}",
+                     "look for the document {}", "find my {} file", "find the {} document"]})
+def skill_find_file(command, slots, log_callback):
+    file_name = slots["name"].lower()
+    matches = search_file(file_name)
+    for other in matches[1:]:
+        log_callback(f"Also found: {other}")
+    return f"Searching for {file_name}"
+
+@command_router.route("find_text", keywords=["find text"], patterns=[r"find text\s*(?P<query>.*)$"], priority=20, examples={
+    "find text {}": ["search my documents for {}", "which file mentions {}", "search inside my files for {}",
+                     "look inside files for {}"]})
+def skill_find_text(command, slots, log_callback):
+    query = slots["query"].strip()
+    if not query:
+        return "Please say the text to look for."
+    return search_text(query, log_callback)
+
+@command_router.route("recognizer", keywords=["recognizer"], priority=20, examples={
+    "recognizer stats": ["which speech recognizer are you using", "how is speech recognition doing"],
+    "recognizer offline": ["use offline speech recognition", "recognize my voice locally"],
+    "recognizer online": ["use google speech recognition", "use online speech recognition"],
+    "recognizer auto": ["choose the speech recognizer automatically"]})
+def skill_recognizer(command, slots, log_callback):
+    return recognizer_action(command.lower())
+
+@command_router.route("power", keywords=["power mode"], priority=20, examples={
+    "power mode stats": ["are you saving power", "which power mode are you in"],
+    "power mode saver": ["save battery", "use less power"],
+    "power mode performance": ["full performance", "stop saving power"],
+    "power mode auto": ["choose the power mode automatically"]})
+def skill_power(command, slots, log_callback):
+    return power_action(command.lower())
+
+@command_router.route("transcript", keywords=["transcript"],
+                      patterns=[r"transcript\b\s*(?:search\s+)?(?:for\s+)?(?P<query>.*)$"], priority=20, examples={
+    "transcript search {}": ["search the log for {}", "find {} in the log", "when did we talk about {}",
+                             "search our history for {}"]})
+def skill_transcript(command, slots, log_callback):
+    query = slots["query"]
+    if not query:
+        return "Please say what to look for in the transcript."
+    return transcript_action(query, log_callback)
+
+@command_router.route("cache_stats", keywords=["cache stats"], priority=20, examples={
+    "cache stats": ["show cache statistics", "how is the cache doing", "cache hit rate"]})
+def skill_cache_stats(command, slots, log_callback):
+    return cache_stats_report()
+
+@command_router.route("pipeline_stats", keywords=["pipeline stats"], priority=20, examples={
+    "pipeline stats": ["voice pipeline status", "how is the voice pipeline doing"]})
+def skill_pipeline_stats(command, slots, log_callback):
+    return pipeline_stats_report()
+
+@command_router.route("frame_stats", keywords=["frame stats"], priority=20, examples={
+    "frame stats": ["how smooth are the animations", "animation frame rate", "fps stats"]})
+def skill_frame_stats(command, slots, log_callback):
+    return frame_stats_report()
+
+@command_router.route("conversation", keywords=["new conversation", "forget conversation", "conversation stats"], priority=20, examples={
+    "new conversation": ["start over", "let's start fresh", "reset our chat", "clear the conversation",
+                         "forget what we talked about"],
+    "conversation stats": ["how much do you remember", "what do you remember about our chat"]})
+def skill_conversation(command, slots, log_callback):
+    memory = current_conversation()
+    if "stats" in command.lower():
+        s = memory.stats()
+        return (f"I remember {s['turns']} recent turns using {s['window_tokens']} tokens, "
+                f"plus a {s['summary_tokens']} token summary of earlier ones.")
+    memory.clear()
+    return "Starting a new conversation."
+
+# Only commands about existing reminders; "set a reminder to ..." is remind_me.
+@command_router.route("reminders", keywords=["reminder", "reminders"],
+                      patterns=[r"\b(?:list|show|cancel|snooze|delete)\b"], priority=25, examples={
+    "list reminders": ["what do i need to remember", "what's on my to do list", "show my pending alerts"]})
+def skill_reminders(command, slots, log_callback):
+    return reminder_action(command.lower())
+
+# No examples: a fuzzy match must never shut the machine down. Only an
+# imperative, optionally polite ("can you lock my computer"), counts; "how
+# do I restart my router" goes to the model.
+@command_router.route("system", keywords=["shutdown", "shut down", "restart", "lock", "log off", "logoff"],
+                      patterns=[r"^\s*(?:(?:can|could|would)\s+you\s+)?(?:please\s+)?"
+                                r"(?P<action>shut\s?down|restart|lock|log\s?off)\b"
+                                r"(?:\s+(?:the\s+|my\s+)?(?:pc|computer|screen|workstation))?(?:\s+please)?\s*[?.!]?$"],
+                      priority=30)
+def skill_system(command, slots, log_callback):
+    action = " ".join(slots["action"].lower().split()).replace("shut down", "shutdown")
+    system_action(action)
+    return f"Performing {action}"
+
+@command_router.route("clipboard", keywords=["clipboard", "paste"], priority=40, examples={
+    "show clipboard": ["what did i copy", "what's in my copy buffer", "show what i copied"],
+    "clipboard search {}": ["search my copies for {}", "find {} in what i copied"]})
+def skill_clipboard(command, slots, log_callback):
+    return clipboard_action(command.lower())
+
+# An imperative, optionally polite ("can you open youtube") or followed by
+# "and ..." as before; questions such as "how do I open a pdf" go to the model.
+@command_router.route("open_site", keywords=["open"],
+                      patterns=[r"^\s*(?:(?:can|could|would)\s+you\s+)?(?:please\s+)?open\s+(?!(?:a|an|the)\b)"
+                                r"(?P<site>[^\s?!]+?)(?:\s+please|\s+and\b.*)?\s*[?.!]?$"], priority=50,
+                      verify=verify_site, examples={
+    "open {}": ["launch {}", "go to {}", "take me to {}", "visit {}", "bring up {}", "navigate to {}",
+                "load the {} website", "pull up {}"]})
+def skill_open_site(command, slots, log_callback):
+    site = slots["site"].lower()
+    try:
+        if "." in site or "http" in site:
+            url = site if site.startswith("http") else f"https://{site}"
+        else:
+            url = f"https://{site}.com"
+        desktop_action("open_url", webbrowser.open, url)
+        return f"Opening {site}"
+    except Exception as e:
+        return f"Failed to open site: {e}"
+
+def processCommand(command, log_callback, started=None):
+    """
+    Processes the text command. Uses AI for fallback.
+    Keeps log_callback to push messages to GUI. started is the time.time()
+    the command came in, taken before its "You:" line was logged (default: now).
+    Local skills are matched by command_router (see intent_router.py).
+    Returns the response text.
+    Traced as one command (see tracing.py); voice commands continue the
+    trace that was started when their audio was captured.
+    """
+    with tracer.activate(tracer.trace_id() or tracer.new_trace()), tracer.span("command"):
+        return _run_command(command, log_callback, started)
+
+async def _command_task(command, log_callback, started):
+    try:
+        return await core.run_blocking(processCommand, command, log_callback, started)
+    except Exception as e:
+        log_callback(f"Command error: {e}")
+
+def submit_command(command, log_callback):
+    """
+    Queues a typed command on the core loop (see core_loop.py). It waits
+    there as a task, not a thread, until a core executor worker is free.
+    Logs the "You:" line first. Returns a concurrent Future with the
+    response text.
+    """
+    started = time.time()
+    log_callback(f"You: {command}")
+    if power_governor is not None:
+        power_governor.touch()
+    return core.submit(_command_task(command, log_callback, started))
+
+def _start_command():
+    """Marks a new command as its session's latest; returns superseded(), true once a newer one starts."""
+    sid = session_id()
+    with _command_lock:
+        command_id = _latest_commands[sid] = next(_command_ids)
+    return lambda: _latest_commands.get(sid) != command_id
+
+def _run_command(command, log_callback, started=None):
+    command_started = time.perf_counter()
+    _session.started = started if started is not None else time.time()
+    superseded = _start_command()
+    with tracer.span("route"):
+        intent, slots, resolved = command_router.resolve(command)
+    _session.intent = intent.name if intent is not None else "ai"
+
+    if intent is not None:
+        # A newer command makes any pending model request moot.
+        ai_pool.cancel_pending(owner=session_id())
+        with tracer.span(f"skill.{intent.name}", classified=resolved != command):
+            response = intent.handler(resolved, slots, log_callback)
+
+    elif STREAM_AI_RESPONSES:
+        first_audio = []
+        sentences = []
+
+        def on_start():
+            if not first_audio:
+                first_audio.append(time.perf_counter() - command_started)
+                report_first_audio(command, first_audio[0])
+
+        def on_sentence(sentence):
+            log_callback(f"       {sentence}" if sentences else f"Orion: {sentence}")
+            sentences.append(sentence)
+            speak(sentence, on_start=on_start)
+
+        with tracer.span("ai", stream=True):
+            aiProcessStream(command, on_sentence, superseded)
+        return " ".join(sentences)
+
+    else:
+        with tracer.span("ai", stream=False):
+            response = aiProcess(command, superseded)
+        if not response:
+            return response
+
+    speak(response, on_start=lambda: report_first_audio(command, time.perf_counter() - command_started))
+    log_callback(f"Orion: {response}")
+    return response
+
+def recognize_utterance(utterance, span=None):
+    """
+    Recognition stage of the voice pipeline (runs on a worker pool).
+    While Orion is paused, utterances only go to the local wake word detector.
+    Otherwise the recognizer selector (see recognizers.py) picks a backend,
+    falling back to the next one when it fails; its name is set on `span`.
+    Returns ("wake", None), ("text", command), ("unknown", None) or None.
+    """
+    wake_word = wake_detector()
+    if not LISTENING_ACTIVE and wake_word.available:
+        return ("wake", None) if wake_word.detect(utterance) else None
+    try:
+        text, backend = speech_recognizers().recognize(utterance)
+    except NoSpeech:
+        return ("unknown", None)
+    if span is not None:
+        span.set(backend=backend)
+    return ("text", text.lower())
+
+def recognizer_action(command_lower):
+    """'recognizer offline|online|auto' switches backends; anything else reports their health."""
+    selector = speech_recognizers()
+    words = set(command_lower.split())
+    if words & {"offline", "local", "sphinx"}:
+        selector.force("sphinx")
+        return "Using offline speech recognition."
+    if words & {"online", "google"}:
+        selector.force("google")
+        return "Using Google speech recognition."
+    if words & {"auto", "automatic"}:
+        selector.force(None)
+        return "Choosing the speech recognizer automatically."
+    parts = []
+    for name, s in selector.stats().items():
+        latency = f", {s['latency_ms']} milliseconds" if s["latency_ms"] is not None else ""
+        forced = ", pinned" if s["forced"] else ""
+        parts.append(f"{name} is {s['state']}{forced}, {s['calls']} calls, {s['failures']} failed{latency}")
+    return "; ".join(parts) + "."
+
+def apply_power_tier(tier, app):
+    """
+    Applies a power tier (see power.py): animation rate on the Tk thread,
+    telemetry interval, and how often the microphone loop wakes up and
+    runs the VAD. A capture started later picks the tier up from power_tier.
+    """
+    global power_tier
+    power_tier = tier
+    app.bridge.call(app.frames.set_fps, tier.fps)
+    telemetry_sampler().set_interval(tier.telemetry_interval)
+    pipeline = speech_pipeline
+    if pipeline is not None:
+        pipeline.capture.source.batch = tier.listen_batch
+        pipeline.capture.vad_stride = tier.vad_stride
+
+def power_action(command_lower):
+    """'power mode performance|balanced|saver|sleep|auto' pins a tier; anything else reports the governor."""
+    governor = power_governor
+    if governor is None:
+        return "Power modes are only managed while the window is open."
+    words = set(command_lower.split())
+    for name in governor.order:
+        if name in words:
+            governor.force(name)
+            return f"Power mode set to {name}."
+    if words & {"auto", "automatic"}:
+        governor.force(None)
+        return "Choosing the power mode automatically."
+    s = governor.stats()
+    tier = governor.tier
+    pinned = "pinned" if s["forced"] else s["reason"]
+    return (f"Power mode is {s['tier']} ({pinned}): {tier.fps} frames per second, telemetry every "
+            f"{tier.telemetry_interval:g} seconds, microphone read {tier.listen_batch} frames at a time. "
+            f"Idle for {s['idle_sec'] // 60} minutes, {s['changes']} changes so far.")
+
+def listen_command(log_callback, indicator, on_exit=None):
+    """
+    Continuously listens via microphone and processes recognized speech.
+    Responds to "Orion start", "Orion stop", and "Orion exit" commands;
+    "Orion exit" calls on_exit() (default: shutdown()).
+    Capture, recognition and execution run as separate stages with bounded
+    queues (see speech_pipeline.py), so the microphone keeps listening while
+    a command or the AI is still working.
+    """
+    global speech_pipeline
+
+    # Speech is played asynchronously; don't record Orion's own voice.
+    capture = AudioCapture(MicrophoneSource(microphone(), batch=power_tier.listen_batch),
+                           mute=lambda: not speech_worker.idle.is_set(), vad_stride=power_tier.vad_stride)
+    shown = [None]
+
+    def show_state():
+        if shown[0] == LISTENING_ACTIVE:
+            return
+        shown[0] = LISTENING_ACTIVE
+        if LISTENING_ACTIVE:
+            log_callback("🎧 Listening (Orion active)...")
+            indicator.start_animation()
+        else:
+            log_callback(f"🟡 Say '{WAKE_WORD.title()}' or 'Orion start' to activate listening.")
+            indicator.stop_animation()
+
+    def recognize(utterance):
+        # Each utterance starts a trace that follows it into execution.
+        trace_id = tracer.new_trace()
+        tracer.record("capture", utterance.started, utterance.ended, trace_id,
+                      audio_ms=round(utterance.duration * 1000))
+        tracer.record("recognize_wait", utterance.ended, time.time(), trace_id)
+        try:
+            with tracer.activate(trace_id), tracer.span("recognize") as span:
+                result = recognize_utterance(utterance, span)
+        except Exception as e:
+            log_callback(f"Recognition error: {e}")
+            return None
+        return result and result + (trace_id,)
+
+    def execute(result):
+        kind, command, trace_id = result
+        with tracer.activate(trace_id):
+            handle(kind, command)
+
+    def handle(kind, command):
+        global LISTENING_ACTIVE, EXIT_REQUESTED
+        if EXIT_REQUESTED:
+            return
+        if kind != "unknown" and power_governor is not None:
+            power_governor.touch()
+
+        if kind == "wake":
+            if not LISTENING_ACTIVE:
+                LISTENING_ACTIVE = True
+                speak("Listening activated.", PRIORITY_CHATTER)
+                log_callback("🟢 Orion is now active.")
+
+        elif kind == "unknown":
+            if LISTENING_ACTIVE:
+                speak("Sorry, I didn’t catch that.", PRIORITY_CHATTER)
+
+        else:
+            started = time.time()
+            log_callback(f"You: {command}")
+
+            if "orion start" in command:
+                LISTENING_ACTIVE = True
+                speak("Listening activated.", PRIORITY_CHATTER)
+                log_callback("🟢 Orion is now active.")
+
+            elif "orion stop" in command:
+                LISTENING_ACTIVE = False
+                speak("Listening paused.", PRIORITY_CHATTER)
+                log_callback("🔴 Orion stopped listening.")
+
+            elif "orion exit" in command or "orion close" in command:
+                speak("Goodbye.", wait=True)
+                log_callback("⚪ Orion is shutting down...")
+                EXIT_REQUESTED = True
+                pipeline.stop()
+                indicator.stop_animation()
+                (on_exit or shutdown)()
+                return
+
+            elif LISTENING_ACTIVE:
+                try:
+                    processCommand(command, log_callback, started)
+                except Exception as e:
+                    log_callback(f"Command error: {e}")
+        show_state()
+
+    pipeline = SpeechPipeline(capture, recognize, execute, recognizers=RECOGNITION_WORKERS)
+    speech_pipeline = pipeline
+    show_state()
+    pipeline.run()
+
+def continuous_listen(app):
+    """Continuously listen for commands in the background."""
+    while not EXIT_REQUESTED:
+        try:
+            listen_command(app.log, app.indicator, on_exit=lambda: app.bridge.call(app.on_closing))
+        except Exception as e:
+            app.log(f"Error in listening loop: {e}")
+            time.sleep(2)
+
+
+def run_headless(lines, out=sys.stdout):
+    """
+    Runs each non-empty line through processCommand without audio or GUI and
+    writes one JSON object per command: the intent it resolved to, the
+    response, everything Orion would have said or logged, the desktop
+    actions it took (or, with DRY_RUN, would have taken) and the elapsed time.
+    """
+    global SPEECH_SINK, ACTION_SINK
+    reminder_scheduler.start(core.start())
+    for line in lines:
+        command = line.strip()
+        if not command or command.startswith("#"):
+            continue
+        spoken, logged, actions = [], [], []
+        SPEECH_SINK, ACTION_SINK = spoken.append, actions.append
+        _session.intent = None
+        started = time.perf_counter()
+        try:
+            response, error = processCommand(command, logged.append), None
+        except Exception as e:
+            response, error = None, str(e)
+        record = {
+            "command": command,
+            "intent": _session.intent,
+            "response": response,
+            "spoken": spoken,
+            "log": logged,
+            "actions": [{"action": action, "target": target} for action, target in actions],
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        if error is not None:
+            record["error"] = error
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+    SPEECH_SINK = ACTION_SINK = None
+
+def serve_command(session, command, emit):
+    """
+    Runs one command for a command server client (see command_server.py).
+    Each session keeps its own conversation memory, and a newer command
+    only supersedes that session's earlier ones. Log lines and speech go
+    to the client as "log" and "say" events.
+    """
+    memory = session.state.get("conversation")
+    if memory is None:
+        memory = session.state["conversation"] = ConversationMemory(
+            None,
+            window_tokens=CONVERSATION_WINDOW_TOKENS,
+            summary_tokens=CONVERSATION_SUMMARY_TOKENS,
+            summarize=lambda previous, turns, budget: summarize_conversation(previous, turns, budget, session.id),
+        )
+    _session.id, _session.conversation = session.id, memory
+    _session.sink = lambda text: emit({"type": "say", "text": text})
+    try:
+        return processCommand(command, lambda message: emit({"type": "log", "text": message}))
+    finally:
+        _session.id = _session.conversation = _session.sink = None
+
+def end_server_session(session):
+    """Called by the command server when a session expires or the server stops."""
+    with _command_lock:
+        _latest_commands.pop(session.id, None)
+    ai_pool.cancel_pending(owner=session.id)
+    ai_pool.cancel_pending(owner=("summary", session.id))
+    memory = session.state.pop("conversation", None)
+    if memory is not None:
+        memory.close()
+
+def run_server(port=SERVER_PORT):
+    """
+    Server mode: no GUI or microphone; commands arrive over local HTTP and
+    WebSocket (see command_server.py) and run on SERVER_WORKERS threads.
+    Clients authenticate with SERVER_TOKEN, or with the token generated at
+    startup when it is unset, which is written to DATA_DIR/server.token.
+    Runs until Ctrl+C.
+    """
+    global SPEECH_SINK
+    from command_server import CommandServer
+    SPEECH_SINK = lambda text: print(f"Orion: {text}", flush=True)   # reminders, with no client to send them to
+    loop = core.start()
+    reminder_scheduler.start(loop)
+    server = CommandServer(serve_command, port=port, workers=SERVER_WORKERS, token=SERVER_TOKEN,
+                           on_session_end=end_server_session)
+    core.submit(server.start()).result()
+    token_path = os.path.join(DATA_DIR, "server.token")
+    if SERVER_TOKEN is None:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(server.token)
+    print(f"Orion is serving commands on http://127.0.0.1:{server.port} (POST /command, GET /ws)", flush=True)
+    if SERVER_TOKEN is None:
+        print(f"Send 'Authorization: Bearer <token>' with the token in {token_path}", flush=True)
+    try:
+        while not EXIT_REQUESTED:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    try:
+        core.submit(server.stop()).result(5)
+    except Exception as e:
+        print("Server stop error:", e)
+    shutdown()
+
+def pipeline_gauges():
+    if speech_pipeline is None:
+        return []
+    m = speech_pipeline.metrics()
+    return [({"stage": stage}, m[stage]["depth"]) for stage in ("recognize", "execute")]
+
+def recognizer_gauges():
+    selector = _clients.get("recognizers")
+    if selector is None:
+        return []
+    return [({"backend": name}, s["latency_ms"] / 1000) for name, s in selector.stats().items()
+            if s["latency_ms"] is not None]
+
+def cache_hit_rate_gauges():
+    return [({}, round(response_cache.stats()["hit_rate"], 4))]
+
+def cache_saved_counter():
+    return [({}, round(response_cache.stats()["saved_seconds"], 3))]
+
+def cache_entry_gauges():
+    s = response_cache.stats()
+    return [({"tier": "memory"}, s["memory_entries"])] + (
+        [({"tier": "disk"}, s["disk_entries"])] if "disk_entries" in s else [])
+
+def frame_fps_gauges():
+    if frame_scheduler is None:
+        return []
+    s = frame_scheduler.stats()
+    return [({"kind": "measured"}, round(s["fps"], 2)), ({"kind": "target"}, s["target_fps"])]
+
+def frame_time_gauges():
+    if frame_scheduler is None:
+        return []
+    s = frame_scheduler.stats()
+    return [({"stat": "avg"}, round(s["frame_ms_avg"] / 1000, 6)), ({"stat": "max"}, round(s["frame_ms_max"] / 1000, 6))]
+
+def frames_skipped_counter():
+    if frame_scheduler is None:
+        return []
+    return [({}, frame_scheduler.skipped)]
+
+def shutdown():
+    """
+    Stops the background services and exits. Uses os._exit because model,
+    TTS and microphone calls may still be blocked in worker threads.
+    """
+    global EXIT_REQUESTED
+    EXIT_REQUESTED = True
+    reminder_scheduler.stop()
+    clipboard_history.stop()
+    if power_governor is not None:
+        power_governor.stop()
+    text_search.stop()
+    ai_pool.shutdown()
+    response_cache.close()
+    transcript.close()
+    core.stop()
+    conversation.close()
+    tracer.close()
+    os._exit(0)
+
+def run_gui():
+    global power_governor, frame_scheduler
+    from gui import ORIONApp, start_clock
+    if METRICS_PORT:
+        tracer.add_gauge("orion_pipeline_queue_depth", "Items waiting in each voice pipeline stage.", pipeline_gauges)
+        tracer.add_gauge("orion_recognizer_latency_seconds", "Smoothed recognition latency per backend.", recognizer_gauges)
+        tracer.add_gauge("orion_response_cache_hit_rate", "Share of AI cache lookups answered from the cache.",
+                         cache_hit_rate_gauges)
+        tracer.add_gauge("orion_response_cache_saved_seconds_total", "Model time saved by AI cache hits.",
+                         cache_saved_counter, kind="counter")
+        tracer.add_gauge("orion_response_cache_entries", "AI answers held in each cache tier.", cache_entry_gauges)
+        tracer.add_gauge("orion_gui_fps", "GUI animation frames drawn per second over the last 2 s, and the target.",
+                         frame_fps_gauges)
+        tracer.add_gauge("orion_gui_frame_seconds", "Work per GUI animation frame over the last 120 frames.",
+                         frame_time_gauges)
+        tracer.add_gauge("orion_gui_frames_skipped_total", "GUI animation frames dropped under load.",
+                         frames_skipped_counter, kind="counter")
+        tracer.serve(METRICS_PORT)
+    speak("Initializing Orion interface. Say 'Orion start' to begin.", PRIORITY_CHATTER)
+    file_index.start_background_refresh(FILE_INDEX_REFRESH_SEC)
+    loop = core.start()
+    reminder_scheduler.start(loop)
+    location_provider().start(loop)
+    clipboard_history.start(loop)
+    transcript.start()
+    app = ORIONApp(submit_command, telemetry_sampler(), get_real_location,
+                   geometry=WINDOW_SIZE, fps=ANIMATION_FPS, transcript=transcript, log_lines=GUI_LOG_LINES)
+    frame_scheduler = app.frames
+    start_clock(app)
+    power_governor = PowerGovernor(telemetry_sampler(), on_change=lambda tier: apply_power_tier(tier, app),
+                                   interval=POWER_CHECK_SEC)
+    if POWER_MODE != "auto" and not power_governor.force(POWER_MODE):
+        print("Unknown power mode:", POWER_MODE)
+    power_governor.start(loop)
+    threading.Thread(target=continuous_listen, args=(app,), daemon=True).start()
+    app.mainloop()
+    shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="O.R.I.O.N voice assistant")
+    parser.add_argument("--headless", action="store_true",
+                        help="run commands from stdin (or --commands) and print JSON lines")
+    parser.add_argument("--commands", metavar="FILE",
+                        help="file with one command per line (implies --headless)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report desktop actions (browser, apps, files, shutdown, lock) instead of running them")
+    parser.add_argument("--serve", metavar="PORT", type=int, nargs="?", const=SERVER_PORT,
+                        help=f"serve commands over local HTTP and WebSocket (default port {SERVER_PORT})")
+    args = parser.parse_args()
+    DRY_RUN = DRY_RUN or args.dry_run
+    if args.serve is not None:
+        run_server(args.serve)
+    elif args.commands:
+        with open(args.commands, "r", encoding="utf-8") as f:
+            run_headless(f)
+    elif args.headless:
+        run_headless(sys.stdin)
+    else:
+        run_gui()
@@ -1,55 +0,0 @@
-music = {
-    "finding":"https://www.youtube.com/watch?v=3Cp2QTBZAFQ",
-    "Hiriye":"https://www.youtube.com/watch?v=RLzC55ai0eo&pp=ygUGaGlyaXll",
-    "satranga":"https://www.youtube.com/watch?v=HrnrqYxYrbk&pp=ygUIc2F0cmFuZ2E%3D",
-    "Kesariya": "https://www.youtube.com/watch?v=2CpxBqugf0s",
-    "Do Patti": "https://www.youtube.com/watch?v=RLzC55ai0eo",
-    "Dil Dil Dil": "https://www.youtube.com/watch?v=HrnrqYxYrbk",
-    "Aaj Ki Raat": "https://www.youtube.com/watch?v=2CpxBqugf0s",
-    "Chaleya": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Naiyo Lagda": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Ghungroo": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Gulabi Sadi": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "We Rollin": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Satisfya": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "That Girl": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Besos": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Fire in Delhi": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Chaand Tu": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Fakeer Ki Zubaani": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Thamma": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Dilbar Ki Aankhon Ka": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Aaja Meri Gadi Mein": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Madhaniya": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Tere Vaste": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Kaavaalaa": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Lukka Chuppi": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "O Ashiqaana": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Ankhiyon Ke Jharokhon Se": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "O Mere Dil Ke Chain": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Kehna Hi Kya": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Lag Ja Gale": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Choo Lo": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Tere Bina Zindagi Se": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Tere Bina": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Tum Tak": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Rang De Basanti": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "O Re Piya": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Agar Tum Saath Ho": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Raabta": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Pehla Nasha": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Tum Hi Ho": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Tum Jo Aaye": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Jeene Laga Hoon": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Tum Jo Aaye": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Tum Se Hi": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Sun Saathiya": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Janam Janam": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Raabta": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Tum Jo Aaye": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Jeene Laga Hoon": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Tum Se Hi": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Sun Saathiya": "https://www.youtube.com/watch?v=GAqoXt5KX9k",
-    "Janam Janam": "https://www.youtube.com/watch?v=GAqoXt5KX9k"
-
-}
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Fuzzy music catalog lookup for the "play" skill.
+
+Tracks are loaded from a JSON file (a list of {"title", "url"} objects or
+a {title: url} mapping) or a SQLite database with a `tracks(title, url)`
+table. Titles are normalized (case, accents, punctuation) and indexed by
+character trigrams, so "play tum hi ho", "play Kesariya" and small typos
+like "play kesarya" all resolve. A lookup only scores tracks that share
+the query's rarest trigrams, which keeps it fast on 100k+ track catalogs.
+
+A query that is a whole word or phrase of a title only counts as a strong
+match when it covers at least half of the title's words ("satranga" for
+"Satranga (Lofi)", not "hi" for "Kehna Hi Kya"), and best() gives up when
+the runner-up scores within MIN_MARGIN of the winner, so a common word
+does not play an arbitrary one of many tracks.
+"""
+import os
+import json
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter
+
+MIN_SCORE = 0.45
+MIN_MARGIN = 0.05    # best() needs this lead over the runner-up, short of an exact title
+CONTAINED_SCORE = 0.8
+MIN_COVERAGE = 0.5   # share of a title's words a contained query must cover for CONTAINED_SCORE
+MAX_POSTINGS = 12   # rarest query trigrams used to collect candidates
+CANDIDATES = 100    # tracks sharing the most of those trigrams that are scored
+
+
+def normalize_title(text):
+    text = unicodedata.normalize("NFKD", text.lower())
+    kept = []
+    for ch in text:
+        if unicodedata.combining(ch):
+            continue
+        kept.append(ch if ch.isalnum() else " ")
+    return " ".join("".join(kept).split())
+
+
+def _trigrams(norm):
+    padded = f" {norm} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class MusicIndex:
+    def __init__(self, path=None):
+        self.path = path
+        self.titles = []      # track id -> display title
+        self.urls = []        # track id -> url
+        self.norms = []       # track id -> normalized title
+        self.gram_counts = [] # track id -> number of trigrams
+        self.by_norm = {}     # normalized title -> track id
+        self.grams = {}       # trigram -> list of track ids
+        self.duplicates = []
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.titles)
+
+    def ensure_loaded(self):
+        with self.lock:
+            if not self.loaded:
+                self.loaded = True
+                if self.path and os.path.exists(self.path):
+                    try:
+                        self.load(self.path)
+                    except Exception as e:
+                        print("Music catalog load error:", e)
+
+    def load(self, path):
+        if path.endswith((".db", ".sqlite", ".sqlite3")):
+            con = sqlite3.connect(path)
+            try:
+                rows = con.execute("SELECT title, url FROM tracks").fetchall()
+            finally:
+                con.close()
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                rows = list(data.items())
+            else:
+                rows = [(t["title"], t["url"]) for t in data]
+        for title, url in rows:
+            self.add(title, url)
+        if self.duplicates:
+            print(f"Music catalog: skipped {len(self.duplicates)} duplicate titles")
+
+    def add(self, title, url):
+        norm = normalize_title(title)
+        if not norm:
+            return None
+        if norm in self.by_norm:
+            self.duplicates.append(title)
+            return self.by_norm[norm]
+        tid = len(self.titles)
+        self.titles.append(title)
+        self.urls.append(url)
+        self.norms.append(norm)
+        grams = set(_trigrams(norm))
+        self.gram_counts.append(len(grams))
+        self.by_norm[norm] = tid
+        for g in grams:
+            self.grams.setdefault(g, []).append(tid)
+        return tid
+
+    def search(self, query, limit=5):
+        """Returns [(score, title, url)] best first; score 1.0 is an exact title match."""
+        self.ensure_loaded()
+        norm = normalize_title(query)
+        if not norm:
+            return []
+        exact = self.by_norm.get(norm)
+        if exact is not None:
+            return [(1.0, self.titles[exact], self.urls[exact])]
+        qgrams = set(_trigrams(norm))
+        postings = sorted((self.grams[g] for g in qgrams if g in self.grams), key=len)
+        shared = Counter()
+        for ids in postings[:MAX_POSTINGS]:
+            shared.update(ids)
+        scored = []
+        for tid, _ in shared.most_common(max(CANDIDATES, limit)):
+            tgrams = set(_trigrams(self.norms[tid]))
+            common = len(qgrams & tgrams)
+            score = 2.0 * common / (len(qgrams) + self.gram_counts[tid])
+            title = self.norms[tid]
+            if (f" {norm} " in f" {title} "
+                    and len(norm.split()) >= MIN_COVERAGE * len(title.split())):
+                # Whole-word containment ("play satranga" vs "Satranga (Lofi)").
+                score = max(score, CONTAINED_SCORE)
+            scored.append((score, self.titles[tid], self.urls[tid]))
+        scored.sort(key=lambda x: -x[0])
+        return scored[:limit]
+
+    def best(self, query, min_score=MIN_SCORE):
+        """(title, url) of the best match above min_score and clear of the runner-up, or None."""
+        results = self.search(query, limit=2)
+        if not results or results[0][0] < min_score:
+            return None
+        if len(results) > 1 and results[0][0] < 1.0 and results[0][0] - results[1][0] < MIN_MARGIN:
+            return None
+        return results[0][1], results[0][2]
@@ -0,0 +1,239 @@
+"""
+Power governor: moves Orion between performance tiers.
+
+A tier sets what Orion spends on the things that run all the time (TIERS):
+
+    tier          animation FPS   telemetry every   mic frames per read   VAD on every
+    performance        50               2 s                  1              frame
+    balanced           30               4 s                  2              frame
+    saver              15              10 s                  4              2nd frame
+    sleep               5              30 s                  8              4th frame
+
+Reading the microphone several frames at a time wakes the capture thread
+that many times less often, at the cost of noticing the end of a phrase up
+to that many frames later; while no phrase is in progress the VAD then
+looks at every n-th frame only (the pre-roll still keeps them all).
+
+The governor reads what TelemetrySampler already collects (power_plugged,
+battery percent, system and Orion CPU) plus how long the user has been
+idle: the time since the last keyboard or mouse input where the OS reports
+it (Windows), and the time since the last command (touch()), whichever is
+shorter. Each condition asks for a tier and the cheapest one wins:
+
+    on battery                        -> saver
+    battery below low_battery         -> sleep
+    other programs above busy_cpu     -> saver
+    idle for idle_after (5 min)       -> balanced
+    idle for sleep_after (30 min)     -> sleep
+
+A move to a cheaper tier happens once it has been asked for `hold` seconds
+in a row, so a short load spike does not flap the settings; a move back up
+happens at the next check (the charger goes in) or straight away on a
+command (touch()).
+"""
+import time
+import asyncio
+import threading
+
+
+class PowerTier:
+    __slots__ = ("name", "fps", "telemetry_interval", "listen_batch", "vad_stride")
+
+    def __init__(self, name, fps, telemetry_interval, listen_batch, vad_stride):
+        self.name = name
+        self.fps = fps
+        self.telemetry_interval = telemetry_interval
+        self.listen_batch = listen_batch
+        self.vad_stride = vad_stride
+
+    def __repr__(self):
+        return f"PowerTier({self.name})"
+
+
+# Most expensive first.
+TIERS = (
+    PowerTier("performance", fps=50, telemetry_interval=2.0, listen_batch=1, vad_stride=1),
+    PowerTier("balanced", fps=30, telemetry_interval=4.0, listen_batch=2, vad_stride=1),
+    PowerTier("saver", fps=15, telemetry_interval=10.0, listen_batch=4, vad_stride=2),
+    PowerTier("sleep", fps=5, telemetry_interval=30.0, listen_batch=8, vad_stride=4),
+)
+
+
+def windows_input_idle():
+    """A function returning seconds since the last keyboard/mouse input (GetLastInputInfo) on Windows, else None."""
+    try:
+        import ctypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+        user32, kernel32 = ctypes.windll.user32, ctypes.windll.kernel32
+    except Exception:
+        return None
+    kernel32.GetTickCount.restype = ctypes.c_uint
+    info = LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(info)
+
+    def idle():
+        if not user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        return ((kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+    return idle
+
+
+class PowerGovernor:
+    """
+    governor = PowerGovernor(telemetry, on_change=apply_tier)
+    governor.start(loop)            # checks every `interval` seconds
+    governor.touch()                # on every command: the user is here
+    governor.force("saver")         # pins a tier; None = automatic
+    on_change(tier) runs on the governor's thread or loop whenever the tier changes.
+    """
+    def __init__(self, telemetry, on_change, tiers=TIERS, interval=5.0, hold=30.0, idle_after=300.0,
+                 sleep_after=1800.0, busy_cpu=85.0, low_battery=20.0, input_idle=None, clock=time.monotonic):
+        self.telemetry = telemetry
+        self.on_change = on_change
+        self.tiers = {t.name: t for t in tiers}
+        self.order = [t.name for t in tiers]
+        self.interval = interval
+        self.hold = hold
+        self.idle_after = idle_after
+        self.sleep_after = sleep_after
+        self.busy_cpu = busy_cpu
+        self.low_battery = low_battery
+        self.input_idle = input_idle if input_idle is not None else windows_input_idle()
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.tier = tiers[0]
+        self.reason = "start"
+        self.forced = None
+        self.last_activity = clock()
+        self.changes = 0
+        self._wanted = None          # (tier name, since) of a pending move down
+        self._entered = clock()
+        self.time_in = {t.name: 0.0 for t in tiers}
+        self._thread = None
+        self._task = None
+        self._stopped = False
+
+    def touch(self):
+        """Marks user activity and leaves an idle tier straight away."""
+        self.last_activity = self.clock()
+        if self.tier.name != self.order[0] and self.forced is None:
+            self.evaluate()
+
+    def force(self, name):
+        """Pins tier `name` (None for automatic choice). Returns False for an unknown name."""
+        if name is not None and name not in self.tiers:
+            return False
+        self.forced = name
+        self.evaluate()
+        return True
+
+    # ---- decision ----
+    def idle_seconds(self):
+        idle = self.clock() - self.last_activity
+        if self.input_idle is not None:
+            try:
+                os_idle = self.input_idle()
+            except Exception:
+                os_idle = None
+            if os_idle is not None:
+                idle = min(idle, os_idle)
+        return idle
+
+    def other_cpu(self):
+        """System CPU percent not used by Orion, averaged over the last three samples."""
+        series = self.telemetry.series
+        cpu = series["cpu"].values()[-3:]
+        own = series["proc_cpu"].values()[-3:]
+        if not cpu:
+            return 0.0
+        cores = max(1, len(self.telemetry.cores))
+        own_share = sum(own) / len(own) / cores if own else 0.0
+        return max(0.0, sum(cpu) / len(cpu) - own_share)
+
+    def wanted(self):
+        """(tier name, reason) the current conditions ask for."""
+        if self.forced is not None:
+            return self.forced, "pinned"
+        latest = self.telemetry.latest
+        battery = self.telemetry.series["battery"]
+        idle = self.idle_seconds()
+        asks = [("performance", "active")]
+        if not latest.get("power_plugged", True):
+            asks.append(("saver", "on battery"))
+            if len(battery) and battery.latest() < self.low_battery:
+                asks.append(("sleep", "battery low"))
+        if self.other_cpu() >= self.busy_cpu:
+            asks.append(("saver", "system busy"))
+        if idle >= self.sleep_after:
+            asks.append(("sleep", "idle"))
+        elif idle >= self.idle_after:
+            asks.append(("balanced", "idle"))
+        return max(asks, key=lambda ask: self.order.index(ask[0]))
+
+    def evaluate(self):
+        """Checks the conditions and changes tier if due. Returns the current tier."""
+        name, reason = self.wanted()
+        now = self.clock()
+        with self.lock:
+            current = self.tier.name
+            if name == current:
+                self._wanted = None
+                self.reason = reason
+                return self.tier
+            if self.order.index(name) > self.order.index(current) and self.forced is None:
+                # Cheaper: only once it has been asked for `hold` seconds in a row.
+                if self._wanted is None or self._wanted[0] != name:
+                    self._wanted = (name, now)
+                if now - self._wanted[1] < self.hold:
+                    return self.tier
+            self._wanted = None
+            self.time_in[current] += now - self._entered
+            self._entered = now
+            self.tier = self.tiers[name]
+            self.reason = reason
+            self.changes += 1
+            tier = self.tier
+        try:
+            self.on_change(tier)
+        except Exception as e:
+            print("Power tier change error:", e)
+        return tier
+
+    # ---- loop ----
+    def start(self, loop=None):
+        """Checks every `interval` seconds: as a task on `loop` if given, else on a thread."""
+        if self._thread is not None or self._task is not None:
+            return
+        if loop is not None:
+            self._task = asyncio.run_coroutine_threadsafe(self._run_async(), loop)
+        else:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+
+    def _run(self):
+        while not self._stopped:
+            self.evaluate()
+            time.sleep(self.interval)
+
+    async def _run_async(self):
+        while not self._stopped:
+            self.evaluate()
+            await asyncio.sleep(self.interval)
+
+    def stats(self):
+        now = self.clock()
+        with self.lock:
+            time_in = dict(self.time_in)
+            time_in[self.tier.name] += now - self._entered
+            return {"tier": self.tier.name, "reason": self.reason, "forced": self.forced,
+                    "changes": self.changes, "idle_sec": round(self.idle_seconds()),
+                    "time_in": {name: round(sec) for name, sec in time_in.items()}}
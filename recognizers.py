@@ -0,0 +1,245 @@
+"""
+Speech recognizer backends and the selector that picks one per utterance.
+
+A backend turns an Utterance (see audio_capture.py) into text. It raises
+NoSpeech when it heard nothing it could transcribe, and any other
+exception when it could not do its job (no network, quota, crash).
+GoogleBackend sends the audio to the Google Web Speech API through
+speech_recognition; PocketSphinxBackend decodes it locally on the CPU and
+keeps working offline, at lower accuracy.
+
+RecognizerSelector tries the backends in preference order (most accurate
+first) and keeps per-backend health:
+
+* a failure takes the backend out of rotation for a backoff that doubles
+  with every consecutive failure (5 s up to 2 min); the utterance goes to
+  the next backend straight away, so an outage costs one failed call, not
+  one per utterance. Once the backoff has passed the backend is tried
+  again, and one success puts it back in rotation.
+* an exponentially weighted latency above max_latency demotes a backend
+  behind the faster ones; it is given another chance every retry_slow
+  seconds so it can recover once the network does.
+* force(name) pins a backend (the others remain fallbacks); force(None)
+  returns to automatic choice.
+"""
+import time
+import threading
+
+from audio_capture import pcm16_mono
+
+
+class NoSpeech(Exception):
+    """The backend worked but found no words in the audio."""
+
+
+class RecognitionUnavailable(Exception):
+    """Every backend failed for this utterance."""
+
+
+class GoogleBackend:
+    name = "google"
+    local = False
+
+    def __init__(self, recognizer, timeout=5.0):
+        """recognizer() returns the shared speech_recognition.Recognizer."""
+        self.recognizer = recognizer
+        self.timeout = timeout
+
+    @property
+    def available(self):
+        try:
+            import speech_recognition  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def recognize(self, utterance):
+        import speech_recognition as sr
+        r = self.recognizer()
+        if getattr(r, "operation_timeout", None) is None:
+            r.operation_timeout = self.timeout
+        audio = sr.AudioData(utterance.pcm, utterance.sample_rate, utterance.sample_width)
+        try:
+            return r.recognize_google(audio)
+        except sr.UnknownValueError:
+            raise NoSpeech() from None
+
+
+class PocketSphinxBackend:
+    """
+    Offline recognition with pocketsphinx's bundled US English model.
+    The decoder is created on first use and shared behind a lock.
+    """
+    name = "sphinx"
+    local = True
+    SAMPLE_RATE = 16000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.decoder = None
+        self.error = None
+
+    @property
+    def available(self):
+        return self._decoder() is not None
+
+    def _decoder(self):
+        if self.decoder is None and self.error is None:
+            with self.lock:
+                if self.decoder is None and self.error is None:
+                    try:
+                        from pocketsphinx import Decoder
+                        self.decoder = Decoder(samprate=self.SAMPLE_RATE, loglevel="FATAL")
+                    except Exception as e:
+                        self.error = e
+                        print("Offline recognizer unavailable:", e)
+        return self.decoder
+
+    def recognize(self, utterance):
+        decoder = self._decoder()
+        if decoder is None:
+            raise RuntimeError(f"pocketsphinx unavailable: {self.error}")
+        pcm = pcm16_mono(utterance, self.SAMPLE_RATE)
+        with self.lock:
+            decoder.start_utt()
+            decoder.process_raw(pcm, full_utt=True)
+            decoder.end_utt()
+            hyp = decoder.hyp()
+        text = hyp.hypstr.strip() if hyp is not None else ""
+        if not text:
+            raise NoSpeech()
+        return text
+
+
+class BackendHealth:
+    __slots__ = ("latency", "calls", "failures", "consecutive", "down_until", "slow_until", "last_error")
+
+    def __init__(self):
+        self.latency = None        # EWMA, seconds
+        self.calls = 0
+        self.failures = 0
+        self.consecutive = 0
+        self.down_until = 0.0
+        self.slow_until = 0.0
+        self.last_error = None
+
+
+class RecognizerSelector:
+    """
+    selector = RecognizerSelector([GoogleBackend(recognizer), PocketSphinxBackend()])
+    text, name = selector.recognize(utterance)   # raises NoSpeech / RecognitionUnavailable
+    selector.force("sphinx")                     # None = automatic
+    """
+    def __init__(self, backends, max_latency=2.5, backoff=5.0, max_backoff=120.0, retry_slow=60.0,
+                 alpha=0.3, clock=time.perf_counter):
+        self.backends = list(backends)
+        self.max_latency = max_latency
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_slow = retry_slow
+        self.alpha = alpha
+        self.clock = clock
+        self.forced = None
+        self.lock = threading.Lock()
+        self.health = {b.name: BackendHealth() for b in self.backends}
+        self._available = {}
+
+    def backend(self, name):
+        return next((b for b in self.backends if b.name == name), None)
+
+    def force(self, name):
+        """Pins backend `name` (None for automatic choice). Returns False for an unknown name."""
+        if name is not None and self.backend(name) is None:
+            return False
+        with self.lock:
+            self.forced = name
+        return True
+
+    def _is_available(self, backend):
+        ok = self._available.get(backend.name)
+        if ok is None:
+            ok = self._available[backend.name] = backend.available
+        return ok
+
+    def order(self):
+        """Backends to try for the next utterance, best first."""
+        now = self.clock()
+        with self.lock:
+            ready, slow, down = [], [], []
+            for b in self.backends:
+                h = self.health[b.name]
+                if now < h.down_until:
+                    down.append(b)
+                elif now < h.slow_until:
+                    slow.append(b)
+                else:
+                    ready.append(b)
+            # Backends in backoff are a last resort, soonest back first.
+            down.sort(key=lambda b: self.health[b.name].down_until)
+            order = ready + slow + down
+            if self.forced is not None:
+                order.sort(key=lambda b: b.name != self.forced)
+        return [b for b in order if self._is_available(b)]
+
+    def recognize(self, utterance):
+        """(text, backend name) from the first backend that works."""
+        errors = []
+        for backend in self.order():
+            t0 = self.clock()
+            try:
+                text = backend.recognize(utterance)
+            except NoSpeech:
+                self._succeeded(backend, self.clock() - t0)
+                raise
+            except Exception as e:
+                self._failed(backend, e)
+                errors.append(f"{backend.name}: {e}")
+                continue
+            self._succeeded(backend, self.clock() - t0)
+            return text, backend.name
+        raise RecognitionUnavailable("; ".join(errors) or "no recognizer available")
+
+    def _succeeded(self, backend, seconds):
+        with self.lock:
+            h = self.health[backend.name]
+            h.calls += 1
+            h.consecutive = 0
+            h.down_until = 0.0
+            h.latency = seconds if h.latency is None else h.latency + self.alpha * (seconds - h.latency)
+            if h.latency > self.max_latency:
+                h.slow_until = self.clock() + self.retry_slow
+            else:
+                h.slow_until = 0.0
+
+    def _failed(self, backend, error):
+        with self.lock:
+            h = self.health[backend.name]
+            h.calls += 1
+            h.failures += 1
+            h.consecutive += 1
+            h.last_error = str(error)
+            delay = min(self.max_backoff, self.backoff * 2 ** (h.consecutive - 1))
+            h.down_until = self.clock() + delay
+
+    def stats(self):
+        """{name: {...}} with state "up", "slow", "down" or "unavailable"."""
+        now = self.clock()
+        with self.lock:
+            result = {}
+            for b in self.backends:
+                h = self.health[b.name]
+                if not self._available.get(b.name, True):
+                    state = "unavailable"
+                elif now < h.down_until:
+                    state = "down"
+                elif now < h.slow_until:
+                    state = "slow"
+                else:
+                    state = "up"
+                result[b.name] = {
+                    "state": state, "local": b.local, "forced": self.forced == b.name,
+                    "calls": h.calls, "failures": h.failures,
+                    "latency_ms": None if h.latency is None else round(h.latency * 1000),
+                    "last_error": h.last_error,
+                }
+            return result
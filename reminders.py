@@ -0,0 +1,287 @@
+"""
+Reminder scheduler: one timer over a heap of due times, either a thread
+or a call_later() handle on an asyncio loop (see core_loop.py).
+
+Every change (add, cancel, snooze, fire) is appended to a journal file, and
+the journal is replayed on start so pending reminders survive a restart.
+Reminders that fell due while Orion was closed fire right after start.
+"""
+import os
+import re
+import json
+import heapq
+import time
+import threading
+from datetime import datetime, timedelta
+
+UNITS = {
+    "s": 1, "sec": 1, "secs": 1, "second": 1, "seconds": 1,
+    "m": 60, "min": 60, "mins": 60, "minute": 60, "minutes": 60,
+    "h": 3600, "hr": 3600, "hrs": 3600, "hour": 3600, "hours": 3600,
+    "d": 86400, "day": 86400, "days": 86400,
+}
+RELATIVE_RE = re.compile(r"^in\s+(\d+(?:\.\d+)?)\s*([a-z]*)$")
+ABSOLUTE_RE = re.compile(r"^at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)?$")
+
+
+def parse_duration(text):
+    """'10 minutes' -> 600.0; a bare number means seconds. Returns None if unparsable."""
+    m = RELATIVE_RE.match("in " + text.strip().lower())
+    if not m:
+        return None
+    unit = m.group(2) or "seconds"
+    if unit not in UNITS:
+        return None
+    return float(m.group(1)) * UNITS[unit]
+
+
+def parse_when(text, now=None):
+    """
+    Turns 'in 10 minutes', 'in 30' (seconds) or 'at 17:30' / 'at 5 pm' into an
+    epoch timestamp. Absolute times already past today roll over to tomorrow.
+    Returns None if the phrase is not understood.
+    """
+    now = time.time() if now is None else now
+    text = text.strip().lower()
+    if text.startswith("in "):
+        delay = parse_duration(text[3:])
+        return None if delay is None else now + delay
+    m = ABSOLUTE_RE.match(text)
+    if not m:
+        return None
+    hour, minute = int(m.group(1)), int(m.group(2) or 0)
+    suffix = (m.group(3) or "").replace(".", "")
+    if suffix == "pm" and hour < 12:
+        hour += 12
+    elif suffix == "am" and hour == 12:
+        hour = 0
+    if hour > 23 or minute > 59:
+        return None
+    base = datetime.fromtimestamp(now)
+    due = base.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if due.timestamp() <= now:
+        due += timedelta(days=1)
+    return due.timestamp()
+
+
+def describe_delay(seconds):
+    """600 -> '10 minutes'; used in spoken confirmations."""
+    seconds = max(0, int(round(seconds)))
+    if seconds < 60:
+        return f"{seconds} seconds"
+    if seconds < 3600:
+        return f"{round(seconds / 60)} minutes"
+    return f"{seconds / 3600:.1f} hours"
+
+
+class Reminder:
+    __slots__ = ("id", "due", "text")
+
+    def __init__(self, rid, due, text):
+        self.id = rid
+        self.due = due
+        self.text = text
+
+
+class ReminderScheduler:
+    """
+    Holds pending reminders in a heap keyed by due time. A single daemon
+    thread, or with start(loop) a single timer handle on that loop, waits
+    for the earliest one and calls `on_fire(reminder)`.
+    Cancelled and snoozed entries are left in the heap and skipped lazily.
+    """
+    def __init__(self, journal_path=None, on_fire=None):
+        self.journal_path = journal_path
+        self.on_fire = on_fire
+        self.cond = threading.Condition()
+        self.heap = []        # (due, id)
+        self.pending = {}     # id -> Reminder
+        self.next_id = 1
+        self._journal = None
+        self._journal_lines = 0
+        self._thread = None
+        self._stopped = False
+        self.loop = None
+        self._timer = None    # loop mode: asyncio TimerHandle for the next wake-up
+
+    # ---- journal ----
+    def _replay(self):
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                self._journal_lines += 1
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                op, rid = rec.get("op"), rec.get("id")
+                if op == "add":
+                    self.pending[rid] = Reminder(rid, rec["due"], rec["text"])
+                    self.next_id = max(self.next_id, rid + 1)
+                elif op == "snooze" and rid in self.pending:
+                    self.pending[rid].due = rec["due"]
+                elif op in ("cancel", "fire"):
+                    self.pending.pop(rid, None)
+        self.heap = [(rem.due, rid) for rid, rem in self.pending.items()]
+        heapq.heapify(self.heap)
+
+    def _compact(self):
+        """Rewrites the journal with only the pending reminders."""
+        tmp = self.journal_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for rem in self.pending.values():
+                f.write(json.dumps({"op": "add", "id": rem.id, "due": rem.due, "text": rem.text}) + "\n")
+        os.replace(tmp, self.journal_path)
+        self._journal_lines = len(self.pending)
+
+    def _log(self, rec):
+        if self._journal is None:
+            return
+        self._journal.write(json.dumps(rec) + "\n")
+        self._journal.flush()
+        self._journal_lines += 1
+
+    # ---- lifecycle ----
+    def start(self, loop=None):
+        """
+        Replays the journal and starts the timer: a call_later() handle on
+        `loop` if given (callbacks then run on the loop), else a thread.
+        """
+        with self.cond:
+            if self._thread is not None or self.loop is not None:
+                return
+            if self.journal_path:
+                os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+                self._replay()
+                if self._journal_lines > 2 * len(self.pending) + 100:
+                    self._compact()
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+            if loop is not None:
+                self.loop = loop
+                loop.call_soon_threadsafe(self._arm)
+            else:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self.cond:
+            self._stopped = True
+            self.cond.notify()
+            if self.loop is not None and not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(self._disarm)
+            # Under the condition: add/cancel/snooze/fire write the journal while holding it.
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _run(self):
+        while True:
+            with self.cond:
+                rem = self._pop_due()
+                while rem is None:
+                    if self._stopped:
+                        return
+                    timeout = self.heap[0][0] - time.time() if self.heap else None
+                    self.cond.wait(timeout)
+                    rem = self._pop_due()
+            self._fire(rem)
+
+    def _arm(self):
+        """Loop mode: fires whatever is due and sets the timer for the next one. Runs on the loop."""
+        self._disarm()
+        fired = []
+        with self.cond:
+            if self._stopped:
+                return
+            rem = self._pop_due()
+            while rem is not None:
+                fired.append(rem)
+                rem = self._pop_due()
+            delay = self.heap[0][0] - time.time() if self.heap else None
+        for rem in fired:
+            self._fire(rem)
+        if delay is not None:
+            self._timer = self.loop.call_later(max(0.0, delay), self._arm)
+
+    def _disarm(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _fire(self, rem):
+        if self.on_fire is not None:
+            try:
+                self.on_fire(rem)
+            except Exception as e:
+                print("Reminder callback error:", e)
+
+    def _pop_due(self):
+        """Pops and returns the next reminder that is due, or None. Caller holds the lock."""
+        now = time.time()
+        while self.heap:
+            due, rid = self.heap[0]
+            rem = self.pending.get(rid)
+            if rem is None or rem.due != due:
+                heapq.heappop(self.heap)
+                continue
+            if due > now:
+                return None
+            heapq.heappop(self.heap)
+            del self.pending[rid]
+            self._log({"op": "fire", "id": rid})
+            return rem
+        return None
+
+    # ---- public API ----
+    def add(self, text, due):
+        with self.cond:
+            rem = Reminder(self.next_id, due, text)
+            self.next_id += 1
+            self.pending[rem.id] = rem
+            self._log({"op": "add", "id": rem.id, "due": due, "text": text})
+            self._push(rem)
+            return rem
+
+    def add_in(self, text, delay_sec):
+        return self.add(text, time.time() + delay_sec)
+
+    def cancel(self, rid):
+        """Returns the cancelled reminder, or None if there was no such reminder."""
+        with self.cond:
+            rem = self.pending.pop(rid, None)
+            if rem is not None:
+                self._log({"op": "cancel", "id": rid})
+            return rem
+
+    def snooze(self, rid, delay_sec):
+        """Pushes a pending reminder back by `delay_sec` from now."""
+        with self.cond:
+            rem = self.pending.get(rid)
+            if rem is None:
+                return None
+            rem.due = time.time() + delay_sec
+            self._log({"op": "snooze", "id": rid, "due": rem.due})
+            self._push(rem)
+            return rem
+
+    def list(self, limit=None):
+        """Pending reminders, earliest first."""
+        with self.cond:
+            if limit is None:
+                return sorted(self.pending.values(), key=lambda rem: rem.due)
+            return heapq.nsmallest(limit, self.pending.values(), key=lambda rem: rem.due)
+
+    def __len__(self):
+        return len(self.pending)
+
+    def _push(self, rem):
+        is_next = not self.heap or rem.due < self.heap[0][0]
+        heapq.heappush(self.heap, (rem.due, rem.id))
+        if len(self.heap) > 2 * len(self.pending) + 1000:
+            self.heap = [(r.due, r.id) for r in self.pending.values()]
+            heapq.heapify(self.heap)
+        if is_next:
+            self.cond.notify()
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self._arm)
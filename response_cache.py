@@ -0,0 +1,217 @@
+"""
+Two-tier cache for AI responses.
+
+Prompts are normalized (case, whitespace and punctuation folded) so "What
+can you do?" and "what can you do" share one entry. Lookups hit an
+in-memory LRU first and a SQLite table second; the SQLite tier expires
+entries after a TTL and evicts least-recently-used rows once it grows past
+its entry or byte limit. The row count and total size are kept in memory
+(read once at open, corrected on every insert, expiry and eviction), so a
+put does not scan the table to check the limits. Each entry remembers how long the model took to
+produce it, which is what a hit is counted as saving.
+"""
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    prompt TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    latency REAL NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access);
+CREATE INDEX IF NOT EXISTS responses_created ON responses(created);
+"""
+
+
+def normalize_prompt(prompt):
+    """'  What can you DO?? ' -> 'what can you do'"""
+    kept = [" " if unicodedata.category(ch)[0] in "PZC" else ch for ch in prompt.lower()]
+    return " ".join("".join(kept).split())
+
+
+class _Entry:
+    __slots__ = ("response", "created", "latency", "hits")
+
+    def __init__(self, response, created, latency, hits=0):
+        self.response = response
+        self.created = created
+        self.latency = latency
+        self.hits = hits
+
+
+class ResponseCache:
+    """
+    get(prompt) -> cached response or None; put(prompt, response, latency).
+    Safe to share between threads.
+    """
+    def __init__(self, path=None, memory_entries=256, ttl=24 * 3600,
+                 max_entries=5000, max_bytes=20 * 1024 * 1024):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()   # key -> _Entry
+        self.pending_hits = {}        # key -> hits not yet written to SQLite
+        self.stats_counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0,
+                               "saved_seconds": 0.0, "lookup_seconds": 0.0}
+        self.db = None
+        self.disk_entries = 0         # rows in SQLite, kept in step with every insert and delete
+        self.disk_bytes = 0
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(SCHEMA)
+            self.disk_entries, self.disk_bytes = self.db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    @staticmethod
+    def key_for(prompt):
+        return hashlib.sha1(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+
+    def get(self, prompt):
+        t0 = time.perf_counter()
+        key = self.key_for(prompt)
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and now - entry.created > self.ttl:
+                del self.memory[key]
+                entry = None
+            tier = "memory_hits"
+            if entry is None and self.db is not None:
+                entry = self._load(key, now)
+                tier = "disk_hits"
+            if entry is None:
+                self.stats_counters["misses"] += 1
+                self.stats_counters["lookup_seconds"] += time.perf_counter() - t0
+                return None
+            self.memory[key] = entry
+            self.memory.move_to_end(key)
+            self._trim_memory()
+            entry.hits += 1
+            self.pending_hits[key] = self.pending_hits.get(key, 0) + 1
+            if len(self.pending_hits) >= 32:
+                self._flush_hits()
+            self.stats_counters[tier] += 1
+            self.stats_counters["saved_seconds"] += entry.latency
+            self.stats_counters["lookup_seconds"] += time.perf_counter() - t0
+            return entry.response
+
+    def put(self, prompt, response, latency=0.0):
+        key = self.key_for(prompt)
+        now = time.time()
+        with self.lock:
+            self.memory[key] = _Entry(response, now, latency)
+            self.memory.move_to_end(key)
+            self._trim_memory()
+            if self.db is None:
+                return
+            size = len(response.encode("utf-8"))
+            old = self.db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (key, prompt, response, created, last_access, hits, latency, size) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+                (key, normalize_prompt(prompt), response, now, now, latency, size),
+            )
+            if old is None:
+                self.disk_entries += 1
+                self.disk_bytes += size
+            else:
+                self.disk_bytes += size - old[0]
+            self._flush_hits()
+            self._evict(now)
+
+    def _load(self, key, now):
+        row = self.db.execute(
+            "SELECT response, created, latency, hits, size FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if now - row[1] > self.ttl:
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.disk_entries -= 1
+            self.disk_bytes -= row[4]
+            return None
+        return _Entry(row[0], row[1], row[2], row[3])
+
+    def _trim_memory(self):
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _flush_hits(self):
+        if self.db is None or not self.pending_hits:
+            return
+        now = time.time()
+        self.db.executemany(
+            "UPDATE responses SET hits = hits + ?, last_access = ? WHERE key = ?",
+            [(n, now, key) for key, n in self.pending_hits.items()],
+        )
+        self.pending_hits.clear()
+
+    def _evict(self, now):
+        cutoff = now - self.ttl
+        expired, expired_bytes = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses WHERE created < ?", (cutoff,)).fetchone()
+        if expired:
+            self.db.execute("DELETE FROM responses WHERE created < ?", (cutoff,))
+            self.disk_entries -= expired
+            self.disk_bytes -= expired_bytes
+        if self.disk_entries <= self.max_entries and self.disk_bytes <= self.max_bytes:
+            return
+        excess_rows = max(0, self.disk_entries - self.max_entries)
+        freed = 0
+        victims = []
+        for key, row_size in self.db.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if len(victims) >= excess_rows and self.disk_bytes - freed <= self.max_bytes:
+                break
+            victims.append((key,))
+            freed += row_size
+        self.db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.disk_entries -= len(victims)
+        self.disk_bytes -= freed
+        for (key,) in victims:
+            self.memory.pop(key, None)
+
+    def top_entries(self, limit=10):
+        """Most-hit cached prompts as (prompt, hits) pairs."""
+        if self.db is None:
+            return []
+        with self.lock:
+            self._flush_hits()
+            return self.db.execute(
+                "SELECT prompt, hits FROM responses ORDER BY hits DESC LIMIT ?", (limit,)
+            ).fetchall()
+
+    def stats(self):
+        """Counters for monitoring: hits per tier, misses, hit rate and model time saved."""
+        with self.lock:
+            s = dict(self.stats_counters)
+            s["memory_entries"] = len(self.memory)
+            lookups = s["memory_hits"] + s["disk_hits"] + s["misses"]
+            s["hit_rate"] = (s["memory_hits"] + s["disk_hits"]) / lookups if lookups else 0.0
+            s["avg_lookup_us"] = s["lookup_seconds"] / lookups * 1e6 if lookups else 0.0
+            if self.db is not None:
+                s["disk_entries"] = self.disk_entries
+                s["disk_bytes"] = self.disk_bytes
+            return s
+
+    def close(self):
+        with self.lock:
+            self._flush_hits()
+            if self.db is not None:
+                self.db.close()
+                self.db = None
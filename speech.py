@@ -0,0 +1,228 @@
+"""
+Speech output worker.
+
+One daemon thread owns the TTS engine and the pygame mixer and serves a
+priority queue, so callers on any thread only enqueue text. Phrases are
+rendered to audio files in a content-addressed cache (hash of voice, rate
+and text) and played from there; frequent phrases are rendered ahead of
+time while the worker is idle and play instantly. A higher-priority item
+(e.g. a reminder) interrupts lower-priority speech, which is re-queued.
+"""
+import os
+import time
+import queue
+import hashlib
+import itertools
+import threading
+
+PRIORITY_ALERT = 0
+PRIORITY_NORMAL = 1
+PRIORITY_CHATTER = 2
+
+
+class _Item:
+    __slots__ = ("priority", "seq", "text", "on_start", "done")
+
+    def __init__(self, priority, seq, text, on_start):
+        self.priority = priority
+        self.seq = seq
+        self.text = text
+        self.on_start = on_start
+        self.done = threading.Event()
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class SpeechWorker:
+    """
+    say(text, priority, on_start) queues text and returns an Event that is set
+    once it has been spoken. Everything that touches the engine runs on the
+    worker thread.
+    """
+    def __init__(self, cache_dir, voice_index=1, rate=160, volume=1.0,
+                 prerender=(), max_cached_files=500):
+        self.cache_dir = cache_dir
+        self.voice_index = voice_index
+        self.rate = rate
+        self.volume = volume
+        self.prerender = list(prerender)
+        self.max_cached_files = max_cached_files
+        self.queue = queue.PriorityQueue()
+        self.seq = itertools.count()
+        self.idle = threading.Event()
+        self.idle.set()
+        self.engine = None
+        self.voice_id = ""
+        self.mixer_ok = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._pending = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def say(self, text, priority=PRIORITY_NORMAL, on_start=None):
+        item = _Item(priority, next(self.seq), text, on_start)
+        if not text:
+            item.done.set()
+            return item.done
+        self.start()
+        with self._lock:
+            self._pending += 1
+            self.idle.clear()
+        self.queue.put(item)
+        return item.done
+
+    def wait_idle(self, timeout=None):
+        """Blocks until nothing is queued or playing."""
+        return self.idle.wait(timeout)
+
+    # ---- worker thread ----
+    def _init_engine(self):
+        try:
+            import pygame
+            pygame.mixer.init()
+            self.mixer_ok = True
+        except Exception as e:
+            print("Audio mixer init error:", e)
+        try:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+            voices = self.engine.getProperty('voices')
+            try:
+                self.voice_id = voices[self.voice_index].id
+                self.engine.setProperty('voice', self.voice_id)
+            except Exception:
+                pass
+            self.engine.setProperty('rate', self.rate)
+            self.engine.setProperty('volume', self.volume)
+        except Exception as e:
+            print("TTS engine init error:", e)
+
+    def _run(self):
+        self._init_engine()
+        pending_prerender = list(self.prerender)
+        while True:
+            try:
+                item = self.queue.get(timeout=0.5 if pending_prerender else None)
+            except queue.Empty:
+                self._render(pending_prerender.pop(0))
+                continue
+            try:
+                finished = self._speak(item)
+            except Exception as e:
+                print("TTS Error:", e)
+                finished = True
+            if finished:
+                item.done.set()
+                with self._lock:
+                    self._pending -= 1
+                    if not self._pending:
+                        self.idle.set()
+
+    def _speak(self, item):
+        """Speaks one item. Returns False if it was interrupted and re-queued."""
+        path = self._render(item.text) if self.mixer_ok else None
+        if item.on_start is not None:
+            item.on_start()
+            item.on_start = None
+        if path is None:
+            # No mixer or no renderer: speak directly through the engine.
+            if self.engine is not None:
+                self.engine.say(item.text)
+                self.engine.runAndWait()
+            return True
+        if self._play(path, item):
+            return True
+        self.queue.put(item)
+        return False
+
+    def _play(self, path, item):
+        """Plays a rendered file. Returns False if a higher-priority item interrupted it."""
+        import pygame
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.play()
+        try:
+            while pygame.mixer.music.get_busy():
+                if self._preempted_by_queue(item):
+                    pygame.mixer.music.stop()
+                    return False
+                time.sleep(0.02)
+            return True
+        finally:
+            pygame.mixer.music.unload()
+
+    def _preempted_by_queue(self, item):
+        with self.queue.mutex:
+            return bool(self.queue.queue) and self.queue.queue[0].priority < item.priority
+
+    # ---- audio cache ----
+    def cache_path(self, text, ext):
+        key = hashlib.sha1(f"{self.voice_id}|{self.rate}|{self.volume}|{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ext)
+
+    def _render(self, text):
+        """Returns a cached audio file for text, rendering it first if needed."""
+        for ext in (".wav", ".mp3"):
+            path = self.cache_path(text, ext)
+            if os.path.exists(path):
+                self.cache_hits += 1
+                os.utime(path)
+                return path
+        self.cache_misses += 1
+        path = self._render_engine(text) or self._render_gtts(text)
+        if path:
+            self._trim_cache()
+        return path
+
+    def _render_engine(self, text):
+        if self.engine is None:
+            return None
+        path = self.cache_path(text, ".wav")
+        tmp = f"{path}.{threading.get_ident()}.tmp.wav"
+        try:
+            self.engine.save_to_file(text, tmp)
+            self.engine.runAndWait()
+            if os.path.exists(tmp) and os.path.getsize(tmp) > 0:
+                os.replace(tmp, path)
+                return path
+        except Exception as e:
+            print("TTS render error:", e)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+
+    def _render_gtts(self, text):
+        path = self.cache_path(text, ".mp3")
+        tmp = f"{path}.{threading.get_ident()}.tmp.mp3"
+        try:
+            from gtts import gTTS
+            gTTS(text=text, lang='en').save(tmp)
+            os.replace(tmp, path)
+            return path
+        except Exception as e:
+            print("gTTS render error:", e)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return None
+
+    def _trim_cache(self):
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.is_file() and ".tmp." not in e.name]
+        except OSError:
+            return
+        if len(entries) <= self.max_cached_files:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[:len(entries) - self.max_cached_files]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
@@ -0,0 +1,182 @@
+"""
+Staged voice pipeline: capture -> recognition -> execution.
+
+Each stage has a bounded queue and its own worker thread(s):
+
+* capture runs in the caller's thread and never blocks on the stages after
+  it; if recognition falls behind, the oldest queued utterance is dropped
+  (and counted) instead of stalling the microphone.
+* recognition runs on a small pool; results are put back in capture order
+  before they reach execution.
+* execution is a single worker, so commands run one at a time and in order.
+  When its queue is full, recognition workers wait (backpressure).
+
+Every stage keeps queue-depth, wait-time and service-time metrics.
+"""
+import time
+import queue
+import threading
+
+_STOP = object()
+
+
+class Stage:
+    """
+    Bounded queue served by `workers` threads calling handler(item).
+    on_result(seq, result) receives each handler result tagged with the
+    order in which items left the queue.
+    """
+    def __init__(self, name, handler, workers=1, maxsize=8, drop_oldest=False, on_result=None):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.drop_oldest = drop_oldest
+        self.on_result = on_result
+        self.queue = queue.Queue(maxsize)
+        self.threads = []
+        self.lock = threading.Lock()
+        self._get_lock = threading.Lock()
+        self._seq = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.wait_total = 0.0
+        self.service_total = 0.0
+        self.busy = 0
+
+    def start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def stop(self, timeout=None):
+        """Lets the workers finish what is already queued, then joins them."""
+        for _ in self.threads:
+            self.queue.put((time.perf_counter(), _STOP))
+        for t in self.threads:
+            if t is not threading.current_thread():
+                t.join(timeout)
+
+    def put(self, item):
+        self._put((time.perf_counter(), item))
+
+    def _put(self, entry):
+        if self.drop_oldest:
+            while True:
+                try:
+                    self.queue.put_nowait(entry)
+                    break
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        with self.lock:
+                            self.dropped += 1
+                    except queue.Empty:
+                        pass
+        else:
+            self.queue.put(entry)
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            with self.lock:
+                self.max_depth = max(self.max_depth, depth)
+
+    def _work(self):
+        while True:
+            with self._get_lock:
+                enqueued, item = self.queue.get()
+                seq = self._seq
+                self._seq += 1
+            if item is _STOP:
+                return
+            started = time.perf_counter()
+            with self.lock:
+                self.busy += 1
+            try:
+                result = self.handler(item)
+            except Exception as e:
+                print(f"Pipeline stage '{self.name}' error:", e)
+                result = None
+                with self.lock:
+                    self.errors += 1
+            finished = time.perf_counter()
+            with self.lock:
+                self.busy -= 1
+                self.processed += 1
+                self.wait_total += started - enqueued
+                self.service_total += finished - started
+            if self.on_result is not None:
+                self.on_result(seq, result)
+
+    def metrics(self):
+        with self.lock:
+            n = self.processed
+            return {
+                "depth": self.queue.qsize(),
+                "max_depth": self.max_depth,
+                "capacity": self.queue.maxsize,
+                "busy_workers": self.busy,
+                "workers": self.workers,
+                "processed": n,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "avg_wait_ms": self.wait_total / n * 1000 if n else 0.0,
+                "avg_service_ms": self.service_total / n * 1000 if n else 0.0,
+            }
+
+
+class SpeechPipeline:
+    """
+    pipeline = SpeechPipeline(capture, recognize, execute)
+    pipeline.run()   # blocks, reading capture.utterances() in this thread
+
+    recognize(utterance) -> result or None (None results are skipped);
+    execute(result) runs on the single execution worker, in capture order.
+    """
+    def __init__(self, capture, recognize, execute, recognizers=2,
+                 recognition_queue=4, execution_queue=4):
+        self.capture = capture
+        self.execution = Stage("execute", execute, workers=1, maxsize=execution_queue)
+        self.recognition = Stage("recognize", recognize, workers=recognizers,
+                                 maxsize=recognition_queue, drop_oldest=True,
+                                 on_result=self._reorder)
+        self._order_lock = threading.Lock()
+        self._next = 0
+        self._pending = {}
+        self.captured = 0
+        self.stopped = False
+
+    def _reorder(self, seq, result):
+        with self._order_lock:
+            self._pending[seq] = result
+            while self._next in self._pending:
+                ready = self._pending.pop(self._next)
+                self._next += 1
+                if ready is not None:
+                    self.execution.put(ready)
+
+    def run(self):
+        self.execution.start()
+        self.recognition.start()
+        try:
+            for utterance in self.capture.utterances():
+                if self.stopped:
+                    break
+                self.captured += 1
+                self.recognition.put(utterance)
+        finally:
+            # Recognition drains into execution first, so nothing is lost on a clean stop.
+            self.recognition.stop()
+            self.execution.stop()
+
+    def stop(self):
+        self.stopped = True
+        self.capture.stop()
+
+    def metrics(self):
+        return {
+            "captured": self.captured,
+            "recognize": self.recognition.metrics(),
+            "execute": self.execution.metrics(),
+        }
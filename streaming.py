@@ -0,0 +1,54 @@
+"""
+Helpers for streaming AI output.
+
+SentenceSplitter turns a stream of text chunks into complete sentences as
+soon as they are available, so each one can be logged and spoken while the
+model is still generating the rest.
+"""
+import re
+
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc",
+                 "e.g", "i.e", "approx", "no", "fig", "inc", "ltd"}
+BOUNDARY_RE = re.compile(r"[.!?]+[\"')\]]*(?=\s)|\n")
+
+
+class SentenceSplitter:
+    """
+    feed(chunk) returns the sentences completed by that chunk;
+    flush() returns whatever is left once the stream ends.
+    """
+    def __init__(self):
+        self.buf = ""
+
+    def feed(self, chunk):
+        # Re-scan from just before the old tail so a boundary split across chunks is found.
+        scan_from = max(0, len(self.buf) - 1)
+        self.buf += chunk
+        out = []
+        start = 0
+        for m in BOUNDARY_RE.finditer(self.buf, scan_from):
+            if m.group() != "\n" and self._is_abbreviation(self.buf[start:m.start()]):
+                continue
+            sentence = self.buf[start:m.end()].strip()
+            if sentence:
+                out.append(sentence)
+            start = m.end()
+        self.buf = self.buf[start:]
+        return out
+
+    def flush(self):
+        rest, self.buf = self.buf.strip(), ""
+        return [rest] if rest else []
+
+    @staticmethod
+    def _is_abbreviation(text):
+        words = text.split()
+        if not words:
+            return False
+        word = words[-1].lower().rstrip(".")
+        return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+def split_sentences(text):
+    splitter = SentenceSplitter()
+    return splitter.feed(text + "\n") + splitter.flush()
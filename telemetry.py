@@ -0,0 +1,142 @@
+"""
+System telemetry sampler.
+
+One background thread samples CPU (total and per core), memory, disk and
+network I/O rates, battery and Orion's own process at a configurable rate.
+Every series is written into a fixed-size ring buffer backed by
+array('d'), so memory stays constant no matter how long Orion runs. The
+GUI reads the buffers on the Tk thread; the sampler never touches widgets.
+"""
+import time
+import array
+import threading
+
+import psutil
+
+HISTORY = 120
+
+
+class RingBuffer:
+    """Fixed-size float history. One writer; readers get a chronological copy."""
+    __slots__ = ("data", "size", "pos", "count")
+
+    def __init__(self, size=HISTORY):
+        self.data = array.array("d", bytes(8 * size))
+        self.size = size
+        self.pos = 0
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.pos] = value
+        self.pos = (self.pos + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def latest(self, default=0.0):
+        return self.data[self.pos - 1] if self.count else default
+
+    def values(self):
+        if self.count < self.size:
+            return self.data[:self.count].tolist()
+        return (self.data[self.pos:] + self.data[:self.pos]).tolist()
+
+    def __len__(self):
+        return self.count
+
+
+class TelemetrySampler:
+    """
+    Samples every `interval` seconds into `series` (name -> RingBuffer) and
+    `cores` (one RingBuffer per logical CPU). Slow-changing values (disk
+    usage, battery) are read every `slow_every` samples and kept in `latest`.
+    """
+    SERIES = ("cpu", "mem_percent", "disk_read", "disk_write", "net_sent", "net_recv",
+              "battery", "proc_cpu", "proc_rss")
+
+    def __init__(self, interval=2.0, history=HISTORY, slow_every=5, disk_path="/"):
+        self.interval = interval
+        self.slow_every = slow_every
+        self.disk_path = disk_path
+        self.series = {name: RingBuffer(history) for name in self.SERIES}
+        self.cores = [RingBuffer(history) for _ in range(psutil.cpu_count() or 1)]
+        self.latest = {"mem_used_gb": 0.0, "mem_total_gb": 0.0, "disk_percent": 0.0,
+                       "power": "N/A", "power_plugged": True}
+        self.samples = 0
+        self.process = psutil.Process()
+        self._prev_io = None
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+    def set_interval(self, seconds):
+        """Changes the sampling rate; takes effect immediately."""
+        self.interval = seconds
+        self._wake.set()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        # Prime the non-blocking counters; the first real reading then covers one interval.
+        psutil.cpu_percent(percpu=True)
+        self.process.cpu_percent()
+        self._prev_io = self._io_counters()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopped:
+            try:
+                self.sample()
+            except Exception as e:
+                print("Telemetry sample error:", e)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    @staticmethod
+    def _io_counters():
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        return (time.monotonic(),
+                disk.read_bytes if disk else 0, disk.write_bytes if disk else 0,
+                net.bytes_sent if net else 0, net.bytes_recv if net else 0)
+
+    def sample(self):
+        per_core = psutil.cpu_percent(percpu=True)
+        for buf, value in zip(self.cores, per_core):
+            buf.append(value)
+        self.series["cpu"].append(sum(per_core) / len(per_core) if per_core else 0.0)
+
+        mem = psutil.virtual_memory()
+        self.series["mem_percent"].append(mem.percent)
+        self.latest["mem_used_gb"] = mem.used / (1024 ** 3)
+        self.latest["mem_total_gb"] = mem.total / (1024 ** 3)
+
+        io = self._io_counters()
+        if self._prev_io is not None:
+            dt = max(io[0] - self._prev_io[0], 1e-6)
+            for i, name in enumerate(("disk_read", "disk_write", "net_sent", "net_recv"), start=1):
+                self.series[name].append(max(0, io[i] - self._prev_io[i]) / dt)
+        self._prev_io = io
+
+        with self.process.oneshot():
+            self.series["proc_cpu"].append(self.process.cpu_percent())
+            self.series["proc_rss"].append(self.process.memory_info().rss / (1024 ** 2))
+
+        if self.samples % self.slow_every == 0:
+            self.latest["disk_percent"] = psutil.disk_usage(self.disk_path).percent
+            try:
+                battery = psutil.sensors_battery()
+            except Exception:
+                battery = None
+            if battery is None:
+                self.latest["power"] = "N/A"
+                self.latest["power_plugged"] = True
+            else:
+                self.latest["power"] = "AC" if battery.power_plugged else f"{battery.percent:.0f}%"
+                self.latest["power_plugged"] = bool(battery.power_plugged)
+                self.series["battery"].append(battery.percent)
+        self.samples += 1
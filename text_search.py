@@ -0,0 +1,314 @@
+"""
+Full-text search behind the "find text" command.
+
+The calling thread walks the roots with os.scandir, skipping hidden and
+dependency folders, files with a binary extension and files larger than
+max_file_bytes (the size comes with the directory listing, so skipped
+files are never opened). The remaining paths go to a pool in small
+batches. A worker memory-maps each file that is large enough to be worth
+it, so a big log is never read into the process as a whole: the mapping
+is lowercased one 1 MB window at a time, windows without the query's
+longest word are dropped with a plain substring test, and only the rest
+are run through the query regex. Files with a NUL byte near the start
+are treated as binary and dropped.
+
+Workers are processes by default when there is more than one CPU and the
+platform forks them (the scan holds the GIL, so threads would not search
+in parallel), threads otherwise. Where workers are spawned (Windows, and
+macOS by default) every worker would re-import main.py and load the
+models, the index and the GUI modules before its first batch, so threads
+are used there. The pool is created on the first search and kept.
+
+Matches come back as they are found. on_result(match, rank) is called
+for every match that enters the current top `limit`, so a caller can show
+results before the walk is done; cancelled() is checked between batches
+and stops the search early, dropping batches that have not started.
+Scores favour whole-word hits, then hits in the file name, then more
+hits, then newer files.
+"""
+import os
+import re
+import time
+import heapq
+import mmap
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+MAX_FILE_BYTES = 64 * 1024 * 1024
+MMAP_MIN_BYTES = 256 * 1024     # smaller files are cheaper to read() than to map
+BATCH_FILES = 32
+BATCH_BYTES = 16 * 1024 * 1024
+MAX_HITS = 100                  # hits counted per file, for scoring
+SNIPPET_CHARS = 100
+SNIFF_BYTES = 4096
+WINDOW_BYTES = 1024 * 1024      # mapped files are lowercased and searched one window at a time
+WINDOW_OVERLAP = 4096           # longest match found across a window boundary
+BINARY = object()
+SKIP_DIRS = {"node_modules", "__pycache__", "site-packages", "venv", "$RECYCLE.BIN",
+             "System Volume Information", "AppData"}
+BINARY_EXTENSIONS = {
+    ".exe", ".dll", ".so", ".dylib", ".bin", ".obj", ".o", ".a", ".lib", ".pyc", ".class", ".jar",
+    ".zip", ".gz", ".bz2", ".xz", ".7z", ".rar", ".tar", ".iso", ".dmg", ".msi",
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".tif", ".tiff", ".psd",
+    ".mp3", ".wav", ".flac", ".ogg", ".m4a", ".mp4", ".mkv", ".avi", ".mov", ".webm",
+    ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".odt", ".db", ".sqlite", ".pkl",
+    ".ttf", ".otf", ".woff", ".woff2",
+}
+
+
+def compile_query(query):
+    """
+    (anchor, pattern) for query: the longest query word, lowercased, and a
+    regex over lowercased bytes in which runs of whitespace match any
+    whitespace (line breaks included).
+    """
+    words = query.lower().encode("utf-8").split()
+    return max(words, key=len), re.compile(rb"\s+".join(re.escape(w) for w in words))
+
+
+def _scan_file(path, size, anchor, pattern, name_hit):
+    """(score, hits, snippet) for one file, None if it does not match, BINARY if it is not text."""
+    with open(path, "rb") as f:
+        if size >= MMAP_MIN_BYTES:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buf = f.read()
+    try:
+        if b"\0" in buf[:SNIFF_BYTES]:
+            return BINARY
+        hits = words = 0
+        first = None
+        # Lowercasing a window and testing for the anchor runs at memory
+        # speed; a case-insensitive regex over the raw bytes is ~10x slower.
+        for base in range(0, len(buf), WINDOW_BYTES):
+            low = buf[base:base + WINDOW_BYTES + WINDOW_OVERLAP].lower()
+            if anchor not in low:
+                continue
+            for m in pattern.finditer(low):
+                s, e = m.start(), m.end()
+                if s >= WINDOW_BYTES:
+                    break    # the next window sees it again
+                if first is None:
+                    first = (base + s, base + e)
+                hits += 1
+                before = low[s - 1:s] if s else buf[base - 1:base] if base else b""
+                if not before.isalnum() and not low[e:e + 1].isalnum():
+                    words += 1
+                if hits >= MAX_HITS:
+                    break
+            if hits >= MAX_HITS:
+                break
+        if first is None:
+            return None
+        lo = max(0, first[0] - SNIPPET_CHARS)
+        start = buf.rfind(b"\n", lo, first[0])
+        start = start + 1 if start >= 0 else lo
+        end = buf.find(b"\n", first[1], first[1] + SNIPPET_CHARS)
+        line = buf[start:end if end >= 0 else first[1] + SNIPPET_CHARS]
+        snippet = " ".join(line.decode("utf-8", "replace").split())
+        score = 3 * min(words, 10) + min(hits, 10) + (15 if name_hit else 0)
+        return score, hits, snippet
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+
+def _scan_batch(batch, query):
+    """Worker entry point: scans [(path, size, mtime)]. Returns (matches, counters)."""
+    anchor, pattern = compile_query(query)
+    name_query = query.lower()
+    matches = []
+    counters = {"scanned": 0, "bytes": 0, "binary": 0, "errors": 0}
+    for path, size, mtime in batch:
+        try:
+            found = _scan_file(path, size, anchor, pattern, name_query in os.path.basename(path).lower())
+        except (OSError, ValueError):
+            counters["errors"] += 1
+            continue
+        if found is BINARY:
+            counters["binary"] += 1
+            continue
+        counters["scanned"] += 1
+        counters["bytes"] += size
+        if found is not None:
+            score, hits, snippet = found
+            matches.append((path, score, hits, mtime, snippet))
+    return matches, counters
+
+
+class TextMatch:
+    __slots__ = ("path", "score", "hits", "mtime", "snippet")
+
+    def __init__(self, path, score, hits, mtime, snippet):
+        self.path = path
+        self.score = score
+        self.hits = hits
+        self.mtime = mtime
+        self.snippet = snippet
+
+    def __repr__(self):
+        return f"TextMatch({self.path!r}, score={self.score}, hits={self.hits})"
+
+
+class SearchReport:
+    def __init__(self, query):
+        self.query = query
+        self.matches = []      # best first, at most `limit`
+        self.total = 0         # matching files, including those beyond `limit`
+        self.counters = {"files": 0, "scanned": 0, "bytes": 0, "binary": 0, "errors": 0,
+                         "too_large": 0, "skipped_type": 0}
+        self.cancelled = False
+        self.elapsed = 0.0
+
+
+class TextSearch:
+    """
+    search = TextSearch(["~/Documents"])
+    report = search.search("quarterly report", limit=5,
+                           on_result=lambda match, rank: print(rank, match.path),
+                           cancelled=lambda: user_moved_on)
+    report.matches                  # [TextMatch], best first
+    """
+    def __init__(self, roots, workers=None, processes=None, max_file_bytes=MAX_FILE_BYTES):
+        self.roots = [os.path.abspath(os.path.expanduser(r)) for r in roots]
+        cpus = os.cpu_count() or 1
+        self.workers = workers or cpus
+        if processes is None:
+            processes = cpus > 1 and multiprocessing.get_all_start_methods()[0] == "fork"
+        self.processes = processes
+        self.max_file_bytes = max_file_bytes
+        self.lock = threading.Lock()
+        self._pool = None
+
+    def _executor(self):
+        with self.lock:
+            if self._pool is None:
+                if self.processes:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="text-search")
+            return self._pool
+
+    def stop(self):
+        with self.lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def walk(self, report):
+        """Yields (path, size, mtime) for every candidate file below the roots."""
+        stack = list(reversed(self.roots))
+        seen = set()
+        while stack:
+            d = stack.pop()
+            if d in seen:
+                continue
+            seen.add(d)
+            try:
+                with os.scandir(d) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            subdirs = []
+            for e in entries:
+                if e.name.startswith("."):
+                    continue
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        if e.name not in SKIP_DIRS:
+                            subdirs.append(e.path)
+                        continue
+                    if not e.is_file(follow_symlinks=False):
+                        continue
+                    report.counters["files"] += 1
+                    if os.path.splitext(e.name)[1].lower() in BINARY_EXTENSIONS:
+                        report.counters["skipped_type"] += 1
+                        continue
+                    st = e.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if st.st_size == 0:
+                    continue
+                if st.st_size > self.max_file_bytes:
+                    report.counters["too_large"] += 1
+                    continue
+                yield e.path, st.st_size, st.st_mtime
+            stack.extend(reversed(subdirs))
+
+    def _batches(self, report):
+        batch, size = [], 0
+        for item in self.walk(report):
+            batch.append(item)
+            size += item[1]
+            if len(batch) >= BATCH_FILES or size >= BATCH_BYTES:
+                yield batch
+                batch, size = [], 0
+        if batch:
+            yield batch
+
+    def search(self, query, limit=10, on_result=None, cancelled=None, timeout=None):
+        """
+        Scans every file below the roots for query. Blocks until done,
+        cancelled() returns true or `timeout` seconds have passed; returns a
+        SearchReport. on_result(match, rank) runs on the calling thread.
+        """
+        report = SearchReport(query)
+        query = " ".join(query.split())
+        if not query:
+            return report
+        started = time.perf_counter()
+        deadline = time.monotonic() + timeout if timeout else None
+        pool = self._executor()
+        top = []        # min-heap of (score, mtime, seq, TextMatch)
+        seq = 0
+        in_flight = set()
+        batches = self._batches(report)
+        walking = True
+
+        def stopped():
+            if cancelled is not None and cancelled():
+                return True
+            return deadline is not None and time.monotonic() > deadline
+
+        while walking or in_flight:
+            if stopped():
+                report.cancelled = True
+                break
+            # Keep the pool busy, but only a couple of batches ahead of it.
+            while walking and len(in_flight) < 2 * self.workers:
+                batch = next(batches, None)
+                if batch is None:
+                    walking = False
+                    break
+                in_flight.add(pool.submit(_scan_batch, batch, query))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    matches, counters = future.result()
+                except Exception as e:
+                    print("Text search error:", e)
+                    continue
+                for name, value in counters.items():
+                    report.counters[name] += value
+                for found in matches:
+                    match = TextMatch(*found)
+                    report.total += 1
+                    seq += 1
+                    entry = (match.score, match.mtime, -seq, match)
+                    if len(top) < limit:
+                        heapq.heappush(top, entry)
+                    elif entry[:3] > top[0][:3]:
+                        heapq.heapreplace(top, entry)
+                    else:
+                        continue
+                    if on_result is not None:
+                        rank = 1 + sum(1 for other in top if other[:3] > entry[:3])
+                        on_result(match, rank)
+        for future in in_flight:
+            future.cancel()
+        report.matches = [entry[3] for entry in sorted(top, key=lambda entry: entry[:3], reverse=True)]
+        report.elapsed = time.perf_counter() - started
+        return report
@@ -0,0 +1,305 @@
+"""
+Lightweight tracing for the voice pipeline.
+
+Each command gets a trace id; spans (capture, recognize, route, skill, ai,
+speak, ...) are recorded against it, written to a rotating JSON-lines file
+by a background thread and aggregated into latency histograms that a small
+HTTP server exposes in Prometheus text format at /metrics.
+
+The current trace id is thread-local. Stages running on other threads
+activate it explicitly (`with tracer.activate(trace_id):`). When the tracer
+is disabled every call returns immediately and span() hands back a shared
+no-op context manager, so instrumented code costs next to nothing.
+"""
+import os
+import json
+import time
+import queue
+import atexit
+import itertools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "trace_id", "attrs", "started", "t0")
+
+    def __init__(self, tracer, name, trace_id, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._emit(self.name, self.trace_id, self.started, time.perf_counter() - self.t0, self.attrs)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class _Activation:
+    __slots__ = ("local", "trace_id", "previous")
+
+    def __init__(self, local, trace_id):
+        self.local = local
+        self.trace_id = trace_id
+
+    def __enter__(self):
+        self.previous = getattr(self.local, "trace_id", None)
+        self.local.trace_id = self.trace_id
+        return self.trace_id
+
+    def __exit__(self, *exc):
+        self.local.trace_id = self.previous
+        return False
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (seconds)."""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.sum += seconds
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        total = 0
+        for bound, n in zip(self.buckets, self.counts):
+            total += n
+            yield bound, total
+
+
+class Tracer:
+    """
+    tracer = Tracer(path)            # path=None disables tracing
+    trace_id = tracer.new_trace()
+    with tracer.activate(trace_id), tracer.span("recognize"):
+        ...
+    """
+    def __init__(self, path=None, max_bytes=5 * 1024 * 1024, backups=3, buckets=DEFAULT_BUCKETS):
+        self.enabled = path is not None
+        self.path = path
+        self.buckets = tuple(buckets)
+        self.histograms = {}   # span name -> Histogram
+        self.gauges = []       # (name, help, fn, kind)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self._ids = itertools.count(1)
+        self._prefix = f"{int(time.time()):x}"
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._server = None
+        if self.enabled:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._writer = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    # ---- trace ids ----
+    def new_trace(self):
+        if not self.enabled:
+            return None
+        return f"{self._prefix}-{next(self._ids)}"
+
+    def trace_id(self):
+        if not self.enabled:
+            return None
+        return getattr(self.local, "trace_id", None)
+
+    def activate(self, trace_id):
+        if not self.enabled:
+            return NOOP
+        return _Activation(self.local, trace_id)
+
+    # ---- spans ----
+    def span(self, name, **attrs):
+        if not self.enabled:
+            return NOOP
+        return _Span(self, name, getattr(self.local, "trace_id", None), attrs)
+
+    def record(self, name, started, ended, trace_id=None, **attrs):
+        """Records a span measured elsewhere; started/ended are time.time() values."""
+        if not self.enabled:
+            return
+        self._emit(name, trace_id or self.trace_id(), started, max(0.0, ended - started), attrs)
+
+    def until(self, name, callback=None, **attrs):
+        """
+        Returns a callback that records a span from now until it is first
+        called (e.g. "speak": queued -> first audio), then calls `callback`.
+        """
+        if not self.enabled:
+            return callback
+        trace_id = self.trace_id()
+        started, t0 = time.time(), time.perf_counter()
+        fired = []
+
+        def done(*args, **kwargs):
+            if not fired:
+                fired.append(True)
+                self._emit(name, trace_id, started, time.perf_counter() - t0, attrs)
+            if callback is not None:
+                return callback(*args, **kwargs)
+        return done
+
+    def _emit(self, name, trace_id, started, seconds, attrs):
+        with self.lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram(self.buckets)
+            hist.observe(seconds)
+        # Serialization and file I/O happen on the writer thread.
+        self._queue.put((trace_id, name, started, seconds, threading.current_thread().name, attrs))
+
+    # ---- trace file ----
+    def _write_loop(self):
+        f = open(self.path, "a", encoding="utf-8")
+        try:
+            while True:
+                item = self._queue.get()
+                batch = []
+                while item is not None:
+                    trace_id, name, started, seconds, thread, attrs = item
+                    rec = {"trace": trace_id, "span": name, "start": round(started, 6),
+                           "ms": round(seconds * 1000, 3), "thread": thread}
+                    if attrs:
+                        rec.update(attrs)
+                    batch.append(json.dumps(rec, ensure_ascii=False, default=str))
+                    if len(batch) >= 512:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    f.write("\n".join(batch) + "\n")
+                    f.flush()
+                    if f.tell() >= self.max_bytes:
+                        f.close()
+                        self._rotate()
+                        f = open(self.path, "a", encoding="utf-8")
+                if item is None:
+                    return
+        finally:
+            f.close()
+
+    def _rotate(self):
+        """traces.jsonl -> traces.jsonl.1 -> ... -> traces.jsonl.<backups> (dropped)."""
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    # ---- metrics ----
+    def add_gauge(self, name, help_text, fn, kind="gauge"):
+        """
+        fn() returns [(labels dict, value)]; sampled on every /metrics request.
+        kind is the Prometheus type: "gauge", or "counter" for running totals
+        (name them *_total).
+        """
+        self.gauges.append((name, help_text, fn, kind))
+
+    def metrics_text(self):
+        lines = ["# HELP orion_span_seconds Latency of Orion pipeline stages.",
+                 "# TYPE orion_span_seconds histogram"]
+        with self.lock:
+            for name in sorted(self.histograms):
+                hist = self.histograms[name]
+                for bound, n in hist.cumulative():
+                    lines.append(f'orion_span_seconds_bucket{{span="{name}",le="{bound}"}} {n}')
+                lines.append(f'orion_span_seconds_bucket{{span="{name}",le="+Inf"}} {hist.count}')
+                lines.append(f'orion_span_seconds_sum{{span="{name}"}} {hist.sum:.6f}')
+                lines.append(f'orion_span_seconds_count{{span="{name}"}} {hist.count}')
+        for name, help_text, fn, kind in self.gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            try:
+                samples = fn()
+            except Exception as e:
+                print("Metrics gauge error:", e)
+                continue
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serves /metrics on a daemon thread. Returns the server (or None if disabled)."""
+        if not self.enabled or self._server is not None:
+            return self._server
+        tracer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = tracer.metrics_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            print("Metrics endpoint unavailable:", e)
+            return None
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True).start()
+        return self._server
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join(5)
+            self._writer = None
@@ -0,0 +1,169 @@
+"""
+Session transcript: every line shown in the GUI log, kept on disk.
+
+write() only puts the line on a queue; a writer thread timestamps,
+batches and appends them to transcript.log. When the file passes
+max_bytes it is gzip-compressed on the writer thread into
+transcript.log.1.gz, older archives shift up one number and the oldest
+beyond `backups` is dropped, so the whole history stays within roughly
+max_bytes plus the compressed archives.
+
+search() scans the live file and then the archives, newest first, and
+stops once it has `limit` matches. The file keeps whole seconds, so the
+exact write times of the live file's last TAIL_TIMES lines are also kept
+in memory: search(before=t) leaves out the lines written at or after t,
+such as the command asking for the search.
+"""
+import os
+import gzip
+import time
+import queue
+import shutil
+import atexit
+import threading
+from collections import deque
+
+_FLUSH = object()
+TAIL_TIMES = 1024   # exact write times kept for this many of the newest lines
+
+
+class Transcript:
+    """
+    transcript = Transcript(path)
+    transcript.start()
+    transcript.write("You: open youtube")      # any thread, never blocks
+    transcript.search("youtube")               # ["2024-05-01 12:00:00  You: open youtube", ...]
+    """
+    def __init__(self, path, max_bytes=2 * 1024 * 1024, backups=10):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.lock = threading.Lock()    # held while a file is appended to, rotated or searched
+        self._tail = deque(maxlen=TAIL_TIMES)   # write times of the live file's newest lines
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self.written = 0
+
+    def start(self):
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._writer = threading.Thread(target=self._write_loop, name="transcript-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    def write(self, message):
+        self._queue.put((time.time(), message))
+
+    def flush(self, timeout=5):
+        """Waits until everything written so far is on disk."""
+        if self._writer is None:
+            return
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def close(self):
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join(5)
+            self._writer = None
+
+    def archive(self, n):
+        return f"{self.path}.{n}.gz"
+
+    # ---- writer thread ----
+    def _write_loop(self):
+        f = open(self.path, "a", encoding="utf-8")
+        try:
+            while True:
+                item = self._queue.get()
+                batch, times, flushed = [], [], []
+                while item is not None:
+                    at, message = item
+                    if at is _FLUSH:
+                        flushed.append(message)
+                    else:
+                        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(at))
+                        batch.append(f"{stamp}  {' '.join(str(message).splitlines())}")
+                        times.append(at)
+                        if len(batch) >= 512:
+                            break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    with self.lock:
+                        f.write("\n".join(batch) + "\n")
+                        f.flush()
+                        self._tail.extend(times)
+                    self.written += len(batch)
+                    if f.tell() >= self.max_bytes:
+                        f.close()
+                        self._rotate()
+                        f = open(self.path, "a", encoding="utf-8")
+                for done in flushed:
+                    done.set()
+                if item is None:
+                    return
+        finally:
+            f.close()
+
+    def _rotate(self):
+        """transcript.log -> .1.gz -> .2.gz -> ... -> .<backups>.gz (dropped)."""
+        with self.lock:
+            try:
+                for i in range(self.backups - 1, 0, -1):
+                    if os.path.exists(self.archive(i)):
+                        os.replace(self.archive(i), self.archive(i + 1))
+                if self.backups > 0:
+                    tmp = self.archive(1) + ".tmp"
+                    with open(self.path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+                    os.replace(tmp, self.archive(1))
+                os.remove(self.path)
+                self._tail.clear()
+            except OSError as e:
+                print("Transcript rotate error:", e)
+
+    # ---- search ----
+    def files(self):
+        """Transcript files, newest first."""
+        paths = [self.path] + [self.archive(i) for i in range(1, self.backups + 1)]
+        return [p for p in paths if os.path.exists(p)]
+
+    def search(self, query, limit=20, before=None):
+        """
+        Lines containing query (case-insensitive), newest first. With
+        `before` (a time.time() value), lines written at or after it are left out.
+        """
+        q = query.lower().strip()
+        if not q:
+            return []
+        self.flush()
+        found = []
+        with self.lock:
+            skip = sum(1 for at in self._tail if at >= before) if before is not None else 0
+            for path in self.files():
+                opener = gzip.open if path.endswith(".gz") else open
+                try:
+                    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+                        if skip and path == self.path:
+                            lines = f.readlines()
+                            del lines[max(0, len(lines) - skip):]
+                        else:
+                            lines = f
+                        hits = [line.rstrip("\n") for line in lines if q in line.lower()]
+                except OSError as e:
+                    print("Transcript read error:", e)
+                    continue
+                found.extend(reversed(hits))
+                if len(found) >= limit:
+                    break
+        return found[:limit]
+
+    def stats(self):
+        with self.lock:
+            files = self.files()
+            return {"files": len(files), "bytes": sum(os.path.getsize(p) for p in files),
+                    "written": self.written}